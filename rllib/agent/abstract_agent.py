@@ -3,14 +3,21 @@ import contextlib
 from abc import ABCMeta
 from dataclasses import asdict
 
+import numpy as np
 import torch
 import torch.nn as nn
 from torch.optim.optimizer import Optimizer
 from tqdm import tqdm
 
 from rllib.dataset.datatypes import Loss
+from rllib.dataset.experience_replay import (
+    ExperienceReplay,
+    MemoryMappedExperienceReplay,
+    PrefetchSampler,
+)
 from rllib.dataset.utilities import average_dataclass
 from rllib.policy.nn_policy import NNPolicy
+from rllib.util.checkpoint import Checkpointer
 from rllib.util.early_stopping import EarlyStopping
 from rllib.util.logger import Logger
 from rllib.util.neural_networks.utilities import DisableGradient
@@ -29,6 +36,14 @@ class AbstractAgent(object, metaclass=ABCMeta):
         initial exploratory steps.
     exploration_episodes: int, optional (default=0)
         initial exploratory episodes
+    checkpoint_frequency: int, optional (default=1)
+        number of episodes between checkpoints. If 0, no checkpoints are saved.
+    asynchronous_checkpoint: bool, optional (default=False)
+        flag that indicates whether to write the checkpoints in a background thread.
+    num_prefetch_batches: int, optional (default=0)
+        number of batches that are sampled from the replay buffer in a background
+        thread ahead of the learning steps. If 0, the batches are sampled
+        synchronously.
 
     Methods
     -------
@@ -64,6 +79,9 @@ class AbstractAgent(object, metaclass=ABCMeta):
         device="cpu",
         log_dir=None,
         name=None,
+        checkpoint_frequency=1,
+        asynchronous_checkpoint=False,
+        num_prefetch_batches=0,
         *args,
         **kwargs,
     ):
@@ -73,6 +91,9 @@ class AbstractAgent(object, metaclass=ABCMeta):
             tensorboard=tensorboard,
             comment=comment,
         )
+        self.checkpoint_frequency = checkpoint_frequency
+        self.checkpointer = Checkpointer(asynchronous=asynchronous_checkpoint)
+        self.sampler = PrefetchSampler(num_prefetch=num_prefetch_batches)
         self.early_stopping_algorithm = EarlyStopping(epsilon=early_stopping_epsilon)
 
         self.counters = {
@@ -153,7 +174,11 @@ class AbstractAgent(object, metaclass=ABCMeta):
         if self.total_steps < self.exploration_steps or (
             self.total_episodes < self.exploration_episodes
         ):
-            policy = self.policy.random()
+            if self.policy.discrete_state:
+                batch_shape = np.shape(state)
+            else:
+                batch_shape = np.shape(state)[:-1]
+            policy = self.policy.random(batch_shape or None)
         else:
             if not isinstance(state, torch.Tensor):
                 state = torch.tensor(
@@ -165,7 +190,7 @@ class AbstractAgent(object, metaclass=ABCMeta):
         if self.training:
             action = self.pi.sample()
         elif self.pi.has_enumerate_support:
-            action = torch.argmax(self.pi.probs)
+            action = torch.argmax(self.pi.probs, dim=-1)
         else:
             try:
                 action = self.pi.mean
@@ -236,17 +261,18 @@ class AbstractAgent(object, metaclass=ABCMeta):
 
         self.logger.end_episode(**end_episode_dict)
 
-        # save checkpoint at every episode.
-        self.save_checkpoint()
+        if self.checkpoint_frequency > 0:
+            if self.total_episodes % self.checkpoint_frequency == 0:
+                self.save_checkpoint()
 
-        if best_return >= max(
-            self.logger.get("train_return-0") + self.logger.get("eval_return-0")
-        ):  # logger.get() returns a list!
-            self.save("best.pkl")
+            if best_return >= max(
+                self.logger.get("train_return-0") + self.logger.get("eval_return-0")
+            ):  # logger.get() returns a list!
+                self.save_checkpoint("best.pkl")
 
     def end_interaction(self):
         """End the interaction with the environment."""
-        pass
+        self.checkpointer.flush()
 
     def learn(self, *args, **kwargs):
         """Train the agent."""
@@ -267,8 +293,14 @@ class AbstractAgent(object, metaclass=ABCMeta):
         """Set the agent in evaluation mode."""
         self.train(not val)
 
-    def _learn_steps(self, closure):
-        """Apply `num_iter' learn steps to closure function."""
+    def _learn_steps(self, closure, memory=None):
+        """Apply `num_iter' learn steps to closure function.
+
+        If memory is given, `self.sampler' samples the batches of memory for the
+        closure, possibly in a background thread.
+        """
+        if memory is not None:
+            self.sampler.start(memory, self.batch_size, self.num_iter)
         for _ in tqdm(range(self.num_iter), disable=not self._training_verbose):
             if self.train_steps % self.policy_update_frequency == 0:
                 cm = contextlib.nullcontext()
@@ -289,6 +321,7 @@ class AbstractAgent(object, metaclass=ABCMeta):
 
             if self.early_stop(losses, **self.algorithm.info()):
                 break
+        self.sampler.stop()
         self.algorithm.reset()
         self.early_stopping_algorithm.reset()
 
@@ -344,11 +377,34 @@ class AbstractAgent(object, metaclass=ABCMeta):
         """Return class name."""
         return self.__class__.__name__ if self._name is None else self._name
 
-    def save_checkpoint(self):
-        """Save a checkpoint of the agent at the end of each episode."""
-        self.logger.export_to_json()
-        self.save("last.pkl")
-        save_random_state(self.logger.log_dir)
+    def save_checkpoint(self, filename="last.pkl"):
+        """Save a checkpoint of the agent.
+
+        The replay buffers of the agent are saved incrementally, i.e., only the
+        transitions added since the previous checkpoint are written, in a directory
+        named after the attribute. Hence, all the checkpoints of a log directory share
+        the latest replay buffers. Memory-mapped replay buffers are already on disk,
+        hence they are flushed and pickled as a reference to their directory.
+        If `asynchronous_checkpoint', the files are written in a background thread.
+
+        Parameters
+        ----------
+        filename: str, optional.
+            Filename with which to save the agent. If it is `last.pkl', the logger
+            and the random state are also saved.
+        """
+        if filename == "last.pkl":
+            self.logger.export_to_json()
+            save_random_state(self.logger.log_dir)
+
+        buffers = {
+            key: value
+            for key, value in self.__dict__.items()
+            if isinstance(value, ExperienceReplay)
+            and not isinstance(value, MemoryMappedExperienceReplay)
+        }
+        params = self._get_params(exclude=buffers)
+        self.checkpointer.save(params, buffers, f"{self.logger.log_dir}/{filename}")
 
     def save(self, filename, directory=None):
         """Save agent.
@@ -369,9 +425,19 @@ class AbstractAgent(object, metaclass=ABCMeta):
             directory = self.logger.log_dir
         path = f"{directory}/{filename}"
 
+        torch.save(self._get_params(), path)
+        return path
+
+    def _get_params(self, exclude=()):
+        """Get the parameters of the agent to save."""
         params = {}
         for key, value in self.__dict__.items():
-            if isinstance(value, Logger) or key == "pi":
+            if (
+                isinstance(value, (Logger, Checkpointer, PrefetchSampler))
+                or key == "pi"
+            ):
+                continue
+            elif key in exclude:
                 continue
             elif isinstance(value, nn.Module) or isinstance(value, Optimizer):
                 params[key] = value.state_dict()
@@ -383,9 +449,7 @@ class AbstractAgent(object, metaclass=ABCMeta):
                 continue
             else:
                 params[key] = value
-
-        torch.save(params, path)
-        return path
+        return params
 
     def load(self, path):
         """Load agent.
@@ -395,11 +459,18 @@ class AbstractAgent(object, metaclass=ABCMeta):
         path: str.
             Full path to agent.
         """
+        self.checkpointer.flush()
         agent_dict = torch.load(path)
+        replay_buffers = agent_dict.get("replay_buffers", [])
 
         for key, value in self.__dict__.items():
-            if isinstance(value, Logger) or key == "pi":
+            if (
+                isinstance(value, (Logger, Checkpointer, PrefetchSampler))
+                or key == "pi"
+            ):
                 continue
+            elif key in replay_buffers:
+                self.checkpointer.load_buffer(value, key, path)
             elif isinstance(value, AbstractAgent):
                 # abstract agents can't be saved as a dict.
                 # if an agent has a sub-agent, then it should implement the loading.
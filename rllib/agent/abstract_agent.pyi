@@ -1,5 +1,5 @@
 from abc import ABCMeta
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, TypeVar
 
 from torch import Tensor
 from torch.distributions import Distribution
@@ -7,9 +7,11 @@ from torch.optim.optimizer import Optimizer
 
 from rllib.algorithms.abstract_algorithm import AbstractAlgorithm
 from rllib.dataset.datatypes import Action, Loss, Observation, State
+from rllib.dataset.experience_replay import ExperienceReplay, PrefetchSampler
 from rllib.environment import AbstractEnvironment
 from rllib.policy import AbstractPolicy
 from rllib.value_function.abstract_value_function import AbstractQFunction
+from rllib.util.checkpoint import Checkpointer
 from rllib.util.early_stopping import EarlyStopping
 from rllib.util.logger import Logger
 from rllib.util.parameter_decay import ParameterDecay
@@ -24,6 +26,9 @@ class AbstractAgent(object, metaclass=ABCMeta):
     counters: Dict[str, int]
     episode_steps: List[int]
     logger: Logger
+    checkpoint_frequency: int
+    checkpointer: Checkpointer
+    sampler: PrefetchSampler
     early_stopping_algorithm: EarlyStopping
     gamma: float
     exploration_steps: int
@@ -62,6 +67,9 @@ class AbstractAgent(object, metaclass=ABCMeta):
         device: str = ...,
         log_dir: Optional[str] = ...,
         name: Optional[str] = ...,
+        checkpoint_frequency: int = ...,
+        asynchronous_checkpoint: bool = ...,
+        num_prefetch_batches: int = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
@@ -80,7 +88,9 @@ class AbstractAgent(object, metaclass=ABCMeta):
     def early_stop(self, losses: Loss, **kwargs: Any) -> bool: ...
     def train(self, val: bool = True) -> None: ...
     def eval(self, val: bool = True) -> None: ...
-    def _learn_steps(self, closure: Callable) -> Loss: ...
+    def _learn_steps(
+        self, closure: Callable, memory: Optional[ExperienceReplay] = ...
+    ) -> Loss: ...
     @property
     def train_episodes(self) -> int: ...
     @property
@@ -97,8 +107,9 @@ class AbstractAgent(object, metaclass=ABCMeta):
     def train_at_end_episode(self) -> bool: ...
     @property
     def name(self) -> str: ...
-    def save_checkpoint(self) -> None: ...
+    def save_checkpoint(self, filename: str = ...) -> None: ...
     def save(self, filename: str, directory: Optional[str] = ...) -> str: ...
+    def _get_params(self, exclude: Iterable[str] = ...) -> Dict[str, Any]: ...
     def load(self, path: str) -> None: ...
     @staticmethod
     def default_policy(environment) -> AbstractPolicy: ...
@@ -182,12 +182,9 @@ class ModelBasedAgent(AbstractAgent):
 
         def closure():
             """Gradient calculation."""
-            if memory is None:
-                observation, *_ = self.memory.sample_batch(self.batch_size)
-            else:
-                observation, *_ = memory.sample_batch(self.batch_size)
+            observation, *_ = self.sampler.sample_batch()
             self.optimizer.zero_grad()
-            losses = self.algorithm(observation.clone())
+            losses = self.algorithm(observation)
             losses.combined_loss.mean().backward()
 
             torch.nn.utils.clip_grad_norm_(
@@ -198,7 +195,7 @@ class ModelBasedAgent(AbstractAgent):
         with DisableGradient(
             self.dynamical_model, self.reward_model, self.termination_model
         ):
-            self._learn_steps(closure)
+            self._learn_steps(closure, memory=self.memory if memory is None else memory)
 
     def _sample_initial_states(self):
         """Get initial states to sample from."""
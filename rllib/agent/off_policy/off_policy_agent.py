@@ -63,10 +63,10 @@ class OffPolicyAgent(AbstractAgent):
 
         def closure():
             """Gradient calculation."""
-            observation, idx, weight = self.memory.sample_batch(self.batch_size)
+            observation, idx, weight = self.sampler.sample_batch()
 
             self.optimizer.zero_grad()
-            losses_ = self.algorithm(observation.clone())
+            losses_ = self.algorithm(observation)
             loss = (losses_.combined_loss * weight.detach()).mean()
             loss.backward()
             torch.nn.utils.clip_grad_norm_(
@@ -74,11 +74,11 @@ class OffPolicyAgent(AbstractAgent):
             )
 
             # Update memory
-            self.memory.update(idx, losses_.td_error.abs().detach())
+            self.sampler.update(idx, losses_.td_error.abs().detach())
 
             return losses_
 
-        self._learn_steps(closure)
+        self._learn_steps(closure, memory=self.memory)
 
         if self.reset_memory_after_learn:
             self.memory.reset()
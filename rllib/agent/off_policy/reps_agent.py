@@ -95,10 +95,10 @@ class REPSAgent(OffPolicyAgent):
 
         def closure():
             """Gradient calculation."""
-            observation, idx, weight = self.memory.sample_batch(self.batch_size)
+            observation, idx, weight = self.sampler.sample_batch()
 
             self.optimizer.zero_grad()
-            losses = self.algorithm(observation.clone())
+            losses = self.algorithm(observation)
             self.optimizer.zero_grad()
             loss = getattr(losses, loss_name)
             loss.backward()
@@ -108,7 +108,7 @@ class REPSAgent(OffPolicyAgent):
 
             return losses
 
-        self._learn_steps(closure)
+        self._learn_steps(closure, memory=self.memory)
 
     @classmethod
     def default(cls, environment, critic=None, policy=None, lr=5e-3, *args, **kwargs):
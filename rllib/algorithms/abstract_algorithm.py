@@ -8,13 +8,16 @@ import torch.nn as nn
 from rllib.dataset.datatypes import Loss, Observation
 from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.policy.q_function_policy import AbstractQFunctionPolicy
+from rllib.util.forward_cache import ForwardCache
 from rllib.util.losses.entropy_loss import EntropyLoss
 from rllib.util.losses.kl_loss import KLLoss
 from rllib.util.losses.pathwise_loss import PathwiseLoss
 from rllib.util.multi_objective_reduction import MeanMultiObjectiveReduction
 from rllib.util.neural_networks.utilities import (
     broadcast_to_tensor,
+    copy_parameters,
     deep_copy_module,
+    flatten_parameters,
     update_parameters,
 )
 from rllib.util.utilities import (
@@ -93,6 +96,13 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
         criterion for learning the critic.
     reward_transformer: RewardTransformer().
         A callable that transforms rewards.
+    flat_parameters: bool, optional (default=False).
+        Flag that indicates whether to store the parameters of the policy, the critic
+        and their copies in contiguous flat tensors. Then, the updates of the target
+        and old modules are a single operation each.
+    cache_forward: bool, optional (default=True).
+        Flag that indicates whether to memoize the forward passes of the policy, the
+        critic and their copies during each loss computation (see `ForwardCache').
     """
 
     eps = 1e-12
@@ -116,12 +126,20 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
         reward_transformer=RewardTransformer(),
         pathwise_loss_class=PathwiseLoss,
         multi_objective_reduction=MeanMultiObjectiveReduction(dim=-1),
+        flat_parameters=False,
+        cache_forward=True,
         *args,
         **kwargs,
     ):
         super().__init__()
         self._info = {}
         self.gamma = gamma
+        self.flat_parameters = flat_parameters
+        self.cache_forward = cache_forward
+        if flat_parameters:
+            for module in (policy, critic):
+                if module is not None:
+                    flatten_parameters(module)
         self.policy = policy
         if isinstance(policy, AbstractQFunctionPolicy):
             self.policy.multi_objective_reduction = multi_objective_reduction
@@ -186,6 +204,8 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
         This method will set the policy in the algorithm, as well as in the policy
         target, and in the pathwise loss.
         """
+        if self.flat_parameters:
+            flatten_parameters(new_policy)
         self.policy = new_policy
         self.policy_target = deep_copy_module(self.policy)
         self.pathwise_loss.set_policy(self.policy)
@@ -384,13 +404,30 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
         self.reset_info()
 
         loss = Loss()
-        for trajectory in trajectories:
-            loss += self.actor_loss(trajectory)
-            loss += self.critic_loss(trajectory)
-            loss += self.regularization_loss(trajectory, len(trajectories))
+        with self.forward_cache():
+            for trajectory in trajectories:
+                loss += self.actor_loss(trajectory)
+                loss += self.critic_loss(trajectory)
+                loss += self.regularization_loss(trajectory, len(trajectories))
 
         return loss / len(trajectories)
 
+    def forward_cache(self):
+        """Get a context that memoizes the forward passes of the algorithm modules.
+
+        The policy, the critic and their copies are evaluated once per input during
+        the context. When `cache_forward' is False, the context does nothing.
+        """
+        if not self.cache_forward:
+            return ForwardCache()
+        return ForwardCache(
+            self.policy,
+            getattr(self, "old_policy", None),
+            self.policy_target,
+            self.critic,
+            self.critic_target,
+        )
+
     def get_kl_entropy(self, state):
         """Get kl divergence and current policy at a given state.
 
@@ -463,7 +500,7 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
     def reset(self):
         """Reset the optimization (kl divergence) for the next epoch."""
         # Copy over old policy for KL divergence
-        self.old_policy.load_state_dict(self.policy.state_dict())
+        copy_parameters(self.old_policy, self.policy)
 
     @torch.jit.export
     def info(self):
@@ -7,6 +7,7 @@ from torch.nn.modules.loss import _Loss
 
 from rllib.dataset.datatypes import Loss, Observation
 from rllib.policy import AbstractPolicy
+from rllib.util.forward_cache import ForwardCache
 from rllib.util.losses.entropy_loss import EntropyLoss
 from rllib.util.losses.kl_loss import KLLoss
 from rllib.util.losses.pathwise_loss import PathwiseLoss
@@ -40,6 +41,8 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
     td_lambda: float
     critic_ensemble_lambda: float
     multi_objective_reduction: AbstractMultiObjectiveReduction
+    flat_parameters: bool
+    cache_forward: bool
     def __init__(
         self,
         gamma: float,
@@ -59,10 +62,13 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
         reward_transformer: RewardTransformer = ...,
         pathwise_loss_class: Type[PathwiseLoss] = ...,
         multi_objective_reduction: AbstractMultiObjectiveReduction = ...,
+        flat_parameters: bool = ...,
+        cache_forward: bool = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
     def post_init(self) -> None: ...
+    def forward_cache(self) -> ForwardCache: ...
     def update(self) -> None: ...
     def reset(self) -> None: ...
     def info(self) -> dict: ...
@@ -5,11 +5,10 @@ import numpy as np
 import torch
 import torch.nn as nn
 
-from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.util.multi_objective_reduction import MeanMultiObjectiveReduction
 from rllib.util.neural_networks.utilities import repeat_along_dimension, to_torch
-from rllib.util.rollout import rollout_actions
-from rllib.util.value_estimation import discount_sum
+
+from .worker_pool import MPCWorkerPool, rollout_returns
 
 
 class MPCSolver(nn.Module, metaclass=ABCMeta):
@@ -41,7 +40,11 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
     default_action: str, optional.
          Default action behavior.
     num_cpu: int, optional.
-        Number of CPUs to run the solver.
+        Number of CPUs to run the solver. With more than one, the particles are
+        evaluated in parallel by the calling process and `num_cpu - 1' workers of a
+        MPCWorkerPool.
+    jit_compile: bool, optional.
+        Whether or not to compile the planning rollout with `torch.compile'.
     """
 
     def __init__(
@@ -61,6 +64,7 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         action_scale=1.0,
         num_cpu=1,
         multi_objective_reduction=MeanMultiObjectiveReduction(dim=-1),
+        jit_compile=False,
         *args,
         **kwargs,
     ):
@@ -101,28 +105,31 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         self.action_scale = action_scale
         self.clamp = clamp
         self.num_cpu = num_cpu
+        self.worker_pool = MPCWorkerPool(num_cpu - 1) if num_cpu > 1 else None
         self.multi_objective_reduction = multi_objective_reduction
+        self.jit_compile = jit_compile
 
     def evaluate_action_sequence(self, action_sequence, state):
         """Evaluate action sequence by performing a rollout."""
-        trajectory = stack_list_of_tuples(
-            rollout_actions(
-                self.dynamical_model,
-                self.reward_model,
-                self.action_scale * action_sequence,  # scale actions.
-                state,
-                self.termination_model,
-            ),
-            dim=-2,
+        models = {
+            "dynamical_model": self.dynamical_model,
+            "reward_model": self.reward_model,
+            "termination_model": self.termination_model,
+            "terminal_reward": self.terminal_reward,
+        }
+        action_sequence = self.action_scale * action_sequence  # scale actions.
+        if self.worker_pool is not None:
+            return self.worker_pool.evaluate(
+                models, action_sequence, state, self.gamma, self.jit_compile
+            )
+        return rollout_returns(
+            action_sequence=action_sequence,
+            state=state,
+            gamma=self.gamma,
+            jit_compile=self.jit_compile,
+            **models,
         )
 
-        returns = discount_sum(trajectory.reward, self.gamma)
-
-        if self.terminal_reward:
-            terminal_reward = self.terminal_reward(trajectory.next_state[..., -1, :])
-            returns = returns + self.gamma ** self.num_model_steps * terminal_reward
-        return returns
-
     @abstractmethod
     def get_candidate_action_sequence(self):
         """Get candidate actions."""
@@ -178,3 +185,5 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
     def reset(self, warm_action=None):
         """Reset warm action."""
         self.mean = warm_action
+        if self.worker_pool is not None:
+            self.worker_pool.invalidate()
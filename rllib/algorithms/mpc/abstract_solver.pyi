@@ -9,6 +9,8 @@ from rllib.model import AbstractModel
 from rllib.util.multi_objective_reduction import AbstractMultiObjectiveReduction
 from rllib.value_function import AbstractValueFunction
 
+from .worker_pool import MPCWorkerPool
+
 class MPCSolver(nn.Module, metaclass=ABCMeta):
     dynamical_model: AbstractModel
     reward_model: AbstractModel
@@ -22,6 +24,9 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
     default_action: str
     action_scale: Tensor
     clamp: bool
+    num_cpu: int
+    worker_pool: Optional[MPCWorkerPool]
+    jit_compile: bool
 
     mean: Optional[Tensor]
     _scale: float
@@ -44,6 +49,7 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         clamp: bool = ...,
         num_cpu: int = ...,
         multi_objective_reduction: AbstractMultiObjectiveReduction = ...,
+        jit_compile: bool = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
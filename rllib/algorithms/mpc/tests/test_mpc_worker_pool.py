@@ -0,0 +1,100 @@
+import copy
+
+import pytest
+import torch
+import torch.testing
+
+from rllib.algorithms.mpc import CEMShooting
+from rllib.model import NNModel
+from rllib.policy import MPCPolicy
+
+
+@pytest.fixture(params=[2, 3])
+def num_cpu(request):
+    return request.param
+
+
+def get_solver(num_cpu, num_particles=20):
+    dynamical_model = NNModel(dim_state=(4,), dim_action=(2,), deterministic=True)
+    reward_model = NNModel(
+        dim_state=(4,), dim_action=(2,), model_kind="rewards", deterministic=True
+    )
+    return CEMShooting(
+        dynamical_model=dynamical_model,
+        reward_model=reward_model,
+        num_model_steps=5,
+        num_particles=num_particles,
+        num_cpu=num_cpu,
+    )
+
+
+def evaluate(solver, state):
+    solver.initialize_actions(state.shape[:-1])
+    state = state.unsqueeze(-2).expand(*state.shape[:-1], solver.num_particles, -1)
+    action_sequence = solver.get_candidate_action_sequence()
+    return solver.evaluate_action_sequence(action_sequence, state)
+
+
+def test_evaluate_action_sequence(num_cpu):
+    solver = get_solver(num_cpu)
+    serial_solver = copy.deepcopy(solver)
+    serial_solver.worker_pool = None
+    state = torch.randn(4)
+
+    torch.manual_seed(0)
+    returns = evaluate(solver, state)
+    torch.manual_seed(0)
+    torch.testing.assert_close(returns, evaluate(serial_solver, state))
+    assert returns.shape == (20, 1)
+    solver.worker_pool.close()
+
+
+def test_models_are_broadcast_on_change():
+    solver = get_solver(num_cpu=2)
+    pool = solver.worker_pool
+    state = torch.randn(4)
+    evaluate(solver, state)
+    models = pool.models
+    evaluate(solver, state)
+    assert pool.models is models
+
+    with torch.no_grad():
+        for parameter in solver.dynamical_model.parameters():
+            parameter.mul_(2.0)
+    torch.manual_seed(0)
+    returns = evaluate(solver, state)
+    assert pool.models is not models
+    for parameter, shared_parameter in zip(
+        solver.dynamical_model.parameters(), pool.models["dynamical_model"].parameters()
+    ):
+        assert shared_parameter.is_shared()
+        torch.testing.assert_close(parameter, shared_parameter)
+
+    serial_solver = copy.deepcopy(solver)
+    serial_solver.worker_pool = None
+    torch.manual_seed(0)
+    torch.testing.assert_close(returns, evaluate(serial_solver, state))
+
+    models = pool.models
+    solver.reset()
+    evaluate(solver, state)
+    assert pool.models is not models
+    pool.close()
+
+
+def test_fewer_particles_than_workers():
+    solver = get_solver(num_cpu=3, num_particles=2)
+    assert evaluate(solver, torch.randn(4)).shape == (2, 1)
+    solver.worker_pool.close()
+
+
+def test_policy_copy():
+    policy = MPCPolicy(get_solver(num_cpu=2))
+    policy(torch.randn(4))
+    assert not policy.solver.worker_pool.closed
+
+    policy_copy = copy.deepcopy(policy)
+    assert policy_copy.solver.worker_pool.closed
+    assert policy_copy(torch.randn(4))[0].shape == (2,)
+    policy.solver.worker_pool.close()
+    policy_copy.solver.worker_pool.close()
@@ -0,0 +1,327 @@
+"""Persistent pool of worker processes that evaluate MPC action sequences."""
+import copy
+import traceback
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from rllib.util.rollout import rollout_action_sequence
+from rllib.util.value_estimation import discount_sum
+
+
+@lru_cache(maxsize=None)
+def _compiled_rollout_action_sequence():
+    """Compile the planning rollout once per process."""
+    return torch.compile(rollout_action_sequence, dynamic=True)
+
+
+def rollout_returns(
+    dynamical_model,
+    reward_model,
+    action_sequence,
+    state,
+    gamma=1.0,
+    termination_model=None,
+    terminal_reward=None,
+    jit_compile=False,
+):
+    """Get the discounted returns of action sequences by rolling out the models.
+
+    Parameters
+    ----------
+    dynamical_model: AbstractModel.
+    reward_model: AbstractModel.
+    action_sequence: Tensor.
+        Scaled action sequences with shape [horizon, *batch_shape, dim_action].
+    state: Tensor.
+        Initial states with shape [*batch_shape, dim_state].
+    gamma: float, optional.
+        Discount factor.
+    termination_model: AbstractModel, optional.
+    terminal_reward: AbstractValueFunction, optional.
+    jit_compile: bool, optional.
+        Whether or not to compile the planning rollout with `torch.compile'.
+
+    Returns
+    -------
+    returns: Tensor.
+        Discounted returns of the action sequences.
+    """
+    if jit_compile:
+        rollout = _compiled_rollout_action_sequence()
+    else:
+        rollout = rollout_action_sequence
+    with torch.no_grad():
+        next_state, reward, _ = rollout(
+            dynamical_model, reward_model, action_sequence, state, termination_model
+        )
+
+        # Move the time coordinate next to the reward coordinate.
+        returns = discount_sum(reward.movedim(0, -2), gamma)
+
+        if terminal_reward:
+            terminal_reward = terminal_reward(next_state[-1])
+            returns = returns + gamma ** action_sequence.shape[0] * terminal_reward
+    return returns
+
+
+def _models_key(models):
+    """Get a key that changes when a tensor of the models is replaced or modified."""
+    key = []
+    for name, model in sorted(models.items()):
+        tensors = ()
+        if isinstance(model, nn.Module):
+            tensors = tuple(
+                (tensor.data_ptr(), tensor._version, tensor.shape)
+                for tensor in chain(model.parameters(), model.buffers())
+            )
+        key.append((name, id(model), tensors))
+    return tuple(key)
+
+
+def _mpc_worker(connection):
+    """Evaluate shards of action sequences on command.
+
+    Parameters
+    ----------
+    connection: Connection.
+        End of the pipe through which commands arrive and results are returned.
+        The commands are tuples (name, arguments), with names "models", "buffers",
+        "evaluate" and "close".
+    """
+    torch.set_num_threads(1)
+    models, buffers = None, None
+    while True:
+        command, args = connection.recv()
+        try:
+            result = None
+            if command == "models":
+                models = args
+            elif command == "buffers":
+                buffers = args
+            elif command == "evaluate":
+                start, end, gamma, jit_compile, seed = args
+                torch.manual_seed(seed)
+                result = rollout_returns(
+                    action_sequence=buffers["action_sequence"][..., start:end, :],
+                    state=buffers["state"][..., start:end, :],
+                    gamma=gamma,
+                    jit_compile=jit_compile,
+                    **models,
+                ).numpy()
+            elif command == "close":
+                connection.send(("closed", None))
+                break
+            else:
+                raise ValueError(f"Command {command} not understood.")
+        except Exception:
+            connection.send(("error", traceback.format_exc()))
+        else:
+            connection.send(("ok", result))
+    connection.close()
+
+
+class MPCWorkerPool(object):
+    """Persistent pool of worker processes that evaluate MPC action sequences.
+
+    The particles are split in contiguous shards: the first one is evaluated in the
+    calling process and the others in the workers, which send back the returns of
+    their shard.
+
+    The models are copied to shared memory and broadcast to the workers, which only
+    receive handles to the shared tensors. The models are broadcast again only when
+    one of their parameters or buffers is replaced or modified in-place, or after
+    `invalidate'. The action sequences and initial states are written to shared
+    memory buffers, which are reallocated only when their shape changes.
+
+    The worker processes are started at the first evaluation.
+
+    Parameters
+    ----------
+    num_workers: int.
+        Number of worker processes.
+
+    Examples
+    --------
+    >>> from rllib.model import NNModel
+    >>> dynamical_model = NNModel(dim_state=(4,), dim_action=(2,))
+    >>> reward_model = NNModel(dim_state=(4,), dim_action=(2,), model_kind="rewards")
+    >>> pool = MPCWorkerPool(num_workers=2)
+    >>> returns = pool.evaluate(
+    ...     {"dynamical_model": dynamical_model, "reward_model": reward_model},
+    ...     torch.randn(5, 30, 2),
+    ...     torch.randn(30, 4),
+    ... )
+    >>> returns.shape
+    torch.Size([30, 1])
+    >>> pool.close()
+    """
+
+    def __init__(self, num_workers):
+        self.num_workers = num_workers
+        self.models = None
+        self.buffers = None
+        self._models_key = None
+        self._connections, self._processes = [], []
+        self.closed = True
+
+    def _start(self):
+        """Start the worker processes."""
+        for _ in range(self.num_workers):
+            parent_connection, worker_connection = mp.Pipe()
+            process = mp.Process(
+                target=_mpc_worker, args=(worker_connection,), daemon=True
+            )
+            process.start()
+            worker_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+        self.closed = False
+
+    def _send(self, rank, command, args=None):
+        """Send a command to a worker."""
+        self._connections[rank].send((command, args))
+
+    def _receive(self, rank):
+        """Receive the result of a command from a worker."""
+        status, result = self._connections[rank].recv()
+        if status == "error":
+            raise RuntimeError(f"Worker {rank} failed with:\n{result}")
+        return result
+
+    def _broadcast(self, command, args):
+        """Send a command to all the workers and wait until they process it."""
+        for rank in range(self.num_workers):
+            self._send(rank, command, args)
+        for rank in range(self.num_workers):
+            self._receive(rank)
+
+    def invalidate(self):
+        """Broadcast the models again at the next evaluation.
+
+        Changes of the models other than those of their parameters and buffers, e.g.,
+        of the goal of a reward model, only reach the workers after this call.
+        """
+        self._models_key = None
+
+    def _update_models(self, models):
+        """Broadcast the models to the workers if they changed."""
+        key = _models_key(models)
+        if key == self._models_key:
+            return
+        shared_models = copy.deepcopy(models)
+        for model in shared_models.values():
+            if isinstance(model, nn.Module):
+                model.share_memory()
+        self._broadcast("models", shared_models)
+        self.models, self._models_key = shared_models, key
+
+    def _update_buffers(self, action_sequence, state):
+        """Write the action sequences and initial states to shared memory."""
+        tensors = {"action_sequence": action_sequence, "state": state}
+        if self.buffers is None or any(
+            self.buffers[name].shape != tensor.shape
+            or self.buffers[name].dtype != tensor.dtype
+            for name, tensor in tensors.items()
+        ):
+            self.buffers = {
+                name: torch.empty(tensor.shape, dtype=tensor.dtype).share_memory_()
+                for name, tensor in tensors.items()
+            }
+            self._broadcast("buffers", self.buffers)
+        for name, tensor in tensors.items():
+            self.buffers[name].copy_(tensor)
+
+    def evaluate(self, models, action_sequence, state, gamma=1.0, jit_compile=False):
+        """Evaluate action sequences in parallel.
+
+        Parameters
+        ----------
+        models: dict.
+            Keyword arguments of `rollout_returns' with the models, i.e.,
+            "dynamical_model", "reward_model" and optionally "termination_model"
+            and "terminal_reward".
+        action_sequence: Tensor.
+            Scaled action sequences with shape
+            [horizon, *batch_shape, num_particles, dim_action].
+        state: Tensor.
+            Initial states with shape [*batch_shape, num_particles, dim_state].
+        gamma: float, optional.
+            Discount factor.
+        jit_compile: bool, optional.
+            Whether or not to compile the planning rollout with `torch.compile'.
+
+        Returns
+        -------
+        returns: Tensor.
+            Discounted returns of the action sequences.
+            The particle dimension is the one after the batch dimensions.
+        """
+        if self.closed:
+            self._start()
+        self._update_models(models)
+        self._update_buffers(action_sequence, state)
+
+        num_shards = min(self.num_workers + 1, state.shape[-2])
+        shards = np.array_split(np.arange(state.shape[-2]), num_shards)
+        shards = [(int(shard[0]), int(shard[-1]) + 1) for shard in shards]
+        seeds = torch.randint(2 ** 31, (num_shards,)).tolist()
+        for rank, ((start, end), seed) in enumerate(zip(shards[1:], seeds[1:])):
+            self._send(rank, "evaluate", (start, end, gamma, jit_compile, seed))
+
+        start, end = shards[0]
+        try:
+            returns = rollout_returns(
+                action_sequence=action_sequence[..., start:end, :],
+                state=state[..., start:end, :],
+                gamma=gamma,
+                jit_compile=jit_compile,
+                **models,
+            )
+        finally:
+            # Receive all the results, so that the pipes stay in sync.
+            results = []
+            for rank in range(num_shards - 1):
+                try:
+                    results.append(self._receive(rank))
+                except RuntimeError as error:
+                    results.append(error)
+        for result in results:
+            if isinstance(result, RuntimeError):
+                raise result
+        returns = [returns] + [torch.from_numpy(result) for result in results]
+        return torch.cat(returns, dim=state.dim() - 2)
+
+    def close(self):
+        """Join the worker processes."""
+        if self.closed:
+            return
+        for rank in range(self.num_workers):
+            self._send(rank, "close")
+        for connection in self._connections:
+            connection.recv()
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections, self._processes = [], []
+        self.models, self.buffers, self._models_key = None, None, None
+        self.closed = True
+
+    def __getstate__(self):
+        """Get the state of the pool without the worker processes."""
+        return {"num_workers": self.num_workers}
+
+    def __setstate__(self, state):
+        """Set the state of the pool."""
+        self.__init__(num_workers=state["num_workers"])
+
+    def __del__(self):
+        """Close the pool when it is garbage collected."""
+        try:
+            self.close()
+        except Exception:
+            pass
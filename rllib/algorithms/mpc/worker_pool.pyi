@@ -0,0 +1,50 @@
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch.multiprocessing as mp
+from torch import Tensor
+
+from rllib.model import AbstractModel
+from rllib.value_function import AbstractValueFunction
+
+def _compiled_rollout_action_sequence() -> Callable[..., Tuple[Tensor, ...]]: ...
+def rollout_returns(
+    dynamical_model: AbstractModel,
+    reward_model: AbstractModel,
+    action_sequence: Tensor,
+    state: Tensor,
+    gamma: float = ...,
+    termination_model: Optional[AbstractModel] = ...,
+    terminal_reward: Optional[AbstractValueFunction] = ...,
+    jit_compile: bool = ...,
+) -> Tensor: ...
+def _models_key(models: Dict[str, Any]) -> Tuple: ...
+def _mpc_worker(connection: Connection) -> None: ...
+
+class MPCWorkerPool(object):
+    num_workers: int
+    models: Optional[Dict[str, Any]]
+    buffers: Optional[Dict[str, Tensor]]
+    closed: bool
+    _models_key: Optional[Tuple]
+    _connections: List[Connection]
+    _processes: List[mp.Process]
+    def __init__(self, num_workers: int) -> None: ...
+    def _start(self) -> None: ...
+    def _send(self, rank: int, command: str, args: Any = ...) -> None: ...
+    def _receive(self, rank: int) -> Any: ...
+    def _broadcast(self, command: str, args: Any) -> None: ...
+    def invalidate(self) -> None: ...
+    def _update_models(self, models: Dict[str, Any]) -> None: ...
+    def _update_buffers(self, action_sequence: Tensor, state: Tensor) -> None: ...
+    def evaluate(
+        self,
+        models: Dict[str, Any],
+        action_sequence: Tensor,
+        state: Tensor,
+        gamma: float = ...,
+        jit_compile: bool = ...,
+    ) -> Tensor: ...
+    def close(self) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
@@ -28,9 +28,10 @@ class MVE(Dyna):
         """Rollout model and call base algorithm with transitions."""
         self.base_algorithm.reset_info()
         loss = Loss()
-        loss += self.base_algorithm.actor_loss(observation).reduce("mean")
-        loss += self.model_augmented_critic_loss(observation).reduce("mean")
-        loss += self.base_algorithm.regularization_loss(observation).reduce("mean")
+        with self.forward_cache():
+            loss += self.base_algorithm.actor_loss(observation).reduce("mean")
+            loss += self.model_augmented_critic_loss(observation).reduce("mean")
+            loss += self.base_algorithm.regularization_loss(observation).reduce("mean")
         return loss
 
     def model_augmented_critic_loss(self, observation):
@@ -4,7 +4,6 @@ import torch
 from rllib.dataset.datatypes import Loss
 from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.model.utilities import PredictionStrategy
-from rllib.util.multiprocessing import run_parallel_returns
 from rllib.util.value_estimation import n_step_return
 from rllib.value_function import NNEnsembleQFunction
 
@@ -56,45 +55,9 @@ class STEVE(MVE):
 
         return Loss(critic_loss=critic_loss)
 
-    def _get_member_target(self, model_idx, state, action, critic_target):
-        """Get member target.
-
-        Notes
-        -----
-        Helper method to paralelize the calculation through processes.
-        """
-        self.dynamical_model.set_head(model_idx)
-        self.reward_model.set_head(model_idx)
-        with torch.no_grad():
-            trajectory = self.simulation_algorithm.simulate(
-                state, self.policy, initial_action=action
-            )
-            observation = stack_list_of_tuples(trajectory, dim=state.ndim - 2)
-            n_step_returns = n_step_return(
-                observation,
-                gamma=self.gamma,
-                value_function=self.value_function,
-                reward_transformer=self.reward_transformer,
-                entropy_regularization=self.entropy_loss.eta.item(),
-                reduction="none",
-            )  # samples*batch x horizon x num_q
-            value = n_step_returns.reshape(
-                -1, 1, self.num_particles, self.num_model_steps, self.num_q
-            )
-        return value
-
-    def get_value_target(self, observation):
-        """Rollout model and call base algorithm with transitions."""
-        critic_target = torch.zeros(
-            observation.state.shape[: -len(self.dynamical_model.dim_state)]
-            + (
-                self.num_particles,
-                self.num_model_steps + 1,
-                self.num_models,
-                self.num_q,
-            )
-        )  # Critic target shape B x (H + 1) x M x Q
-        td_return = n_step_return(
+    def _n_step_return(self, observation):
+        """Get the n-step returns of an observation for every critic head."""
+        return n_step_return(
             observation,
             gamma=self.gamma,
             value_function=self.value_function,
@@ -102,26 +65,58 @@ class STEVE(MVE):
             entropy_regularization=self.entropy_loss.eta.item(),
             reduction="none",
         )
-        td_samples = td_return.unsqueeze(-2).repeat_interleave(self.num_particles, -2)
-        td_model = td_samples.unsqueeze(-2).repeat_interleave(self.num_models, -2)
-        if td_model.shape != critic_target[..., -1, :, :].shape:
-            td_model = td_model.unsqueeze(1)
-        critic_target[..., -1, :, :] = td_model
+
+    def get_value_target(self, observation):
+        """Get the STEVE target of the first transition of an observation.
+
+        All the model heads are rolled out at once: the initial state-actions are
+        repeated for every head and particle, and each row of the batched rollout
+        follows its own head with the `set_head_idx' prediction strategy.
+        The candidate targets are the TD target of the observation and the n-step
+        targets of the rollouts, with shape
+        [num_particles, num_models, *batch_shape, num_model_steps + 1, ..., num_q].
+        They are averaged with weights inversely proportional to their variance
+        across particles, models and critic heads.
+        """
+        td_return = self._n_step_return(observation)[..., :1, :, :]
+        state = observation.state[..., 0, :]
+        action = observation.action[..., 0, :]
+        batch_shape = state.shape[:-1]
+        num_particles = max(self.num_particles, 1)
+
+        # Repeat the state-actions for each model and set the head of each row.
+        state = state.expand(self.num_models, *state.shape)
+        action = action.expand(self.num_models, *action.shape)
+        head_idx = torch.arange(self.num_models).reshape(
+            (self.num_models,) + (1,) * len(batch_shape)
+        )
+        head_idx = head_idx.expand((num_particles,) + state.shape[:-1])
+        if self.num_particles > 0:  # The simulation flattens the particles.
+            head_idx = head_idx.reshape(-1)
+        else:
+            head_idx = head_idx[0]
 
         with PredictionStrategy(
-            self.dynamical_model, self.reward_model, prediction_strategy="set_head"
+            self.dynamical_model, self.reward_model, prediction_strategy="set_head_idx"
         ), torch.no_grad():
-            state = observation.state[..., 0, :]
-            action = observation.action[..., 0, :]
-            value = run_parallel_returns(
-                self._get_member_target,
-                [(i, state, action, critic_target) for i in range(self.num_models)],
+            self.dynamical_model.set_head_idx(head_idx)
+            self.reward_model.set_head_idx(head_idx)
+            trajectory = self.simulation_algorithm.simulate(
+                state, self.policy, initial_action=action
             )
-            critic_target[..., :-1, :, :] = torch.stack(value, dim=4)
+            sim_observation = stack_list_of_tuples(trajectory, dim=-2)
+            model_return = self._n_step_return(sim_observation)
+        model_return = model_return.reshape(
+            num_particles, self.num_models, *batch_shape, *model_return.shape[1:]
+        )
+
+        td_return = td_return.expand(num_particles, self.num_models, *td_return.shape)
+        horizon_dim = 2 + len(batch_shape)
+        critic_target = torch.cat((model_return, td_return), dim=horizon_dim)
 
-        mean_target = critic_target.mean(dim=(2, 4, 5))  # (samples, models, qs)
-        weight_target = 1 / (self.eps + critic_target.var(dim=(2, 4, 5)))
+        # Reduce the particles, models, and critic heads.
+        mean_target = critic_target.mean(dim=(0, 1, -1))
+        weight_target = 1 / (self.eps + critic_target.var(dim=(0, 1, -1)))
 
-        weights = weight_target / weight_target.sum(-1, keepdim=True)
-        target_q = (weights * mean_target).sum(-1)
-        return target_q
+        weights = weight_target / weight_target.sum(horizon_dim - 2, keepdim=True)
+        return (weights * mean_target).sum(horizon_dim - 2, keepdim=True)
@@ -6,7 +6,8 @@ from .dyna import Dyna
 
 class STEVE(Dyna):
     num_models: int
-    num_q = int
+    num_q: int
     def __init__(self) -> None: ...
     def model_augmented_critic_loss(self, observation: Observation) -> Loss: ...
+    def _n_step_return(self, observation: Observation) -> Tensor: ...
     def get_value_target(self, observation: Observation) -> Tensor: ...
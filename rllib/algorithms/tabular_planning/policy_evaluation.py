@@ -1,12 +1,16 @@
 """Policy Evaluation Algorithms."""
 
-import numpy as np
 import torch
 
-from rllib.environment import mdp2mrp, transitions2kernelreward
-from rllib.util.utilities import tensor_to_distribution
-
-from .utilities import init_value_function
+from .utilities import (
+    bellman_backup,
+    build_kernel_reward,
+    get_policy_probabilities,
+    get_values,
+    init_value_function,
+    non_terminal_mask,
+    stopping_threshold,
+)
 
 
 def linear_system_policy_evaluation(policy, model, gamma, value_function=None):
@@ -21,17 +25,25 @@ def linear_system_policy_evaluation(policy, model, gamma, value_function=None):
     if value_function is None:
         value_function = init_value_function(model.num_states, model.terminal_states)
 
-    mrp = mdp2mrp(environment=model, policy=policy)
+    kernel, reward = build_kernel_reward(model)
+    probabilities = get_policy_probabilities(policy, model.num_states)
+    non_terminal = non_terminal_mask(model)
 
-    kernel, reward = transitions2kernelreward(
-        mrp.transitions, model.num_states, model.num_actions
-    )
+    # Marginalize the actions: P_pi(s' | s) = sum_a pi(a | s) P(s' | s, a).
+    rows, next_states = kernel.indices()
+    states = torch.div(rows, model.num_actions, rounding_mode="floor")
+    weights = kernel.values() * probabilities.reshape(-1)[rows]
+    kernel = torch.zeros(model.num_states, model.num_states)
+    kernel.index_put_((states, next_states), weights, accumulate=True)
+    reward = (probabilities * reward).sum(dim=-1)
+
+    # Terminal states are absorbing and have zero reward.
+    kernel[~non_terminal] = 0
+    reward[~non_terminal] = 0
 
-    A = torch.eye(model.num_states) - gamma * kernel[:, 0, :]
-    # torch.testing.assert_allclose(A.inverse() @ A, torch.eye(model.num_states))
-    vals = A.inverse() @ reward[:, 0]
-    for state in range(model.num_states):
-        value_function.set_value(state, vals[state].item())
+    A = torch.eye(model.num_states) - gamma * kernel
+    vals = torch.linalg.solve(A, reward)
+    value_function.set_value(torch.arange(model.num_states), vals)
 
     return value_function
 
@@ -41,6 +53,9 @@ def iterative_policy_evaluation(
 ):
     """Implement Policy Evaluation algorithm (policy iteration without max).
 
+    The transitions of the model are compiled once into a sparse kernel and the
+    Bellman backups of all the states are computed at once.
+
     Parameters
     ----------
     policy: AbstractPolicy
@@ -75,34 +90,59 @@ def iterative_policy_evaluation(
     if value_function is None:
         value_function = init_value_function(model.num_states, model.terminal_states)
 
-    for _ in range(max_iter):
-        max_error = 0
-        for state in range(model.num_states):
-            if state in model.terminal_states:
-                continue
-
-            value_estimate = torch.tensor([0.0])
-            state = torch.tensor(state).long()
-            policy_ = tensor_to_distribution(policy(state), **policy.dist_params)
-            for action in np.where(policy_.probs.detach().numpy())[0]:
-                p_action = policy_.probs[action].item()
-                for transition in model.transitions[(state.item(), action)]:
-                    next_state = torch.tensor(transition["next_state"]).long()
-                    reward = torch.tensor(
-                        transition["reward"], dtype=torch.get_default_dtype()
-                    )
-                    value_estimate += (
-                        p_action
-                        * transition["probability"]
-                        * (reward + gamma * value_function(next_state))
-                    )
-
-            value = value_function(state)
-            error = torch.abs(value_estimate - value).item()
-            max_error = max(max_error, error)
-            value_function.set_value(state, value_estimate)
-
-        if max_error < eps:
-            break
+    kernel, reward = build_kernel_reward(model)
+    value = evaluate_policy_probabilities(
+        kernel,
+        reward,
+        get_policy_probabilities(policy, model.num_states),
+        get_values(value_function, model.num_states),
+        non_terminal_mask(model),
+        gamma,
+        eps=eps,
+        max_iter=max_iter,
+    )
+    value_function.set_value(torch.arange(model.num_states), value)
 
     return value_function
+
+
+def evaluate_policy_probabilities(
+    kernel, reward, probabilities, value, non_terminal, gamma, eps=1e-6, max_iter=1000
+):
+    """Evaluate the action probabilities of a policy with Bellman backups.
+
+    Parameters
+    ----------
+    kernel: Tensor.
+        Sparse kernel of shape [num_states * num_actions, num_states].
+    reward: Tensor.
+        Reward matrix of shape [num_states, num_actions].
+    probabilities: Tensor.
+        Action probabilities of the policy with shape [num_states, num_actions].
+    value: Tensor.
+        Initial estimate of the value of each state with shape [num_states].
+    non_terminal: Tensor.
+        Boolean mask of the states that are updated with shape [num_states].
+    gamma: float.
+        Discount factor.
+    eps: float, optional.
+        The evaluation stops when the value is guaranteed to be eps-accurate.
+    max_iter: int, optional.
+        Maximum number of backups.
+
+    Returns
+    -------
+    value: Tensor.
+        Value of each state with shape [num_states].
+    """
+    threshold = stopping_threshold(eps, gamma)
+    for _ in range(max_iter):
+        q_value = bellman_backup(kernel, reward, value, gamma)
+        new_value = torch.where(
+            non_terminal, (probabilities * q_value).sum(dim=-1), value
+        )
+        error = torch.abs(new_value - value).max().item()
+        value = new_value
+        if error < threshold:
+            break
+    return value
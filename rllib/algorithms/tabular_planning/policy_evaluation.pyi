@@ -1,5 +1,7 @@
 from typing import Optional
 
+from torch import Tensor
+
 from rllib.environment import MDP
 from rllib.policy import AbstractPolicy
 from rllib.value_function import TabularValueFunction
@@ -18,3 +20,13 @@ def iterative_policy_evaluation(
     max_iter: int = ...,
     value_function: Optional[TabularValueFunction] = ...,
 ) -> TabularValueFunction: ...
+def evaluate_policy_probabilities(
+    kernel: Tensor,
+    reward: Tensor,
+    probabilities: Tensor,
+    value: Tensor,
+    non_terminal: Tensor,
+    gamma: float,
+    eps: float = ...,
+    max_iter: int = ...,
+) -> Tensor: ...
@@ -1,17 +1,29 @@
 """Policy iteration algorithm."""
 
 import torch
-import torch.testing
 
 from rllib.policy import TabularPolicy
+from rllib.util.neural_networks.utilities import one_hot_encode
 
-from .policy_evaluation import iterative_policy_evaluation
-from .utilities import init_value_function
+from .policy_evaluation import evaluate_policy_probabilities
+from .utilities import (
+    bellman_backup,
+    build_kernel_reward,
+    get_policy_probabilities,
+    get_values,
+    init_value_function,
+    non_terminal_mask,
+    set_greedy_policy,
+    stopping_threshold,
+)
 
 
 def policy_iteration(model, gamma, eps=1e-6, max_iter=1000, value_function=None):
     """Implement Policy Iteration algorithm.
 
+    The transitions of the model are compiled once into a sparse kernel, and the
+    evaluation and improvement steps are computed for all the states at once.
+
     Parameters
     ----------
     model:
@@ -33,6 +45,48 @@ def policy_iteration(model, gamma, eps=1e-6, max_iter=1000, value_function=None)
     Chapter 4.3
 
     """
+    return _policy_iteration(
+        model, gamma, eps, max_iter, value_function, num_evaluation_iter=max_iter
+    )
+
+
+def modified_policy_iteration(
+    model, gamma, eps=1e-6, max_iter=1000, value_function=None, num_evaluation_iter=5
+):
+    """Implement Modified Policy Iteration algorithm.
+
+    The policy evaluation step is truncated to `num_evaluation_iter' backups, which
+    interpolates between value iteration (num_evaluation_iter=0) and policy
+    iteration (num_evaluation_iter=inf). The algorithm stops when the value function
+    is guaranteed to be eps-close to the optimal one.
+
+    Parameters
+    ----------
+    model:
+    gamma: discount factor.
+    eps: desired precision of the value function.
+    max_iter: maximum number of iterations
+    value_function: initial estimate of value function, optional.
+    num_evaluation_iter: number of backups of each policy evaluation step.
+
+    Returns
+    -------
+    policy:
+    value_function:
+
+    References
+    ----------
+    Puterman, M. L., & Shin, M. C. (1978).
+    Modified policy iteration algorithms for discounted Markov decision problems.
+    Management Science.
+    """
+    return _policy_iteration(
+        model, gamma, eps, max_iter, value_function, num_evaluation_iter
+    )
+
+
+def _policy_iteration(model, gamma, eps, max_iter, value_function, num_evaluation_iter):
+    """Run (modified) policy iteration with truncated policy evaluation steps."""
     if model.num_actions is None or model.num_states is None:
         raise NotImplementedError("Actions and States must be discrete and countable.")
 
@@ -40,36 +94,47 @@ def policy_iteration(model, gamma, eps=1e-6, max_iter=1000, value_function=None)
         value_function = init_value_function(model.num_states, model.terminal_states)
     policy = TabularPolicy(num_states=model.num_states, num_actions=model.num_actions)
 
+    kernel, reward = build_kernel_reward(model)
+    non_terminal = non_terminal_mask(model)
+    value = get_values(value_function, model.num_states)
+    probabilities = get_policy_probabilities(policy, model.num_states)
+    action = None
+
+    modified = num_evaluation_iter < max_iter
     for _ in range(max_iter):
-        value_function = iterative_policy_evaluation(
-            policy, model, gamma, eps, value_function=value_function
+        value = evaluate_policy_probabilities(
+            kernel,
+            reward,
+            probabilities,
+            value,
+            non_terminal,
+            gamma,
+            eps=0 if modified else eps,
+            max_iter=num_evaluation_iter,
         )
 
-        policy_stable = True
-        for state in range(model.num_states):
-
-            value_ = torch.zeros(model.num_actions)
-            for action in range(model.num_actions):
-                value_estimate = 0
-                for transition in model.transitions[(state, action)]:
-                    next_state = torch.tensor(transition["next_state"]).long()
-                    reward = torch.tensor(
-                        transition["reward"], dtype=torch.get_default_dtype()
-                    )
-                    value_estimate += transition["probability"] * (
-                        reward + gamma * value_function(next_state)
-                    )
-
-                value_[action] = value_estimate
-
-            state = torch.tensor(state).long()
-            old_action = policy(state)
-            action = torch.argmax(value_)
-            policy.set_value(state, action)
-
-            policy_stable &= (policy(state) == old_action).all().item()
-
-        if policy_stable:
+        q_value = bellman_backup(kernel, reward, value, gamma)
+        max_q_value, greedy_action = q_value.max(dim=-1)
+        if action is not None:  # Keep the previous action on ties to avoid cycles.
+            old_q_value = q_value.gather(-1, action.unsqueeze(-1)).squeeze(-1)
+            tolerance = 0 if modified else eps
+            greedy_action = torch.where(
+                old_q_value >= max_q_value - tolerance, action, greedy_action
+            )
+        policy_stable = action is not None and (greedy_action == action).all()
+        action = greedy_action
+        probabilities = one_hot_encode(action, num_classes=model.num_actions)
+
+        if modified:
+            new_value = torch.where(non_terminal, max_q_value, value)
+            error = torch.abs(new_value - value).max().item()
+            value = new_value
+            if error < stopping_threshold(eps, gamma):
+                break
+        elif policy_stable:
             break
 
+    value_function.set_value(torch.arange(model.num_states), value)
+    set_greedy_policy(policy, action)
+
     return policy, value_function
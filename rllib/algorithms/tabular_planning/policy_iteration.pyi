@@ -11,3 +11,19 @@ def policy_iteration(
     max_iter: int = ...,
     value_function: Optional[TabularValueFunction] = ...,
 ) -> Tuple[TabularPolicy, TabularValueFunction]: ...
+def modified_policy_iteration(
+    model: MDP,
+    gamma: float,
+    eps: float = ...,
+    max_iter: int = ...,
+    value_function: Optional[TabularValueFunction] = ...,
+    num_evaluation_iter: int = ...,
+) -> Tuple[TabularPolicy, TabularValueFunction]: ...
+def _policy_iteration(
+    model: MDP,
+    gamma: float,
+    eps: float,
+    max_iter: int,
+    value_function: Optional[TabularValueFunction],
+    num_evaluation_iter: int,
+) -> Tuple[TabularPolicy, TabularValueFunction]: ...
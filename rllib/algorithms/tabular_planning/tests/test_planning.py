@@ -4,11 +4,12 @@ import torch.testing
 from rllib.algorithms.tabular_planning import (
     iterative_policy_evaluation,
     linear_system_policy_evaluation,
+    modified_policy_iteration,
     policy_iteration,
     value_iteration,
 )
 from rllib.environment.gym_environment import GymEnvironment
-from rllib.environment.mdps import EasyGridWorld
+from rllib.environment.mdps import EasyGridWorld, RandomMDP
 from rllib.policy import RandomPolicy
 
 RANDOM_VALUE = (
@@ -159,6 +160,45 @@ def test_value_iteration():
     )
 
 
+@pytest.mark.parametrize("num_evaluation_iter", [0, 1, 10])
+def test_modified_policy_iteration(num_evaluation_iter):
+    environment = EasyGridWorld(terminal_states=[22])
+    GAMMA = 0.9
+    EPS = 1e-3
+    policy, value_function = modified_policy_iteration(
+        environment, GAMMA, eps=EPS, num_evaluation_iter=num_evaluation_iter
+    )
+
+    torch.testing.assert_allclose(
+        value_function.table,
+        torch.tensor([OPTIMAL_VALUE_WITH_TERMINAL]).unsqueeze(-1),
+        atol=0.05,
+        rtol=EPS,
+    )
+    pred_p = policy.table.argmax(dim=0)
+    assert_policy_equality(
+        environment, GAMMA, value_function, OPTIMAL_POLICY_WITH_TERMINAL, pred_p
+    )
+
+
+def test_random_mdp():
+    environment = RandomMDP(num_states=20, num_actions=3)
+    GAMMA = 0.9
+    EPS = 1e-4
+
+    vi_policy, vi_value = value_iteration(environment, GAMMA, eps=EPS)
+    pi_policy, pi_value = policy_iteration(environment, GAMMA, eps=EPS)
+    torch.testing.assert_close(vi_value.table, pi_value.table, atol=1e-3, rtol=0)
+    torch.testing.assert_close(vi_policy.table, pi_policy.table)
+
+    iterative_value = iterative_policy_evaluation(vi_policy, environment, GAMMA, EPS)
+    linear_value = linear_system_policy_evaluation(vi_policy, environment, GAMMA)
+    torch.testing.assert_close(
+        iterative_value.table, linear_value.table, atol=1e-3, rtol=0
+    )
+    torch.testing.assert_close(vi_value.table, linear_value.table, atol=1e-3, rtol=0)
+
+
 def assert_policy_equality(environment, gamma, value_function, true_opt_p, pred_opt_p):
     """Assert equality by checking Bellman operator equality."""
     for state in range(environment.num_states):
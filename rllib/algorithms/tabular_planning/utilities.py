@@ -1,5 +1,11 @@
 """Utilities for tabular planning functions."""
 
+import numpy as np
+import torch
+
+from rllib.policy import TabularPolicy
+from rllib.util.neural_networks.utilities import one_hot_encode
+from rllib.util.utilities import tensor_to_distribution
 from rllib.value_function import TabularValueFunction
 
 
@@ -11,3 +17,115 @@ def init_value_function(num_states, terminal_states=None):
         value_function.set_value(terminal_state, 0)
 
     return value_function
+
+
+def build_kernel_reward(model):
+    """Compile the transitions of an MDP into a sparse kernel and a reward matrix.
+
+    The transitions are traversed only once, so that the Bellman backups of the
+    planning algorithms are tensor operations.
+
+    Parameters
+    ----------
+    model: MDP.
+        Model with a `transitions' dictionary, e.g. an MDP environment.
+
+    Returns
+    -------
+    kernel: Tensor.
+        Sparse tensor of shape [num_states * num_actions, num_states], whose row
+        `state * num_actions + action' is the distribution of the next state.
+    reward: Tensor.
+        Tensor of shape [num_states, num_actions] with the expected rewards.
+    """
+    num_states, num_actions = model.num_states, model.num_actions
+    rows, next_states, probabilities, rewards = [], [], [], []
+    for (state, action), transitions in model.transitions.items():
+        for transition in transitions:
+            rows.append(state * num_actions + action)
+            next_states.append(transition["next_state"])
+            probabilities.append(transition["probability"])
+            rewards.append(np.asarray(transition["reward"]).item())
+
+    rows = torch.tensor(np.array(rows, dtype=np.int64))
+    next_states = torch.tensor(np.array(next_states, dtype=np.int64))
+    probabilities = torch.tensor(probabilities, dtype=torch.get_default_dtype())
+    rewards = torch.tensor(rewards, dtype=torch.get_default_dtype())
+
+    kernel = torch.sparse_coo_tensor(
+        torch.stack((rows, next_states)),
+        probabilities,
+        size=(num_states * num_actions, num_states),
+    ).coalesce()
+    reward = torch.zeros(num_states * num_actions).index_add_(
+        0, rows, probabilities * rewards
+    )
+    return kernel, reward.reshape(num_states, num_actions)
+
+
+def bellman_backup(kernel, reward, value, gamma):
+    """Compute the Q-values Q(s, a) = r(s, a) + gamma * sum_s' P(s' | s, a) V(s').
+
+    Parameters
+    ----------
+    kernel: Tensor.
+        Sparse kernel of shape [num_states * num_actions, num_states].
+    reward: Tensor.
+        Reward matrix of shape [num_states, num_actions].
+    value: Tensor.
+        Value of each state with shape [num_states].
+    gamma: float.
+        Discount factor.
+
+    Returns
+    -------
+    q_value: Tensor.
+        Q-values of shape [num_states, num_actions].
+    """
+    next_value = torch.sparse.mm(kernel, value.unsqueeze(-1)).reshape(reward.shape)
+    return reward + gamma * next_value
+
+
+def stopping_threshold(eps, gamma):
+    """Return the largest change of a backup that ensures an eps-accurate value.
+
+    If ||T V - V|| < eps (1 - gamma) / gamma, then ||T V - V*|| < eps, where T is a
+    gamma-contraction with fixed point V*.
+    """
+    if gamma >= 1:
+        return eps
+    return eps * (1 - gamma) / gamma
+
+
+def non_terminal_mask(model):
+    """Return a boolean mask of the states that are not terminal."""
+    mask = torch.ones(model.num_states, dtype=torch.bool)
+    mask[list(model.terminal_states)] = False
+    return mask
+
+
+def get_values(value_function, num_states):
+    """Get the value of all the states of a tabular value function."""
+    with torch.no_grad():
+        if isinstance(value_function, TabularValueFunction):
+            return value_function.table.reshape(num_states).clone()
+        return value_function(torch.arange(num_states)).reshape(num_states)
+
+
+def get_policy_probabilities(policy, num_states):
+    """Get the action probabilities of all the states of a tabular policy."""
+    with torch.no_grad():
+        if isinstance(policy, TabularPolicy):
+            return torch.softmax(policy.table.T, dim=-1)
+        pi = tensor_to_distribution(
+            policy(torch.arange(num_states)), **policy.dist_params
+        )
+    return pi.probs
+
+
+def set_greedy_policy(policy, actions):
+    """Set a tabular policy to take `actions' deterministically."""
+    with torch.no_grad():
+        policy.table[:] = torch.log(
+            one_hot_encode(actions, num_classes=policy.num_actions).T + 1e-12
+        )
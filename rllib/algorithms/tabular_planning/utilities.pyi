@@ -1,9 +1,22 @@
 """Utilities for tabular planning functions."""
 
-from typing import List
+from typing import List, Tuple
 
-from rllib.value_function import TabularValueFunction
+from torch import Tensor
+
+from rllib.environment import MDP
+from rllib.policy import AbstractPolicy, TabularPolicy
+from rllib.value_function import AbstractValueFunction, TabularValueFunction
 
 def init_value_function(
     num_states: int, terminal_states: List[int]
 ) -> TabularValueFunction: ...
+def build_kernel_reward(model: MDP) -> Tuple[Tensor, Tensor]: ...
+def bellman_backup(
+    kernel: Tensor, reward: Tensor, value: Tensor, gamma: float
+) -> Tensor: ...
+def stopping_threshold(eps: float, gamma: float) -> float: ...
+def non_terminal_mask(model: MDP) -> Tensor: ...
+def get_values(value_function: AbstractValueFunction, num_states: int) -> Tensor: ...
+def get_policy_probabilities(policy: AbstractPolicy, num_states: int) -> Tensor: ...
+def set_greedy_policy(policy: TabularPolicy, actions: Tensor) -> None: ...
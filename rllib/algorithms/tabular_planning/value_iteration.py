@@ -2,13 +2,25 @@
 
 import torch
 
-from rllib.algorithms.tabular_planning.utilities import init_value_function
+from rllib.algorithms.tabular_planning.utilities import (
+    bellman_backup,
+    build_kernel_reward,
+    get_values,
+    init_value_function,
+    non_terminal_mask,
+    set_greedy_policy,
+    stopping_threshold,
+)
 from rllib.policy import TabularPolicy
 
 
 def value_iteration(model, gamma, eps=1e-6, max_iter=1000, value_function=None):
     """Implement of Value Iteration algorithm.
 
+    The transitions of the model are compiled once into a sparse kernel and the
+    Bellman optimality backups of all the states are computed at once. The algorithm
+    stops when the value function is guaranteed to be eps-close to the optimal one.
+
     Parameters
     ----------
     model:
@@ -36,31 +48,21 @@ def value_iteration(model, gamma, eps=1e-6, max_iter=1000, value_function=None):
         value_function = init_value_function(model.num_states, model.terminal_states)
     policy = TabularPolicy(num_states=model.num_states, num_actions=model.num_actions)
 
-    for _ in range(max_iter):
-        error = 0
-        for state in range(model.num_states):
-
-            value_ = torch.zeros(model.num_actions)
-            for action in range(model.num_actions):
-                value_estimate = 0
-                for transition in model.transitions[(state, action)]:
-                    next_state = torch.tensor(transition["next_state"]).long()
-                    reward = torch.tensor(
-                        transition["reward"], dtype=torch.get_default_dtype()
-                    )
-                    value_estimate += transition["probability"] * (
-                        reward + gamma * value_function(next_state)
-                    )
-                value_[action] = value_estimate
-            state = torch.tensor(state).long()
-            value = value_function(state)
-            value_, action = torch.max(value_, 0)
+    kernel, reward = build_kernel_reward(model)
+    non_terminal = non_terminal_mask(model)
+    value = get_values(value_function, model.num_states)
+    threshold = stopping_threshold(eps, gamma)
 
-            error = max(error, torch.abs(value_ - value.item()))
-            value_function.set_value(state, value_)
-            policy.set_value(state, action)
-
-        if error < eps:
+    for _ in range(max_iter):
+        q_value = bellman_backup(kernel, reward, value, gamma)
+        new_value = torch.where(non_terminal, q_value.max(dim=-1)[0], value)
+        error = torch.abs(new_value - value).max().item()
+        value = new_value
+        if error < threshold:
             break
 
+    action = bellman_backup(kernel, reward, value, gamma).argmax(dim=-1)
+    value_function.set_value(torch.arange(model.num_states), value)
+    set_greedy_policy(policy, action)
+
     return policy, value_function
@@ -0,0 +1,48 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.agent import MPOAgent, SACAgent, TD3Agent
+from rllib.dataset.datatypes import Observation
+from rllib.environment import GymEnvironment
+
+
+@pytest.fixture(params=[SACAgent, MPOAgent, TD3Agent])
+def agent(request):
+    agent = request.param.default(GymEnvironment("Pendulum-v1"))
+    agent.logger.delete_directory()
+    return agent
+
+
+def get_observation(batch_size=8):
+    return Observation(
+        state=torch.randn(batch_size, 1, 3),
+        action=torch.randn(batch_size, 1, 1).tanh(),
+        reward=torch.randn(batch_size, 1, 1),
+        next_state=torch.randn(batch_size, 1, 3),
+        done=torch.zeros(batch_size, 1),
+        log_prob_action=torch.zeros(batch_size, 1),
+    )
+
+
+def test_losses(agent):
+    algorithm = agent.algorithm
+    observation = get_observation()
+    losses, gradients = [], []
+    for cache_forward in [False, True]:
+        algorithm.cache_forward = cache_forward
+        algorithm.zero_grad()
+        torch.manual_seed(0)
+        loss = algorithm(observation).combined_loss.mean()
+        loss.backward()
+        losses.append(loss.detach())
+        gradients.append(
+            [
+                torch.zeros_like(param) if param.grad is None else param.grad.clone()
+                for param in algorithm.parameters()
+            ]
+        )
+
+    torch.testing.assert_close(losses[0], losses[1])
+    for gradient, cached_gradient in zip(*gradients):
+        torch.testing.assert_close(gradient, cached_gradient)
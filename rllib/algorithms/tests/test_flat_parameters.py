@@ -0,0 +1,62 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.agent import SACAgent
+from rllib.environment import GymEnvironment
+from rllib.util.neural_networks.utilities import deep_copy_module
+
+
+@pytest.fixture
+def algorithm():
+    agent = SACAgent.default(GymEnvironment("Pendulum-v1"), flat_parameters=True)
+    agent.logger.delete_directory()
+    return agent.algorithm
+
+
+def assert_state_dict_close(module, other):
+    other_state_dict = other.state_dict()
+    for name, value in module.state_dict().items():
+        torch.testing.assert_close(value, other_state_dict[name])
+
+
+def test_arenas(algorithm):
+    for module in [
+        algorithm.policy,
+        algorithm.policy_target,
+        algorithm.old_policy,
+        algorithm.critic,
+        algorithm.critic_target,
+    ]:
+        assert module._parameter_arena.is_valid()
+    assert (
+        algorithm.critic._parameter_arena.flat.data_ptr()
+        != algorithm.critic_target._parameter_arena.flat.data_ptr()
+    )
+
+
+def test_update(algorithm):
+    with torch.no_grad():
+        for param in algorithm.critic.parameters():
+            param.add_(torch.randn_like(param))
+    critic_target = deep_copy_module(algorithm.critic_target)
+    del critic_target._parameter_arena
+
+    algorithm.update()
+    critic_target.load_state_dict(
+        {
+            name: algorithm.critic.tau * value
+            + (1 - algorithm.critic.tau) * algorithm.critic.state_dict()[name]
+            for name, value in critic_target.state_dict().items()
+        }
+    )
+    assert_state_dict_close(algorithm.critic_target, critic_target)
+
+
+def test_reset(algorithm):
+    with torch.no_grad():
+        for param in algorithm.policy.parameters():
+            param.add_(torch.randn_like(param))
+    algorithm.reset()
+    assert_state_dict_close(algorithm.old_policy, algorithm.policy)
+    assert algorithm.old_policy._parameter_arena.is_valid()
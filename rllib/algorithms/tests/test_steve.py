@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+import torch
+import torch.testing
+
+from rllib.agent import STEVEAgent
+from rllib.dataset import ExperienceReplay
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.utilities import stack_list_of_tuples
+from rllib.environment import SystemEnvironment
+from rllib.environment.systems import InvertedPendulum
+from rllib.model import EnsembleModel, TransformedModel
+from rllib.model.utilities import PredictionStrategy
+from rllib.reward.state_action_reward import StateActionReward
+
+
+class PendulumReward(StateActionReward):
+    dim_action = (1,)
+
+    def state_reward(self, state, next_state=None):
+        return -state.square().sum(-1)
+
+
+@pytest.fixture(params=[1, 3])
+def num_particles(request):
+    return request.param
+
+
+def get_algorithm(num_particles, num_models=3):
+    environment = SystemEnvironment(
+        InvertedPendulum(mass=0.3, length=0.5, friction=0.005, step_size=0.01),
+        reward=PendulumReward(),
+        initial_state=lambda: torch.tensor([np.pi, 0.0]),
+    )
+    dynamical_model = TransformedModel(
+        EnsembleModel(
+            dim_state=(2,), dim_action=(1,), num_heads=num_models, deterministic=True
+        ),
+        [],
+    )
+    agent = STEVEAgent.default(
+        environment,
+        base_agent_name="DPG",
+        dynamical_model=dynamical_model,
+        num_model_steps=4,
+        num_particles=num_particles,
+    )
+    agent.logger.delete_directory()
+    agent.algorithm.policy.deterministic = True  # Deterministic rollouts.
+    return agent.algorithm
+
+
+def get_observation(batch_size=8):
+    memory = ExperienceReplay(max_len=100)
+    for _ in range(batch_size):
+        observation = Observation.random_example(dim_state=(2,), dim_action=(1,))
+        observation.action = torch.tanh(observation.action)
+        memory.append(observation)
+    return memory.sample_batch(batch_size)[0]
+
+
+def reference_value_target(algorithm, observation):
+    """Get the STEVE target rolling out one head at a time."""
+    td_return = algorithm._n_step_return(observation)
+    state, action = observation.state[..., 0, :], observation.action[..., 0, :]
+    num_particles = max(algorithm.num_particles, 1)
+    model_returns = []
+    with PredictionStrategy(
+        algorithm.dynamical_model,
+        algorithm.reward_model,
+        prediction_strategy="set_head",
+    ), torch.no_grad():
+        for head in range(algorithm.num_models):
+            algorithm.dynamical_model.set_head(head)
+            algorithm.reward_model.set_head(head)
+            trajectory = algorithm.simulation_algorithm.simulate(
+                state, algorithm.policy, initial_action=action
+            )
+            model_return = algorithm._n_step_return(
+                stack_list_of_tuples(trajectory, dim=-2)
+            )
+            model_returns.append(
+                model_return.reshape(num_particles, -1, *model_return.shape[1:])
+            )
+    targets = []
+    for i in range(len(state)):
+        candidates = torch.stack([x[:, i] for x in model_returns], dim=1)
+        candidates = torch.cat(
+            (candidates, td_return[i].expand(*candidates.shape[:2], -1, -1, -1)), 2
+        )  # particles x models x (horizon + 1) x reward x critic heads
+        mean = candidates.mean(dim=(0, 1, -1))
+        weight = 1 / (algorithm.eps + candidates.var(dim=(0, 1, -1)))
+        targets.append((weight / weight.sum(0) * mean).sum(0, keepdim=True))
+    return torch.stack(targets)
+
+
+def test_value_target(num_particles):
+    algorithm = get_algorithm(num_particles)
+    observation = get_observation()
+    target = algorithm.get_value_target(observation)
+    assert target.shape == (8, 1, 1)
+    torch.testing.assert_close(target, reference_value_target(algorithm, observation))
+
+
+def test_critic_loss(num_particles):
+    algorithm = get_algorithm(num_particles)
+    observation = get_observation()
+    critic_loss = algorithm.model_augmented_critic_loss(observation).critic_loss
+    pred_q = algorithm.base_algorithm.get_value_prediction(observation)
+    assert critic_loss.shape == pred_q.shape
@@ -46,7 +46,7 @@ class Observation:
     def shape(self):
         """Get the shape of the observation."""
         with torch.no_grad():
-            if np.isnan(np.array(self.reward)).any():
+            if torch.isnan(to_torch(self.reward)).any():
                 return self.state.shape[:-1]
             else:
                 return self.reward.shape[:-1]
@@ -224,6 +224,95 @@ class Observation:
         return Observation(*map(lambda x: to_torch(x), self))
 
 
+ABSENT = torch.tensor(NaN)
+
+
+@dataclass(eq=False)
+class ObservationBatch(Observation):
+    """Batch of observations stored as a struct of arrays.
+
+    The attributes that are absent, i.e., NaN in all the observations such as the
+    default values of Observation, are not stored per observation: they are views of
+    a single NaN scalar expanded to the shape of the attribute, which cost no memory.
+    `clone', `to' and indexing skip the absent attributes, and indexing the batch with
+    integers or slices returns views of the present attributes.
+
+    The absent attributes are not writable, as all their entries share one location.
+    """
+
+    @staticmethod
+    def absent(shape, dtype=None, device=None):
+        """Get an absent attribute with a given shape."""
+        return ABSENT.to(dtype=dtype, device=device).expand(shape)
+
+    @staticmethod
+    def is_absent(value):
+        """Check if the value of an attribute is absent."""
+        if isinstance(value, float):
+            return np.isnan(value)
+        if not isinstance(value, Tensor) or value.numel() == 0 or any(value.stride()):
+            return False
+        return bool(value[(0,) * value.dim()].isnan())
+
+    @classmethod
+    def from_observation(cls, observation):
+        """Get a batch with the attributes of an observation."""
+        if isinstance(observation, cls):
+            return observation
+        return cls(*map(lambda x: to_torch(x), observation))
+
+    def __len__(self):
+        """Return the number of observations in the batch."""
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        """Index the present attributes of the batch."""
+
+        def _index(x):
+            if x.dim() == 0:  # Scalars are shared by the whole batch.
+                return x
+            if self.is_absent(x):
+                shape = torch.empty(x.shape, device="meta")[index].shape
+                return self.absent(shape, dtype=x.dtype, device=x.device)
+            return x[index]
+
+        return ObservationBatch(*map(_index, self.to_torch()))
+
+    @property
+    def mask(self):
+        """Get the presence mask of the attributes."""
+        return tuple(not self.is_absent(x) for x in self)
+
+    @property
+    def shape(self):
+        """Get the shape of the observation."""
+        if self.is_absent(self.reward):
+            return self.state.shape[:-1]
+        return self.reward.shape[:-1]
+
+    def clone(self):
+        """Get a cloned copy of the present attributes of the batch."""
+        return ObservationBatch(
+            *map(lambda x: x if self.is_absent(x) else x.clone(), self.to_torch())
+        )
+
+    def to(self, *args, **kwargs):
+        """Perform dtypes and device conversions of the present attributes."""
+
+        def _to(x):
+            if self.is_absent(x):
+                return ABSENT.to(*args, **kwargs).expand(x.shape)
+            return x.to(*args, **kwargs)
+
+        return ObservationBatch(*map(_to, self.to_torch()))
+
+    def to_torch(self):
+        """Transform to torch."""
+        if all(isinstance(x, Tensor) for x in self):
+            return self
+        return ObservationBatch(*map(lambda x: to_torch(x), self))
+
+
 @dataclass
 class Loss:
     """Basic Loss class.
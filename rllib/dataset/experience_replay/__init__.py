@@ -1,5 +1,7 @@
 from .bootstrap_experience_replay import BootstrapExperienceReplay
 from .exp3_experience_replay import EXP3ExperienceReplay
 from .experience_replay import ExperienceReplay
+from .memory_mapped_experience_replay import MemoryMappedExperienceReplay
+from .prefetch_sampler import PrefetchSampler
 from .prioritized_experience_replay import PrioritizedExperienceReplay
 from .state_experience_replay import StateExperienceReplay
@@ -55,7 +55,7 @@ class BootstrapExperienceReplay(ExperienceReplay):
         TypeError
             If the new observation is not of type Observation.
         """
-        if not type(observation) == Observation:
+        if not isinstance(observation, Observation):
             raise TypeError(
                 f"input has to be of type Observation, and it was {type(observation)}"
             )
@@ -66,6 +66,32 @@ class BootstrapExperienceReplay(ExperienceReplay):
             self.weights[self.ptr] = torch.ones(self.mask_distribution.batch_shape)
         super().append(observation)
 
+    def append_batch(self, observation):
+        """Append a batch of new observations to the dataset.
+
+        The masks of the whole batch are sampled at once.
+
+        Parameters
+        ----------
+        observation: Observation
+
+        Raises
+        ------
+        TypeError
+            If the new observation is not of type Observation.
+        """
+        if not isinstance(observation, Observation):
+            raise TypeError(
+                f"input has to be of type Observation, and it was {type(observation)}"
+            )
+
+        idx = self._batch_indexes(observation.state.shape[0])
+        if self.bootstrap:
+            self.weights[idx] = self.mask_distribution.sample((len(idx),)).int()
+        else:
+            self.weights[idx] = 1
+        super().append_batch(observation)
+
     def split(self, ratio=0.8, *args, **kwargs):
         """Split into two data sets."""
         return super().split(
@@ -1,5 +1,6 @@
 """Implementation of an EXP3 Experience Replay Buffer."""
 
+import numpy as np
 import torch
 
 from .prioritized_experience_replay import PrioritizedExperienceReplay
@@ -63,6 +64,21 @@ class EXP3ExperienceReplay(PrioritizedExperienceReplay):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # The mixture with the uniform distribution changes every probability when a
+        # single priority changes, hence the priorities are not stored in a sum-tree.
+        self._priorities = torch.zeros(self.max_len)
+        self.weights = torch.zeros(self.max_len)
+
+    @property
+    def priorities(self):
+        """Get list of priorities."""
+        return self._priorities
+
+    @priorities.setter
+    def priorities(self, value):
+        """Set list of priorities."""
+        self._priorities = value
+        self._update_weights()
 
     @property
     def probabilities(self):
@@ -70,6 +86,44 @@ class EXP3ExperienceReplay(PrioritizedExperienceReplay):
         probs = self.weights[: len(self)].reciprocal()
         return probs / torch.sum(probs)
 
+    def sample_batch(self, batch_size):
+        """Get a batch of data."""
+        probs = self.probabilities.numpy()
+        indices = self.random.choice(len(self), batch_size, p=probs / np.sum(probs))
+        return self._get_batch(indices)
+
+    def append(self, observation):
+        """Append new observation to the dataset.
+
+        Parameters
+        ----------
+        observation: Observation
+
+        Raises
+        ------
+        TypeError
+            If the new observation is not of type Observation.
+        """
+        super().append(observation)
+        self._update_weights()
+
+    def append_batch(self, observation):
+        """Append a batch of new observations to the dataset.
+
+        The weights are updated once for the whole batch.
+
+        Parameters
+        ----------
+        observation: Observation
+
+        Raises
+        ------
+        TypeError
+            If the new observation is not of type Observation.
+        """
+        super().append_batch(observation)
+        self._update_weights()
+
     def update(self, indexes, td):
         """Update experience replay sampling distribution with set of weights."""
         idx, inverse_idx, counts = torch.unique(
@@ -94,3 +148,11 @@ class EXP3ExperienceReplay(PrioritizedExperienceReplay):
 
         weights = 1.0 / (probs * num)
         self.weights[:num] = weights
+
+    def _set_priorities(self, indexes, priorities):
+        """Set the priorities at indexes."""
+        self._priorities[indexes] = priorities
+
+    def _get_weights(self, indexes):
+        """Get the IS weights of the observations at indexes."""
+        return self.weights[indexes]
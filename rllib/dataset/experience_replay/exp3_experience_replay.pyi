@@ -1,3 +1,7 @@
+from torch import Tensor
+
 from .prioritized_experience_replay import PrioritizedExperienceReplay
 
-class EXP3ExperienceReplay(PrioritizedExperienceReplay): ...
+class EXP3ExperienceReplay(PrioritizedExperienceReplay):
+    _priorities: Tensor
+    def _update_weights(self) -> None: ...
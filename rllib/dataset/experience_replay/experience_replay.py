@@ -6,10 +6,9 @@ from dataclasses import asdict
 import numpy as np
 import torch
 from torch.utils import data
-from torch.utils.data._utils.collate import default_collate
 
-from rllib.dataset.datatypes import Observation
-from rllib.dataset.utilities import stack_list_of_tuples
+from rllib.dataset.datatypes import Observation, ObservationBatch
+from rllib.util.neural_networks.utilities import to_torch
 
 
 class ExperienceReplay(data.Dataset):
@@ -18,6 +17,13 @@ class ExperienceReplay(data.Dataset):
     The Experience Replay algorithm stores transitions and access them IID.
     It erases the older samples once the buffer is full, like on a queue.
 
+    The transitions are stored column-wise: `memory' is an Observation whose
+    attributes are tensors of shape `max_len x attribute_shape', which are allocated
+    with the first appended observation. Hence, sampling a batch is a single
+    gather operation per attribute. The batches are returned as an ObservationBatch,
+    whose attributes that are absent in all the appended observations are not
+    gathered.
+
     Parameters
     ----------
     max_len: int.
@@ -32,6 +38,8 @@ class ExperienceReplay(data.Dataset):
     -------
     append(observation) -> None:
         append an observation to the dataset.
+    append_batch(observation) -> None:
+        append a batch of observations to the dataset.
     is_full: bool
         check if buffer is full.
     update(indexes, td_error):
@@ -57,7 +65,7 @@ class ExperienceReplay(data.Dataset):
     def __init__(self, max_len, transformations=None, num_memory_steps=0):
         super().__init__()
         self.max_len = max_len
-        self.memory = np.empty((self.max_len,), dtype=Observation)
+        self.memory = None
 
         self.valid = torch.zeros(self.max_len)
         self.weights = torch.ones(self.max_len)
@@ -66,8 +74,10 @@ class ExperienceReplay(data.Dataset):
         self.transformations = transformations or list()
         self._num_memory_steps = num_memory_steps
         self.zero_observation = None
+        self._absent = set()
 
         self.raw = False
+        self.random_state = None
 
         if self.num_memory_steps < 0:
             raise ValueError("Number of steps must be non-negative.")
@@ -91,7 +101,7 @@ class ExperienceReplay(data.Dataset):
             # old observations are erased.
 
             if other.valid[(start_idx + i) % other.max_len]:
-                observation = other.memory[(start_idx + i) % other.max_len]
+                observation = other._get_raw((start_idx + i) % other.max_len)
                 new.append(observation)
             elif other.valid[(start_idx + i - 1) % other.max_len]:  # Last of episode.
                 new.end_episode()
@@ -116,11 +126,13 @@ class ExperienceReplay(data.Dataset):
         )
 
         for dataset, idx in zip([train, test], [train_idx, test_idx]):
-            for i in idx:
-                dataset.memory[i] = self.memory[i]
-                dataset.valid[i] = self.valid[i]
-                dataset.weights[i] = self.weights[i]
-                dataset.data_count += 1
+            idx = torch.as_tensor(idx, dtype=torch.long)
+            if self.memory is not None:
+                dataset._init_observation(self._get_raw(0))
+                dataset._write(idx, self._get_raw(idx))
+            dataset.valid[idx] = self.valid[idx]
+            dataset.weights[idx] = self.weights[idx]
+            dataset.data_count += len(idx)
 
         return train, test
 
@@ -146,11 +158,20 @@ class ExperienceReplay(data.Dataset):
 
         """
         if self.valid[idx] == 0:  # when a non-valid index is sampled.
-            idx = np.random.choice(self.valid_indexes).item()
+            idx = self.random.choice(self.valid_indexes).item()
 
-        return asdict(self._get_observation(idx)), idx, self.weights[idx]
+        return asdict(self._get_observation(idx)), idx, self._get_weights(idx)
 
     def _init_observation(self, observation):
+        """Initialize the zero observation and allocate the memory columns."""
+        self.memory = self._allocate_memory(observation)
+        self._init_zero_observation(observation)
+        self._absent = {
+            i for i, x in enumerate(observation) if ObservationBatch.is_absent(x)
+        }
+
+    def _init_zero_observation(self, observation):
+        """Initialize the zero observation used to pad the episodes."""
         if observation.state.ndim == 0:
             dim_state, num_states = 1, 1
         else:
@@ -168,29 +189,70 @@ class ExperienceReplay(data.Dataset):
             num_actions=num_actions,
         )
 
-    def _get_consecutive_observations(self, start_idx, num_memory_steps):
-        if num_memory_steps == 0 and not (
-            isinstance(start_idx, int) or isinstance(start_idx, int)
-        ):
-            observation = stack_list_of_tuples(self.memory[start_idx])
-            return Observation(*map(lambda x: x.unsqueeze(1), observation))
-        num_memory_steps = max(1, num_memory_steps)
-        if start_idx + num_memory_steps <= self.max_len:
-            obs_list = self.memory[start_idx : start_idx + num_memory_steps]
-        else:  # The trajectory is split by the circular buffer.
-            delta_idx = start_idx + num_memory_steps - self.max_len
-            obs_list = np.concatenate(
-                (self.memory[start_idx : self.max_len], self.memory[:delta_idx])
+    def _allocate_memory(self, observation):
+        """Allocate the memory columns for observations like the given one."""
+        return Observation(*map(lambda x: self._allocate(to_torch(x)), observation))
+
+    def _allocate(self, example):
+        """Allocate a column that stores `max_len' copies of example."""
+        return torch.zeros(
+            (self.max_len,) + example.shape, dtype=example.dtype, device=example.device
+        )
+
+    def _get_raw(self, idx):
+        """Gather the raw observation(s) at idx from the memory columns."""
+        shape = tuple(np.shape(idx))
+        return ObservationBatch(
+            *(
+                ObservationBatch.absent(
+                    shape + column.shape[1:], dtype=column.dtype, device=column.device
+                )
+                if i in self._absent
+                else column[idx]
+                for i, column in enumerate(self.memory)
             )
+        )
+
+    def _update_absent(self, observation):
+        """Mark the absent attributes that are not NaN in observation as present."""
+        if self._absent:
+            values = tuple(observation)
+            self._absent = {
+                i for i in self._absent if torch.isnan(to_torch(values[i])).all()
+            }
 
-        return stack_list_of_tuples(obs_list)
+    def _write(self, idx, observation):
+        """Write observation into the memory columns at idx.
+
+        The observation attributes are broadcast to the indexed slots, hence a single
+        observation can be written into many indexes at once.
+        """
+        with torch.no_grad():
+            for column, value in zip(self.memory, observation):
+                column[idx] = to_torch(value).to(column.device)
+
+    def _get_consecutive_observations(self, start_idx, num_memory_steps):
+        """Gather the windows of `num_memory_steps' observations starting at start_idx.
+
+        When start_idx is an array of size `batch', a `batch x num_memory_steps' index
+        matrix is built and all the windows are gathered at once.
+        The windows might be split by the circular buffer, hence the indexes wrap
+        around `max_len'.
+        """
+        num_memory_steps = max(1, num_memory_steps)
+        steps = torch.arange(num_memory_steps)
+        if np.ndim(start_idx) > 0:
+            start_idx = torch.as_tensor(start_idx, dtype=torch.long).unsqueeze(-1)
+        idx = (start_idx + steps) % self.max_len
+        return self._get_raw(idx)
 
     def _get_observation(self, idx):
         """Return any desired observation.
 
         Parameters
         ----------
-        idx: int
+        idx: int or array of indexes.
+            If an array, the observations are stacked and transformed at once.
 
         Returns
         -------
@@ -206,10 +268,11 @@ class ExperienceReplay(data.Dataset):
 
     def reset(self):
         """Reset memory to empty."""
-        self.memory = np.empty((self.max_len,), dtype=Observation)
+        self.memory = None
         self.valid = torch.zeros(self.max_len)
         self.data_count = 0
         self.zero_observation = None
+        self._absent = set()
 
     def end_episode(self):
         """Terminate an episode.
@@ -224,7 +287,7 @@ class ExperienceReplay(data.Dataset):
         if self.zero_observation is None:
             warnings.warn("Buffer not initialized.", RuntimeWarning)
         else:
-            self.memory[self.ptr] = self.zero_observation
+            self._write(self.ptr, self.zero_observation)
             self.valid[self.ptr] = 0
             self.data_count += 1
 
@@ -247,28 +310,140 @@ class ExperienceReplay(data.Dataset):
 
         if self.zero_observation is None:
             self._init_observation(observation)
+        self._update_absent(observation)
 
-        self.memory[self.ptr] = observation.clone()
+        self._write(self.ptr, observation)
         self.valid[self.ptr] = 1
 
-        for i in range(self.num_memory_steps):
-            self.memory[(self.ptr + i + 1) % self.max_len] = self.zero_observation
-            self.valid[(self.ptr + i + 1) % self.max_len] = 0
+        if self.num_memory_steps > 0:
+            idx = (self.ptr + 1 + torch.arange(self.num_memory_steps)) % self.max_len
+            self._write(idx, self.zero_observation)
+            self.valid[idx] = 0
         self.data_count += 1
 
         for transformation in self.transformations:
             transformation.update(observation)
             observation = transformation(observation)
 
+    def append_batch(self, observation):
+        """Append a batch of new observations to the dataset.
+
+        The attributes of the observation have a leading batch dimension, or are
+        scalars that are shared by the whole batch. Appending a batch of size `K' is
+        equivalent to appending each of the `K' observations, but the memory columns
+        are written at once and the transformations are updated once.
+
+        Parameters
+        ----------
+        observation: Observation
+
+        Raises
+        ------
+        TypeError
+            If the new observation is not of type Observation.
+        """
+        if not isinstance(observation, Observation):
+            raise TypeError(
+                f"input has to be of type Observation, and it was {type(observation)}"
+            )
+        observation = observation.to_torch()
+        batch_size = observation.state.shape[0]
+        if batch_size == 0:
+            return
+        if self.zero_observation is None:
+            self._init_observation(
+                Observation(*map(lambda x: x[0] if x.ndim else x, observation))
+            )
+        self._update_absent(observation)
+
+        idx = self._batch_indexes(batch_size)
+        # Only the last `max_len' observations survive the circular buffer.
+        self._write(
+            idx,
+            Observation(*map(lambda x: x[-len(idx) :] if x.ndim else x, observation)),
+        )
+        self.valid[idx] = 1
+        self.data_count += batch_size
+
+        if self.num_memory_steps > 0:
+            idx = (self.ptr + torch.arange(self.num_memory_steps)) % self.max_len
+            self._write(idx, self.zero_observation)
+            self.valid[idx] = 0
+
+        for transformation in self.transformations:
+            transformation.update(observation)
+            observation = transformation(observation)
+
+    def _batch_indexes(self, batch_size):
+        """Get the indexes where the next `batch_size' transitions will be written.
+
+        When `batch_size' is larger than `max_len', only the indexes of the last
+        `max_len' transitions are returned.
+        """
+        start = max(0, batch_size - self.max_len)
+        return (self.ptr + torch.arange(start, batch_size)) % self.max_len
+
     def sample_batch(self, batch_size):
         """Sample a batch of observations."""
-        indices = np.random.choice(self.valid_indexes, batch_size)
-        if self.num_memory_steps == 0:
-            obs = self._get_observation(indices)
-            return obs, torch.tensor(indices), self.weights[indices]
-        else:
-            obs, idx, weight = default_collate([self[i] for i in indices])
-            return Observation(**obs), idx, weight
+        indices = self.random.choice(self.valid_indexes, batch_size)
+        return self._get_batch(indices)
+
+    def iterate_batches(self, batch_size=None, shuffle=True):
+        """Iterate once over the valid observations in batches, without replacement.
+
+        The valid indexes are shuffled with `random' and the permutation is walked in
+        contiguous chunks of `batch_size'. The batches are gathered lazily, hence the
+        iteration is an epoch of sampling without replacement.
+
+        Parameters
+        ----------
+        batch_size: int, optional.
+            Size of the batches. The last batch might be smaller.
+            By default, all the observations are gathered in a single batch.
+        shuffle: bool, optional.
+            Flag that indicates whether to shuffle the observations.
+
+        Yields
+        ------
+        observation: Observation.
+        indexes: Tensor.
+        weights: Tensor.
+        """
+        indexes = self.valid_indexes
+        if shuffle:
+            indexes = torch.as_tensor(self.random.permutation(indexes.numpy()))
+        if batch_size is None:
+            batch_size = max(1, len(indexes))
+        for start in range(0, len(indexes), batch_size):
+            yield self._get_batch(indexes[start : start + batch_size])
+
+    def _get_batch(self, indices):
+        """Get the batch of observations, indexes and weights at indices.
+
+        Non-valid indices are replaced by indexes sampled uniformly from the valid ones.
+        """
+        indices = torch.as_tensor(indices, dtype=torch.long)
+        invalid = self.valid[indices] == 0
+        if invalid.any():
+            valid_indexes = self.valid_indexes
+            indices[invalid] = valid_indexes[
+                self.random.randint(len(valid_indexes), size=int(invalid.sum()))
+            ]
+
+        obs = self._get_observation(indices)
+        return obs, indices, self._get_weights(indices)
+
+    def _get_weights(self, indexes):
+        """Get the weights of the observations at indexes."""
+        return self.weights[indexes]
+
+    @property
+    def random(self):
+        """Get the random number generator used to sample the batches.
+
+        It is `random_state' if set, otherwise the global numpy generator.
+        """
+        return np.random if self.random_state is None else self.random_state
 
     @property
     def is_full(self):
@@ -292,8 +467,7 @@ class ExperienceReplay(data.Dataset):
     @property
     def all_raw(self):
         """Get all the un-transformed data."""
-        all_raw = stack_list_of_tuples(self.memory[self.valid_indexes])
-        return all_raw
+        return self._get_raw(self.valid_indexes)
 
     @property
     def ptr(self):
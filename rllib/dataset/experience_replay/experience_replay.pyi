@@ -1,18 +1,18 @@
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
+import numpy as np
 import torch.nn as nn
-from numpy import ndarray
 from torch import Tensor
 from torch.utils import data
 
-from rllib.dataset.datatypes import Observation
+from rllib.dataset.datatypes import Index, Observation
 from rllib.dataset.transforms import AbstractTransform
 
 T = TypeVar("T", bound="ExperienceReplay")
 
 class ExperienceReplay(data.Dataset):
     max_len: int
-    memory: ndarray
+    memory: Optional[Observation]
     valid: Tensor
     weights: Tensor
     transformations: List[AbstractTransform]
@@ -20,6 +20,7 @@ class ExperienceReplay(data.Dataset):
     _num_memory_steps: int
     zero_observation: Optional[Observation]
     raw: bool
+    random_state: Optional[np.random.RandomState]
     def __init__(
         self,
         max_len: int,
@@ -34,6 +35,11 @@ class ExperienceReplay(data.Dataset):
     def __len__(self) -> int: ...
     def __getitem__(self, item: int) -> Tuple[Dict[str, Tensor], int, Tensor]: ...
     def _init_observation(self, observation: Observation) -> None: ...
+    def _init_zero_observation(self, observation: Observation) -> None: ...
+    def _allocate_memory(self, observation: Observation) -> Observation: ...
+    def _allocate(self, example: Tensor) -> Tensor: ...
+    def _get_raw(self, idx: Index) -> Observation: ...
+    def _write(self, idx: Index, observation: Observation) -> None: ...
     def _get_consecutive_observations(
         self, start_idx: int, num_memory_steps: int
     ) -> Observation: ...
@@ -42,13 +48,22 @@ class ExperienceReplay(data.Dataset):
     def end_episode(self) -> None: ...
     def append(self, observation: Observation) -> None: ...
     def append_invalid(self) -> None: ...
+    def append_batch(self, observation: Observation) -> None: ...
+    def _batch_indexes(self, batch_size: int) -> Tensor: ...
     def sample_batch(self, batch_size: int) -> Tuple[Observation, Tensor, Tensor]: ...
+    def iterate_batches(
+        self, batch_size: Optional[int] = ..., shuffle: bool = ...
+    ) -> Iterator[Tuple[Observation, Tensor, Tensor]]: ...
+    def _get_batch(self, indices: Index) -> Tuple[Observation, Tensor, Tensor]: ...
+    def _get_weights(self, indexes: Index) -> Tensor: ...
     def update(self, indexes: Tensor, td_error: Tensor) -> None: ...
     @property
     def all_data(self) -> Observation: ...
     @property
     def all_raw(self) -> Observation: ...
     @property
+    def random(self) -> Any: ...
+    @property
     def is_full(self) -> bool: ...
     @property
     def ptr(self) -> int: ...
@@ -0,0 +1,187 @@
+"""Implementation of an Experience Replay Buffer stored in memory-mapped files."""
+import json
+import os
+import tempfile
+from dataclasses import fields
+
+import numpy as np
+import torch
+
+from rllib.dataset.datatypes import Observation
+
+from .experience_replay import ExperienceReplay
+
+
+class MemoryMappedExperienceReplay(ExperienceReplay):
+    """An Experience Replay Buffer whose columns live in memory-mapped files.
+
+    Each attribute of the observations, and the valid flags and weights, are stored
+    in a `.npy' file in `directory' and accessed through tensors that share memory
+    with a `np.memmap'. Hence, the operating system pages the data in and out on
+    demand and the resident memory does not grow with the buffer size.
+    The counters are saved in `metadata.json' by `flush', which is called at the end
+    of every episode.
+
+    When the directory already holds a buffer, it is reopened without reading the
+    data, hence restarts are immediate. Buffers opened with `read_only' share the
+    pages of the files with the other processes that read them, and their writes
+    are kept private to the process.
+
+    Parameters
+    ----------
+    max_len: int.
+        buffer size of experience replay algorithm.
+    transformations: list of transforms.AbstractTransform, optional.
+        A sequence of transformations to apply to the dataset.
+    num_memory_steps: int, optional.
+        Number of consecutive observations returned with each sample.
+    directory: str, optional.
+        Directory of the files. By default, a temporary directory is created.
+    read_only: bool, optional.
+        Flag that indicates whether to open an existing buffer in read-only mode.
+    """
+
+    def __init__(
+        self,
+        max_len,
+        transformations=None,
+        num_memory_steps=0,
+        directory=None,
+        read_only=False,
+    ):
+        super().__init__(
+            max_len=max_len,
+            transformations=transformations,
+            num_memory_steps=num_memory_steps,
+        )
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="replay_")
+        self.directory = directory
+        self.read_only = read_only
+        self._arrays = dict()
+
+        if os.path.exists(self._path("metadata.json")):
+            self._open()
+        elif read_only:
+            raise FileNotFoundError(f"No replay buffer found in {directory}.")
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.valid = self._map("valid", self.valid)
+            self.weights = self._map("weights", self.weights)
+            self.flush()
+
+    def _path(self, name):
+        """Get the path of a file in the buffer directory."""
+        return os.path.join(self.directory, name)
+
+    def _map(self, name, example=None):
+        """Map a tensor to the file `name.npy'.
+
+        If example is given, the file is created with the shape, dtype, and values
+        of the example. Otherwise, the existing file is opened.
+        """
+        path = self._path(f"{name}.npy")
+        if example is None:
+            array = np.lib.format.open_memmap(
+                path, mode="c" if self.read_only else "r+"
+            )
+        else:
+            array = np.lib.format.open_memmap(
+                path, mode="w+", dtype=example.numpy().dtype, shape=tuple(example.shape)
+            )
+            array[:] = example.numpy()
+        self._arrays[name] = array
+        return torch.from_numpy(array)
+
+    def _open(self):
+        """Open the buffer saved in the directory."""
+        with open(self._path("metadata.json")) as f:
+            metadata = json.load(f)
+        if metadata["max_len"] != self.max_len:
+            raise ValueError(
+                f"Buffer in {self.directory} has max_len {metadata['max_len']}, "
+                f"but {self.max_len} was requested."
+            )
+        self.data_count = metadata["data_count"]
+        self.valid = self._map("valid")
+        self.weights = self._map("weights")
+        if metadata["columns"]:
+            self.memory = Observation(*map(self._map, metadata["columns"]))
+            self._init_zero_observation(self._get_raw(0))
+
+    def _allocate_memory(self, observation):
+        """Allocate the memory columns as files in the buffer directory."""
+        memory = Observation(
+            *[
+                self._map(field.name, self._allocate(torch.as_tensor(value)))
+                for field, value in zip(fields(Observation), observation.to_torch())
+            ]
+        )
+        self.memory = memory
+        self.flush()
+        return memory
+
+    def _allocate(self, example):
+        """Allocate a column that stores `max_len' copies of example, on cpu."""
+        return torch.zeros((self.max_len,) + example.shape, dtype=example.dtype)
+
+    def flush(self):
+        """Write the pending changes and the counters to the files."""
+        if self.read_only:
+            return
+        for array in self._arrays.values():
+            array.flush()
+        metadata = {
+            "max_len": self.max_len,
+            "data_count": self.data_count,
+            "num_memory_steps": self.num_memory_steps,
+            "columns": []
+            if self.memory is None
+            else [f.name for f in fields(Observation)],
+        }
+        with open(self._path("metadata.json.tmp"), "w") as f:
+            json.dump(metadata, f)
+        os.replace(self._path("metadata.json.tmp"), self._path("metadata.json"))
+
+    def end_episode(self):
+        """Terminate an episode and flush the buffer."""
+        super().end_episode()
+        self.flush()
+
+    def reset(self):
+        """Reset memory to empty, keeping the files of the valid flags and weights."""
+        self.memory = None
+        self.valid[:] = 0
+        self.data_count = 0
+        self.zero_observation = None
+        self._absent = set()
+        self.flush()
+
+    @ExperienceReplay.num_memory_steps.setter
+    def num_memory_steps(self, value):
+        """Reset the number of steps, rewriting the files."""
+        if self.memory is None:
+            self._num_memory_steps = value
+            return
+        other = ExperienceReplay.from_other(self, num_memory_steps=value)
+        self._num_memory_steps = value
+        for column, other_column in zip(self.memory, other.memory):
+            column[:] = other_column
+        self.valid[:] = other.valid
+        self.weights[:] = other.weights
+        self.data_count = other.data_count
+        self.flush()
+
+    def __getstate__(self):
+        """Get the state of the buffer, without the contents of the files."""
+        self.flush()
+        state = self.__dict__.copy()
+        for key in ["memory", "valid", "weights", "zero_observation", "_arrays"]:
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        """Set the state of the buffer, reopening the files."""
+        self.__dict__.update(state)
+        self.memory, self.zero_observation, self._arrays = None, None, dict()
+        self._open()
@@ -0,0 +1,29 @@
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import torch.nn as nn
+from torch import Tensor
+
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.transforms import AbstractTransform
+
+from .experience_replay import ExperienceReplay
+
+class MemoryMappedExperienceReplay(ExperienceReplay):
+    directory: str
+    read_only: bool
+    _arrays: Dict[str, np.memmap]
+    def __init__(
+        self,
+        max_len: int,
+        transformations: Optional[Union[List[AbstractTransform], nn.ModuleList]] = ...,
+        num_memory_steps: int = ...,
+        directory: Optional[str] = ...,
+        read_only: bool = ...,
+    ) -> None: ...
+    def _path(self, name: str) -> str: ...
+    def _map(self, name: str, example: Optional[Tensor] = ...) -> Tensor: ...
+    def _open(self) -> None: ...
+    def flush(self) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
@@ -0,0 +1,166 @@
+"""Sampler that prefetches batches of an experience replay in the background."""
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class PrefetchSampler(object):
+    """Sample batches of an experience replay buffer in a background thread.
+
+    While the learner runs a gradient step with the current batch, a thread samples,
+    transforms, and collates the next `num_prefetch' batches.
+    The priority updates are queued and applied by the thread, hence the buffer is
+    only accessed from one thread while the sampler runs.
+
+    The batches are deterministic: the buffer samples with a random state seeded by
+    the sampler at every `start', and the updates of a gradient step are applied
+    right before sampling the batch that is `num_prefetch + 1' steps ahead of it,
+    regardless of the timing of the threads. Hence, the updates take effect with a
+    delay of `num_prefetch' steps.
+
+    With `num_prefetch=0', the batches are sampled synchronously.
+
+    Parameters
+    ----------
+    num_prefetch: int, optional.
+        Number of batches to sample ahead of the learner.
+    seed: int, optional.
+        Seed of the random state that samples the batches. By default, it is drawn
+        from the global numpy generator when the sampler first starts prefetching.
+
+    Methods
+    -------
+    start(memory, batch_size, num_batches):
+        Start sampling `num_batches' batches from memory.
+    sample_batch():
+        Get the next batch.
+    update(indexes, td_error):
+        Update the sampling distribution of memory.
+    stop():
+        Stop the thread and apply the pending updates.
+    """
+
+    def __init__(self, num_prefetch=0, seed=None):
+        self.num_prefetch = num_prefetch
+        self.seed = seed
+        self.random_state = None
+
+        self.memory = None
+        self.batch_size = None
+        self._thread = None
+        self._condition = threading.Condition()
+        self._batches = deque()
+        self._updates = deque()
+        self._num_consumed = 0
+        self._stopped = False
+        self._exception = None
+
+    def start(self, memory, batch_size, num_batches):
+        """Start sampling `num_batches' batches of size `batch_size' from memory."""
+        self.stop()
+        self.memory, self.batch_size = memory, batch_size
+        if self.num_prefetch == 0:
+            return
+
+        self._batches.clear()
+        self._updates.clear()
+        self._num_consumed, self._stopped, self._exception = 0, False, None
+        if self.random_state is None:
+            seed = np.random.randint(2 ** 31) if self.seed is None else self.seed
+            self.random_state = np.random.RandomState(seed)
+        # A new random state per call, as the batches discarded by `stop' vary.
+        self._random_state = memory.random_state
+        memory.random_state = np.random.RandomState(self.random_state.randint(2 ** 31))
+        self._thread = threading.Thread(
+            target=self._run, args=(num_batches,), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, num_batches):
+        """Sample the batches, applying the updates at deterministic steps."""
+        try:
+            for i in range(num_batches):
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._stopped
+                        or self._num_consumed > i - self.num_prefetch
+                    )
+                    if self._stopped:
+                        return
+                    # The gradient step `i - num_prefetch - 1' has finished.
+                    updates = self._pop_updates(i - self.num_prefetch - 1)
+
+                for indexes, td_error in updates:
+                    self.memory.update(indexes, td_error)
+                batch = self.memory.sample_batch(self.batch_size)
+
+                with self._condition:
+                    self._batches.append(batch)
+                    self._condition.notify_all()
+        except Exception as exception:
+            with self._condition:
+                self._exception = exception
+                self._condition.notify_all()
+
+    def _pop_updates(self, step):
+        """Pop the queued updates of the gradient steps up to `step'."""
+        updates = []
+        while self._updates and self._updates[0][0] <= step:
+            updates.append(self._updates.popleft()[1:])
+        return updates
+
+    def sample_batch(self):
+        """Get the next batch of observations, indexes and weights."""
+        if self._thread is None:
+            return self.memory.sample_batch(self.batch_size)
+
+        with self._condition:
+            self._num_consumed += 1
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._batches or self._exception)
+            if self._exception is not None:
+                raise self._exception
+            return self._batches.popleft()
+
+    def update(self, indexes, td_error):
+        """Update the sampling distribution of the memory.
+
+        While the sampler runs, the update is queued and applied by the thread.
+        """
+        if self._thread is None:
+            return self.memory.update(indexes, td_error)
+
+        with self._condition:
+            self._updates.append((self._num_consumed - 1, indexes, td_error))
+            self._condition.notify_all()
+
+    def stop(self):
+        """Stop the thread, discard the prefetched batches and apply the updates."""
+        if self._thread is None:
+            return
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._thread = None
+
+        for indexes, td_error in self._pop_updates(float("inf")):
+            self.memory.update(indexes, td_error)
+        self._batches.clear()
+        self.memory.random_state = self._random_state
+
+    def __getstate__(self):
+        """Get the state of the sampler without the thread."""
+        self.stop()
+        return {
+            "num_prefetch": self.num_prefetch,
+            "seed": self.seed,
+            "random_state": self.random_state,
+        }
+
+    def __setstate__(self, state):
+        """Set the state of the sampler."""
+        self.__init__(num_prefetch=state["num_prefetch"], seed=state["seed"])
+        self.random_state = state["random_state"]
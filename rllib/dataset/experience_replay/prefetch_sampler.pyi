@@ -0,0 +1,36 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from torch import Tensor
+
+from rllib.dataset.datatypes import Observation
+
+from .experience_replay import ExperienceReplay
+
+class PrefetchSampler(object):
+    num_prefetch: int
+    seed: Optional[int]
+    random_state: Optional[np.random.RandomState]
+    memory: Optional[ExperienceReplay]
+    batch_size: Optional[int]
+    _thread: Optional[threading.Thread]
+    _condition: threading.Condition
+    _batches: Deque[Tuple[Observation, Tensor, Tensor]]
+    _updates: Deque[Tuple[int, Tensor, Tensor]]
+    _num_consumed: int
+    _stopped: bool
+    _exception: Optional[Exception]
+    _random_state: Optional[np.random.RandomState]
+    def __init__(self, num_prefetch: int = ..., seed: Optional[int] = ...) -> None: ...
+    def start(
+        self, memory: ExperienceReplay, batch_size: int, num_batches: int
+    ) -> None: ...
+    def _run(self, num_batches: int) -> None: ...
+    def _pop_updates(self, step: float) -> List[Tuple[Tensor, Tensor]]: ...
+    def sample_batch(self) -> Tuple[Observation, Tensor, Tensor]: ...
+    def update(self, indexes: Tensor, td_error: Tensor) -> None: ...
+    def stop(self) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
@@ -2,12 +2,11 @@
 
 import numpy as np
 import torch
-from torch.utils.data._utils.collate import default_collate
 
-from rllib.dataset.datatypes import Observation
 from rllib.util.parameter_decay import Constant, ParameterDecay
 
 from .experience_replay import ExperienceReplay
+from .segment_tree import MinTree, SumTree
 
 
 class PrioritizedExperienceReplay(ExperienceReplay):
@@ -25,6 +24,11 @@ class PrioritizedExperienceReplay(ExperienceReplay):
     ..math :: w_i = (N P(i)) ^ \beta,
     where \beta is a parameter.
 
+    The priorities are stored in a sum-tree and a min-tree, hence appending and
+    updating priorities cost O(log N) and sampling a batch of size B costs O(B log N).
+    The batch is sampled with stratified sampling and the IS weights are only computed
+    for the sampled indexes.
+
     Parameters
     ----------
     max_len: int.
@@ -38,6 +42,8 @@ class PrioritizedExperienceReplay(ExperienceReplay):
     max_priority: float, optional.
         Maximum value for the priorities.
         New observations are initialized with this value.
+    normalize_weights: bool, optional.
+        Flag that indicates whether to divide the IS weights by the maximum IS weight.
     transformations: list of transforms.AbstractTransform, optional.
         A sequence of transformations to apply to the dataset, each of which is a
         callable that takes an observation as input and returns a modified observation.
@@ -51,7 +57,14 @@ class PrioritizedExperienceReplay(ExperienceReplay):
     """
 
     def __init__(
-        self, alpha=0.6, beta=0.4, epsilon=0.01, max_priority=10.0, *args, **kwargs
+        self,
+        alpha=0.6,
+        beta=0.4,
+        epsilon=0.01,
+        max_priority=10.0,
+        *args,
+        normalize_weights=False,
+        **kwargs,
     ):
         super().__init__(*args, **kwargs)
         if not isinstance(alpha, ParameterDecay):
@@ -67,51 +80,56 @@ class PrioritizedExperienceReplay(ExperienceReplay):
         self.epsilon = epsilon
 
         self.max_priority = max_priority
-        self._priorities = torch.zeros(self.max_len)
-        self.weights = torch.zeros(self.max_len)
+        self.normalize_weights = normalize_weights
+        self._sum_tree = SumTree(self.max_len)
+        self._min_tree = MinTree(self.max_len)
 
     @classmethod
     def from_other(cls, other, num_memory_steps=None):
-        """Initialize EXP3Experience Replay from another one."""
+        """Initialize Prioritized Experience Replay from another one."""
         new = cls(
             max_len=other.max_len,
             alpha=other.alpha,
             beta=other.beta,
             epsilon=other.epsilon,
             max_priority=other.max_priority,
+            normalize_weights=other.normalize_weights,
             transformations=other.transformations,
             num_memory_steps=num_memory_steps
             if num_memory_steps
             else other.num_memory_steps,
         )
 
-        for observation in other.memory:
-            if isinstance(observation, Observation):
-                new.append(observation)
+        for idx in other.valid_indexes:
+            new.append(other._get_raw(idx))
         return new
 
     @property
     def priorities(self):
         """Get list of priorities."""
-        return self._priorities
+        return torch.tensor(self._sum_tree.leaves, dtype=torch.get_default_dtype())
 
     @priorities.setter
     def priorities(self, value):
         """Set list of priorities."""
-        self._priorities = value
-        self._update_weights()
+        self._set_priorities(torch.arange(len(value)), value)
 
     @property
     def probabilities(self):
         """Get list of probabilities."""
         num = len(self)
-        return self._priorities[:num] / torch.sum(self._priorities[:num])
+        return self.priorities[:num] / self._sum_tree.total
+
+    def reset(self):
+        """Reset memory and priorities to empty."""
+        super().reset()
+        self._sum_tree.reset()
+        self._min_tree.reset()
 
     def sample_batch(self, batch_size):
         """Get a batch of data."""
-        probs = self.probabilities.numpy()
-        indices = np.random.choice(len(self), batch_size, p=probs / np.sum(probs))
-        return default_collate([self[i] for i in indices])
+        indices = self._sum_tree.sample(batch_size, self.random)
+        return self._get_batch(indices)
 
     def append(self, observation):
         """Append new observation to the dataset.
@@ -125,19 +143,49 @@ class PrioritizedExperienceReplay(ExperienceReplay):
         TypeError
             If the new observation is not of type Observation.
         """
-        self._priorities[self.ptr] = self.max_priority
+        self._set_priorities(self.ptr, self.max_priority)
         super().append(observation)
-        self._update_weights()
+
+    def append_batch(self, observation):
+        """Append a batch of new observations to the dataset.
+
+        The priorities of the whole batch are set at once.
+
+        Parameters
+        ----------
+        observation: Observation
+
+        Raises
+        ------
+        TypeError
+            If the new observation is not of type Observation.
+        """
+        idx = self._batch_indexes(observation.state.shape[0])
+        self._set_priorities(idx, torch.full((len(idx),), self.max_priority))
+        super().append_batch(observation)
 
     def update(self, indexes, td_error):
         """Update experience replay sampling distribution with set of weights."""
-        self._priorities[indexes] = (td_error + self.epsilon) ** self.alpha()
+        self._set_priorities(indexes, (td_error + self.epsilon) ** self.alpha())
         self.alpha.update()
         self.beta.update()
-        self._update_weights()
 
-    def _update_weights(self):
-        """Update priorities and weights."""
+    def _set_priorities(self, indexes, priorities):
+        """Set the priorities at indexes."""
+        if isinstance(priorities, torch.Tensor):
+            priorities = priorities.detach().cpu().numpy()
+        if isinstance(indexes, torch.Tensor):
+            indexes = indexes.cpu().numpy()
+        priorities = np.asarray(priorities, dtype=np.float64)
+        self._sum_tree[indexes] = priorities
+        # Zero-priority entries are never sampled, so they don't bound the weights.
+        self._min_tree[indexes] = np.where(priorities > 0, priorities, np.inf)
+
+    def _get_weights(self, indexes):
+        """Get the IS weights of the observations at indexes."""
         num = len(self)
-        weights = torch.pow(self.probabilities * num, -self.beta())
-        self.weights[:num] = weights
+        total = self._sum_tree.total
+        weights = torch.pow(self._sum_tree[indexes] / total * num, -self.beta())
+        if self.normalize_weights:
+            weights = weights / (self._min_tree.min / total * num) ** -self.beta()
+        return weights.to(torch.get_default_dtype())
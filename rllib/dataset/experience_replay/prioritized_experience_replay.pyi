@@ -2,17 +2,20 @@ from typing import Any, Union
 
 from torch import Tensor
 
+from rllib.dataset.datatypes import Index
 from rllib.util.parameter_decay import ParameterDecay
 
 from .experience_replay import ExperienceReplay
+from .segment_tree import MinTree, SumTree
 
 class PrioritizedExperienceReplay(ExperienceReplay):
     alpha: ParameterDecay
     beta: ParameterDecay
     epsilon: Tensor
     max_priority: float
-    _priorities: Tensor
-    priors: Tensor
+    normalize_weights: bool
+    _sum_tree: SumTree
+    _min_tree: MinTree
     def __init__(
         self,
         alpha: Union[float, ParameterDecay] = ...,
@@ -20,9 +23,12 @@ class PrioritizedExperienceReplay(ExperienceReplay):
         epsilon: float = ...,
         max_priority: float = ...,
         *args: Any,
+        normalize_weights: bool = ...,
         **kwargs: Any,
     ) -> None: ...
-    def _update_weights(self) -> None: ...
+    def _set_priorities(
+        self, indexes: Index, priorities: Union[float, Tensor]
+    ) -> None: ...
     @property
     def priorities(self) -> Tensor: ...
     @priorities.setter
@@ -0,0 +1,139 @@
+"""Implementation of Segment Trees used by Prioritized Experience Replay."""
+
+import numpy as np
+import torch
+
+
+class SegmentTree(object):
+    """Array-based binary segment tree.
+
+    The tree stores `capacity' leaves and every internal node holds the reduction
+    of its two children with `operation'. Updating k leaves costs O(k log N) and
+    querying the reduction of all the leaves costs O(1).
+    The nodes are stored in a numpy array, as updating a single leaf is dominated by
+    the per-operation overhead.
+
+    Parameters
+    ----------
+    capacity: int.
+        Number of leaves of the tree.
+    operation: np.ufunc.
+        Associative binary operation that reduces two arrays element-wise.
+    neutral_element: float.
+        Neutral element of the operation, used to initialize the tree.
+
+    References
+    ----------
+    Schaul, T., Quan, J., Antonoglou, I., & Silver, D. (2015).
+    Prioritized experience replay. ICLR.
+    """
+
+    def __init__(self, capacity, operation, neutral_element):
+        self.capacity = capacity
+        self._depth = max(0, capacity - 1).bit_length()
+        self._size = 2 ** self._depth
+        self._operation = operation
+        self._neutral_element = neutral_element
+        self._tree = np.full((2 * self._size,), neutral_element, dtype=np.float64)
+
+    def __len__(self):
+        """Return the number of leaves."""
+        return self.capacity
+
+    def __getitem__(self, idx):
+        """Get the value of the leaves at idx."""
+        return torch.from_numpy(np.asarray(self.leaves[np.asarray(idx)]))
+
+    def __setitem__(self, idx, value):
+        """Set the value of the leaves at idx and update their ancestors."""
+        idx, value = np.asarray(idx), np.asarray(value, dtype=np.float64)
+        if idx.ndim == 0 and value.ndim == 0:  # Fast path for single updates.
+            node = int(idx) + self._size
+            self._tree[node] = value
+            for _ in range(self._depth):
+                node //= 2
+                self._tree[node] = self._operation(
+                    self._tree[2 * node], self._tree[2 * node + 1]
+                )
+            return
+
+        nodes = idx.reshape(-1) + self._size
+        self._tree[nodes] = np.broadcast_to(value, nodes.shape)
+        for _ in range(self._depth):
+            nodes = np.unique(nodes // 2)
+            self._tree[nodes] = self._operation(
+                self._tree[2 * nodes], self._tree[2 * nodes + 1]
+            )
+
+    @property
+    def leaves(self):
+        """Get a view of the leaves of the tree."""
+        return self._tree[self._size : self._size + self.capacity]
+
+    def reduce(self):
+        """Get the reduction of all the leaves."""
+        return self._tree[1].item()
+
+    def reset(self):
+        """Reset all the nodes of the tree to the neutral element."""
+        self._tree.fill(self._neutral_element)
+
+
+class SumTree(SegmentTree):
+    """Segment tree whose nodes hold the sum of their children."""
+
+    def __init__(self, capacity):
+        super().__init__(capacity, operation=np.add, neutral_element=0.0)
+
+    @property
+    def total(self):
+        """Get the sum of all the leaves."""
+        return self.reduce()
+
+    def find_prefix_sum_index(self, prefix_sum):
+        """Find the leaves at which the cumulative sum of the leaves exceeds prefix_sum.
+
+        The descent goes to the right child only when it has positive mass, hence
+        leaves with zero value are never returned unless the tree is empty.
+
+        Parameters
+        ----------
+        prefix_sum: Array.
+            Array of prefix sums in [0, total).
+
+        Returns
+        -------
+        idx: Tensor.
+            Tensor of leaf indexes with the same shape as prefix_sum.
+        """
+        prefix_sum = np.array(prefix_sum, dtype=np.float64)
+        idx = np.ones(prefix_sum.shape, dtype=np.int64)
+        for _ in range(self._depth):
+            left = self._tree[2 * idx]
+            go_right = (prefix_sum >= left) & (self._tree[2 * idx + 1] > 0)
+            prefix_sum = np.where(go_right, prefix_sum - left, prefix_sum)
+            idx = 2 * idx + go_right
+        return torch.from_numpy(np.minimum(idx - self._size, self.capacity - 1))
+
+    def sample(self, batch_size, random=np.random):
+        """Sample `batch_size' leaves proportionally to their values.
+
+        The mass of the tree is split into `batch_size' equal segments and one leaf
+        is sampled uniformly from each segment (stratified sampling). Each leaf is
+        sampled in expectation `batch_size * value / total' times.
+        """
+        segment = self.total / batch_size
+        prefix_sum = (np.arange(batch_size) + random.rand(batch_size)) * segment
+        return self.find_prefix_sum_index(prefix_sum)
+
+
+class MinTree(SegmentTree):
+    """Segment tree whose nodes hold the minimum of their children."""
+
+    def __init__(self, capacity):
+        super().__init__(capacity, operation=np.minimum, neutral_element=float("inf"))
+
+    @property
+    def min(self):
+        """Get the minimum of all the leaves."""
+        return self.reduce()
@@ -0,0 +1,39 @@
+from typing import Any
+
+import numpy as np
+from torch import Tensor
+
+from rllib.dataset.datatypes import Array, Index
+
+class SegmentTree(object):
+    capacity: int
+    _depth: int
+    _size: int
+    _operation: np.ufunc
+    _neutral_element: float
+    _tree: np.ndarray
+    def __init__(
+        self,
+        capacity: int,
+        operation: np.ufunc,
+        neutral_element: float,
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, idx: Index) -> Tensor: ...
+    def __setitem__(self, idx: Index, value: Array) -> None: ...
+    @property
+    def leaves(self) -> np.ndarray: ...
+    def reduce(self) -> float: ...
+    def reset(self) -> None: ...
+
+class SumTree(SegmentTree):
+    def __init__(self, capacity: int) -> None: ...
+    @property
+    def total(self) -> float: ...
+    def find_prefix_sum_index(self, prefix_sum: Array) -> Tensor: ...
+    def sample(self, batch_size: int, random: Any = ...) -> Tensor: ...
+
+class MinTree(SegmentTree):
+    def __init__(self, capacity: int) -> None: ...
+    @property
+    def min(self) -> float: ...
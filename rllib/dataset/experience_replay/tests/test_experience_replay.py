@@ -1,7 +1,12 @@
 import numpy as np
 import pytest
+import torch
 
-from rllib.dataset import ExperienceReplay
+from rllib.dataset import (
+    BootstrapExperienceReplay,
+    ExperienceReplay,
+    stack_list_of_tuples,
+)
 from rllib.dataset.datatypes import Observation
 from rllib.dataset.transforms import (
     ActionNormalizer,
@@ -127,6 +132,46 @@ class TestExperienceReplay(object):
 
         self._test_sample_batch(memory, batch_size, num_memory_steps)
 
+    def test_sample_batch_equals_get_item(
+        self, discrete, dim_state, dim_action, num_memory_steps
+    ):
+        memory = create_er_from_transitions(
+            discrete, dim_state, dim_action, 100, num_memory_steps, 150
+        )
+        memory.end_episode()
+        observation, idx, weight = memory.sample_batch(batch_size=32)
+        for i, index in enumerate(idx):
+            item_observation, item_idx, item_weight = memory[index.item()]
+            assert item_idx == index
+            assert item_weight == weight[i]
+            for key, value in item_observation.items():
+                torch.testing.assert_close(
+                    getattr(observation, key)[i], value, equal_nan=True
+                )
+
+    def test_iterate_batches(self, discrete, dim_state, dim_action, num_memory_steps):
+        memory = create_er_from_transitions(
+            discrete, dim_state, dim_action, 100, num_memory_steps, 150
+        )
+        memory.end_episode()
+        batches = list(memory.iterate_batches(batch_size=32))
+        assert all(len(idx) == 32 for _, idx, _ in batches[:-1])
+        assert 0 < len(batches[-1][1]) <= 32
+
+        idx = torch.cat([idx for _, idx, _ in batches])
+        assert sorted(idx.tolist()) == memory.valid_indexes.tolist()
+        for observation, idx, weight in batches:
+            expected, expected_idx, expected_weight = memory._get_batch(idx)
+            torch.testing.assert_close(idx, expected_idx)
+            torch.testing.assert_close(weight, expected_weight)
+            torch.testing.assert_close(
+                observation.state, expected.state, equal_nan=True
+            )
+
+        (observation, idx, weight), *rest = memory.iterate_batches(shuffle=False)
+        assert not rest
+        torch.testing.assert_close(idx, memory.valid_indexes)
+
     def test_reset(self, discrete, max_len, num_memory_steps):
         num_episodes = 3
         episode_length = 200
@@ -196,7 +241,48 @@ class TestExperienceReplay(object):
         assert memory.valid[(memory.ptr - 2) % max_len] == 1
         for i in range(num_memory_steps):
             assert memory.valid[(memory.ptr + i) % max_len] == 0
-        assert memory.memory[(memory.ptr - 1) % max_len] is not observation
+        stored_observation = memory._get_raw((memory.ptr - 1) % max_len)
+        assert stored_observation is not observation
+        assert stored_observation == observation
+
+    def test_append_batch(self, discrete, max_len, num_memory_steps):
+        memory = ExperienceReplay(max_len, num_memory_steps=num_memory_steps)
+        expected = ExperienceReplay(max_len, num_memory_steps=num_memory_steps)
+        observations = [
+            Observation.random_example(
+                dim_state=() if discrete else (4,),
+                dim_action=() if discrete else (2,),
+                num_states=4 if discrete else -1,
+                num_actions=2 if discrete else -1,
+            )
+            for _ in range(180)
+        ]
+        for observation in observations:
+            expected.append(observation)
+        memory.append(observations[0])
+        memory.append_batch(stack_list_of_tuples(observations[1:50]))
+        memory.append_batch(stack_list_of_tuples(observations[50:]))
+
+        assert memory.data_count == expected.data_count
+        torch.testing.assert_close(memory.valid, expected.valid)
+        torch.testing.assert_close(memory.all_raw.state, expected.all_raw.state)
+        torch.testing.assert_close(memory.all_raw.reward, expected.all_raw.reward)
+
+    def test_absent_attributes(self, num_memory_steps):
+        memory = ExperienceReplay(100, num_memory_steps=num_memory_steps)
+        for _ in range(10):
+            memory.append(Observation.random_example(dim_state=(4,), dim_action=(2,)))
+        observation, idx, weight = memory.sample_batch(8)
+        assert not observation.mask[5]  # next_action is absent.
+        assert observation.next_action.shape == observation.done.shape
+
+        example = Observation.random_example(dim_state=(4,), dim_action=(2,))
+        example.next_action = torch.tensor(1.0)
+        memory.append(example)
+        observation = memory.all_raw
+        assert observation.mask[5]
+        assert observation.next_action[-1] == 1.0
+        assert torch.isnan(observation.next_action[:-1]).all()
 
     def test_len(self, discrete, dim_state, dim_action, max_len, num_memory_steps):
         num_transitions = 200
@@ -337,3 +423,20 @@ class TestExperienceReplay(object):
             assert weight == 1.0
             for attribute in Observation(**observation):
                 assert attribute.shape[0] == max(1, num_memory_steps)
+
+
+@pytest.mark.parametrize("bootstrap", [True, False])
+def test_bootstrap_append_batch(bootstrap):
+    memory = BootstrapExperienceReplay(
+        max_len=20, num_bootstraps=3, bootstrap=bootstrap
+    )
+    observations = [
+        Observation.random_example(dim_state=(3,), dim_action=(2,)) for _ in range(30)
+    ]
+    memory.append_batch(stack_list_of_tuples(observations))
+    assert memory.data_count == 30
+    assert memory.weights.shape == (20, 3)
+    expected = stack_list_of_tuples(observations[20:]).state
+    torch.testing.assert_close(memory.memory.state[:10], expected)
+    if not bootstrap:
+        assert (memory.weights == 1).all()
@@ -0,0 +1,125 @@
+import pickle
+import tempfile
+
+import numpy as np
+import pytest
+import torch
+
+from rllib.dataset import (
+    ExperienceReplay,
+    MemoryMappedExperienceReplay,
+    d4rl_to_observation,
+)
+from rllib.dataset.datatypes import Observation
+
+
+@pytest.fixture(params=[0, 2])
+def num_memory_steps(request):
+    return request.param
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as directory:
+        yield directory
+
+
+def _append(memories, num_transitions):
+    for i in range(num_transitions):
+        observation = Observation.random_example(dim_state=(3,), dim_action=(2,))
+        for memory in memories:
+            memory.append(observation)
+        if i % 7 == 6:
+            for memory in memories:
+                memory.end_episode()
+
+
+def _assert_equal_buffers(memory, other):
+    assert memory.data_count == other.data_count
+    torch.testing.assert_close(memory.valid, other.valid)
+    for column, other_column in zip(memory.memory, other.memory):
+        torch.testing.assert_close(column, other_column, equal_nan=True)
+
+
+def test_append_and_sample(directory, num_memory_steps):
+    memory = MemoryMappedExperienceReplay(
+        max_len=50, num_memory_steps=num_memory_steps, directory=directory
+    )
+    expected = ExperienceReplay(max_len=50, num_memory_steps=num_memory_steps)
+    _append([memory, expected], 80)
+    _assert_equal_buffers(memory, expected)
+    array = memory._arrays["state"]
+    assert memory.memory.state.data_ptr() == array.ctypes.data
+
+    observation, idx, weight = memory.sample_batch(16)
+    assert observation.state.shape == (16, max(1, num_memory_steps), 3)
+    torch.testing.assert_close(observation.state, expected._get_observation(idx).state)
+    torch.testing.assert_close(memory.all_data.state, expected.all_data.state)
+
+    memory.reset()
+    assert len(memory) == 0
+    _append([memory], 5)
+    assert len(memory) == 5
+
+
+def test_reopen(directory, num_memory_steps):
+    memory = MemoryMappedExperienceReplay(
+        max_len=50, num_memory_steps=num_memory_steps, directory=directory
+    )
+    _append([memory], 20)
+    memory.flush()
+
+    other = MemoryMappedExperienceReplay(max_len=50, directory=directory)
+    _assert_equal_buffers(memory, other)
+    assert other.zero_observation is not None
+    _append([memory, other], 3)
+    _assert_equal_buffers(memory, other)
+
+    with pytest.raises(ValueError):
+        MemoryMappedExperienceReplay(max_len=20, directory=directory)
+
+
+def test_read_only(directory):
+    memory = MemoryMappedExperienceReplay(max_len=50, directory=directory)
+    _append([memory], 10)
+    memory.flush()
+
+    reader = MemoryMappedExperienceReplay(
+        max_len=50, directory=directory, read_only=True
+    )
+    _assert_equal_buffers(memory, reader)
+    reader.memory.state[:] = 0.0
+    assert not (memory.memory.state[:10] == 0).all()
+
+    with pytest.raises(FileNotFoundError):
+        MemoryMappedExperienceReplay(
+            max_len=50, directory=f"{directory}/none", read_only=True
+        )
+
+
+def test_pickle(directory):
+    memory = MemoryMappedExperienceReplay(max_len=50, directory=directory)
+    _append([memory], 10)
+    assert len(pickle.dumps(memory)) < memory.memory.state.numel() * 4
+
+    other = pickle.loads(pickle.dumps(memory))
+    _assert_equal_buffers(memory, other)
+
+
+def test_d4rl_to_observation(directory):
+    num_points = 20
+    dataset = {
+        "observations": np.random.randn(num_points, 3),
+        "actions": np.random.randn(num_points, 2),
+        "rewards": np.random.randn(num_points),
+        "next_observations": np.random.randn(num_points, 3),
+        "terminals": np.random.rand(num_points) > 0.5,
+        "infos/action_log_probs": np.random.randn(num_points),
+    }
+    expected = d4rl_to_observation(dataset)
+    observation = d4rl_to_observation(dataset, directory=directory)
+    for value, expected_value in zip(observation, expected):
+        torch.testing.assert_close(value, expected_value, equal_nan=True)
+
+    observation = d4rl_to_observation(None, directory=directory)
+    torch.testing.assert_close(observation.state, expected.state)
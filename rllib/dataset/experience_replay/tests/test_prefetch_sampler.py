@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import torch
+
+from rllib.agent import DQNAgent
+from rllib.dataset import PrefetchSampler, PrioritizedExperienceReplay
+from rllib.dataset.datatypes import Observation
+from rllib.environment.mdps import EasyGridWorld
+from rllib.util.rollout import rollout_agent
+
+
+@pytest.fixture(params=[0, 1, 3])
+def num_prefetch(request):
+    return request.param
+
+
+def _create_memory(num_transitions=50):
+    memory = PrioritizedExperienceReplay(max_len=100)
+    for _ in range(num_transitions):
+        memory.append(Observation.random_example(dim_state=(3,), dim_action=(2,)))
+    return memory
+
+
+def _learn(sampler, memory, num_iter=20, early_stop=None):
+    sampler.start(memory, batch_size=8, num_batches=num_iter)
+    indexes = []
+    for i in range(num_iter):
+        observation, idx, weight = sampler.sample_batch()
+        assert observation.state.shape == (8, 1, 3)
+        sampler.update(idx, idx.float() / 100)
+        indexes.append(idx)
+        if i == early_stop:
+            break
+    sampler.stop()
+    return torch.stack(indexes)
+
+
+def test_deterministic(num_prefetch):
+    memories = [_create_memory() for _ in range(2)]
+    samplers = [PrefetchSampler(num_prefetch=num_prefetch, seed=0) for _ in range(2)]
+    for early_stop in [None, 5, None]:
+        if num_prefetch == 0:
+            for memory in memories:  # synchronous samplers use the memory state.
+                memory.random_state = np.random.RandomState(0)
+        indexes = [
+            _learn(sampler, memory, early_stop=early_stop)
+            for sampler, memory in zip(samplers, memories)
+        ]
+        torch.testing.assert_close(indexes[0], indexes[1])
+        torch.testing.assert_close(memories[0].priorities, memories[1].priorities)
+
+
+def test_updates_are_applied(num_prefetch):
+    memory = _create_memory()
+    sampler = PrefetchSampler(num_prefetch=num_prefetch)
+    indexes = _learn(sampler, memory, early_stop=3)
+    assert (memory.priorities[indexes[-1]] < memory.max_priority).all()
+    assert memory.random_state is None
+    if num_prefetch > 0:
+        assert sampler.random_state is not None
+
+
+def test_exception():
+    memory = _create_memory(num_transitions=0)
+    sampler = PrefetchSampler(num_prefetch=2)
+    sampler.start(memory, batch_size=8, num_batches=10)
+    with pytest.raises(Exception):
+        sampler.sample_batch()
+    sampler.stop()
+
+
+def test_agent():
+    environment = EasyGridWorld()
+    agent = DQNAgent.default(
+        environment, num_prefetch_batches=2, num_iter=5, batch_size=8
+    )
+    rollout_agent(environment, agent, num_episodes=2, max_steps=20)
+    assert agent.sampler._thread is None
+    assert agent.train_steps > 0
+    agent.logger.delete_directory()
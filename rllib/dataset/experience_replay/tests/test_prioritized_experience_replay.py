@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+import torch
+
+from rllib.dataset import (
+    EXP3ExperienceReplay,
+    PrioritizedExperienceReplay,
+    stack_list_of_tuples,
+)
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.experience_replay.segment_tree import MinTree, SumTree
+
+
+@pytest.fixture(params=[1, 7, 64, 100])
+def capacity(request):
+    return request.param
+
+
+def test_segment_trees(capacity):
+    values = np.random.rand(capacity)
+    sum_tree, min_tree = SumTree(capacity), MinTree(capacity)
+    sum_tree[np.arange(capacity)] = values
+    min_tree[np.arange(capacity)] = values
+
+    np.testing.assert_allclose(sum_tree.total, values.sum())
+    np.testing.assert_allclose(min_tree.min, values.min())
+    np.testing.assert_allclose(sum_tree.leaves, values)
+
+    sum_tree[0] = 0.0
+    min_tree[0] = -1.0
+    np.testing.assert_allclose(sum_tree.total, values[1:].sum())
+    np.testing.assert_allclose(min_tree.min, -1.0)
+
+    sum_tree.reset()
+    assert sum_tree.total == 0
+
+
+def test_find_prefix_sum_index(capacity):
+    values = np.random.rand(capacity)
+    values[::2] = 0.0  # zero-valued leaves are never returned.
+    values[-1] = 1.0
+    sum_tree = SumTree(capacity)
+    sum_tree[np.arange(capacity)] = values
+
+    prefix_sum = np.random.rand(1000) * sum_tree.total
+    idx = sum_tree.find_prefix_sum_index(prefix_sum)
+    expected = np.searchsorted(np.cumsum(values), prefix_sum, side="right")
+
+    np.testing.assert_equal(idx.numpy(), np.minimum(expected, capacity - 1))
+    assert (values[idx] > 0).all()
+
+
+def _create_memory(memory_class, max_len, num_transitions):
+    memory = memory_class(max_len=max_len)
+    for _ in range(num_transitions):
+        memory.append(Observation.random_example(dim_state=(3,), dim_action=(2,)))
+    return memory
+
+
+def test_sampling_distribution():
+    torch.manual_seed(0)
+    memory = _create_memory(PrioritizedExperienceReplay, 20, 10)
+    memory.update(torch.arange(10), torch.arange(10.0))
+
+    counts = torch.zeros(10)
+    for _ in range(200):
+        _, idx, _ = memory.sample_batch(64)
+        counts += torch.bincount(idx, minlength=10)
+
+    torch.testing.assert_close(
+        counts / counts.sum(), memory.probabilities, atol=1e-2, rtol=0
+    )
+
+
+@pytest.mark.parametrize("normalize_weights", [True, False])
+def test_weights(normalize_weights):
+    memory = PrioritizedExperienceReplay(
+        max_len=20, beta=0.5, normalize_weights=normalize_weights
+    )
+    for _ in range(15):
+        memory.append(Observation.random_example(dim_state=(3,), dim_action=(2,)))
+    memory.update(torch.arange(15), torch.rand(15))
+
+    observation, idx, weight = memory.sample_batch(32)
+    expected = torch.pow(memory.probabilities * 15, -0.5)
+    if normalize_weights:
+        expected = expected / expected.max()
+    torch.testing.assert_close(weight, expected[idx])
+    assert observation.state.shape == (32, 1, 3)
+    assert idx.shape == (32,)
+
+    memory.reset()
+    assert memory.priorities.sum() == 0
+
+
+def test_append_uses_max_priority():
+    memory = _create_memory(PrioritizedExperienceReplay, 8, 12)
+    torch.testing.assert_close(memory.priorities, 10.0 * torch.ones(8))
+
+    memory.update(torch.tensor([0, 1]), torch.tensor([1.0, 2.0]))
+    assert memory.priorities[0] < memory.priorities[1] < memory.priorities[2]
+
+
+@pytest.mark.parametrize(
+    "memory_class", [PrioritizedExperienceReplay, EXP3ExperienceReplay]
+)
+def test_append_batch(memory_class):
+    memory = _create_memory(memory_class, 20, 5)
+    memory.update(torch.arange(5), torch.rand(5))
+    observations = [
+        Observation.random_example(dim_state=(3,), dim_action=(2,)) for _ in range(10)
+    ]
+    memory.append_batch(stack_list_of_tuples(observations))
+
+    assert len(memory) == 15
+    torch.testing.assert_close(
+        memory.priorities[5:15], memory.max_priority * torch.ones(10)
+    )
+    torch.testing.assert_close(memory.probabilities.sum(), torch.tensor(1.0))
+
+
+def test_exp3_sample_batch():
+    memory = _create_memory(EXP3ExperienceReplay, 20, 10)
+    observation, idx, weight = memory.sample_batch(16)
+    assert observation.state.shape == (16, 1, 3)
+    torch.testing.assert_close(weight, memory.weights[idx])
+
+    memory.update(idx, torch.rand(16))
+    torch.testing.assert_close(memory.probabilities.sum(), torch.tensor(1.0))
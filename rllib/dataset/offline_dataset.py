@@ -68,6 +68,8 @@ class OfflineDataset(Dataset):
 
     def init_transformations(self):
         """Initialize transformations."""
+        if not self.transformations:  # avoid copying memory-mapped datasets.
+            return
         observation = self.dataset.clone()
         observation = flatten_observation(observation)
         for transformation in self.transformations:
@@ -3,7 +3,7 @@ import pytest
 import torch
 import torch.testing
 
-from rllib.dataset.datatypes import Observation
+from rllib.dataset.datatypes import Observation, ObservationBatch
 
 
 class TestObservation(object):
@@ -119,3 +119,52 @@ class TestObservation(object):
         for x, x1 in zip(o, o1):
             assert Observation._is_equal_nan(x, x1)
             assert x is not x1
+
+
+class TestObservationBatch(object):
+    def init(self, batch_size=8):
+        return ObservationBatch.from_observation(
+            Observation(
+                state=torch.randn(batch_size, 4),
+                action=torch.randn(batch_size, 2),
+                reward=torch.randn(batch_size, 1),
+                next_state=torch.randn(batch_size, 4),
+                done=torch.zeros(batch_size),
+                next_action=ObservationBatch.absent((batch_size, 2)),
+            )
+        )
+
+    def test_mask(self):
+        batch = self.init()
+        assert batch.mask == (True,) * 5 + (False,) * 6
+        assert batch.shape == (8,)
+        assert len(batch) == 8
+        assert batch.next_action.shape == (8, 2)
+
+        with pytest.raises(RuntimeError):
+            batch.next_action.add_(1.0)  # Absent attributes are not writable.
+
+    def test_index(self):
+        batch = self.init()
+        view = batch[2:5]
+        assert view.state.shape == (3, 4)
+        assert view.state.data_ptr() == batch.state[2].data_ptr()
+        assert view.mask == batch.mask
+        assert view.next_action.shape == (3, 2)
+
+        other = batch[torch.tensor([0, 0, 1])]
+        torch.testing.assert_close(other.reward, batch.reward[[0, 0, 1]])
+        assert other.mask == batch.mask
+
+    def test_clone_and_to(self):
+        batch = self.init()
+        other = batch.clone()
+        assert other.state.data_ptr() != batch.state.data_ptr()
+        assert other.next_action.data_ptr() == batch.next_action.data_ptr()
+        torch.testing.assert_close(other.state, batch.state)
+        assert other.mask == batch.mask
+
+        other = batch.to(torch.float64)
+        assert other.state.dtype == torch.float64
+        assert other.entropy.dtype == torch.float64
+        assert other.mask == batch.mask
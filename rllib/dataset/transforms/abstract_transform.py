@@ -19,6 +19,8 @@ class AbstractTransform(nn.Module, metaclass=ABCMeta):
         revert the transformation of the observation.
     update(observation):
         update the parameters of the transformer.
+    fold(fused_transform): bool
+        fold the transformation into a FusedAffineTransform.
 
     """
 
@@ -64,3 +66,18 @@ class AbstractTransform(nn.Module, metaclass=ABCMeta):
 
         """
         pass
+
+    def fold(self, fused_transform):
+        """Fold the transformation into a fused affine transformation.
+
+        Parameters
+        ----------
+        fused_transform: FusedAffineTransform
+            Map of the transformations applied before this one.
+
+        Returns
+        -------
+        folded: bool
+            Flag that indicates whether the transformation is affine and was folded.
+        """
+        return False
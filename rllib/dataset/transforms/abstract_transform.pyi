@@ -5,7 +5,10 @@ import torch.nn as nn
 
 from rllib.dataset.datatypes import Observation
 
+from .fused_transform import FusedAffineTransform
+
 class AbstractTransform(nn.Module, metaclass=ABCMeta):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
     def update(self, observation: Observation) -> None: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
@@ -0,0 +1,90 @@
+"""Implementation of a chain of affine transformations fused into a single map."""
+
+import torch
+
+
+class FusedAffineTransform(object):
+    r"""Chain of affine transformations fused into a single affine map.
+
+    The state, action, and reward are mapped as:
+        .. math:: x' = scale * x + offset,
+    and the next state also depends on the raw state as:
+        .. math:: next\_state' = scale * next\_state + offset + coefficient * state.
+
+    Each transformation folds itself into the map with its `fold' method, hence the
+    statistics of the transformations are folded in when the map is built and a
+    forward or inverse pass only costs one operation per attribute.
+
+    Parameters
+    ----------
+    transformations: iterable of AbstractTransform.
+        Transformations to fuse, in the order in which they are applied.
+    """
+
+    def __init__(self, transformations=()):
+        self.scale = dict()
+        self.offset = dict()
+        self.scale_tril_scale = dict()
+        self.state_coefficient = None
+        self.fused = all(
+            transformation.fold(self) for transformation in transformations
+        )
+
+    def rescale(self, name, scale, offset=None, scale_tril_scale=None):
+        """Compose the map of attribute `name' with `x' = scale * x + offset'.
+
+        If `scale_tril_scale' is given, the rows of the scale of the attribute are
+        multiplied by it.
+        """
+        if scale_tril_scale is not None:
+            self.scale_tril_scale[name] = scale_tril_scale * self.scale_tril_scale.get(
+                name, 1.0
+            )
+        if name in self.scale:
+            self.scale[name] = scale * self.scale[name]
+            self.offset[name] = scale * self.offset[name]
+        else:
+            self.scale[name] = scale
+            self.offset[name] = torch.zeros_like(scale)
+        if offset is not None:
+            self.offset[name] = self.offset[name] + offset
+        if name == "next_state" and self.state_coefficient is not None:
+            self.state_coefficient = scale * self.state_coefficient
+
+    def subtract_state(self):
+        """Compose the map of the next state with `next_state' - state'."""
+        scale = self.scale.get("state", torch.tensor(1.0))
+        offset = self.offset.get("state", torch.tensor(0.0))
+        if self.state_coefficient is None:
+            self.state_coefficient = -scale
+        else:
+            self.state_coefficient = self.state_coefficient - scale
+        self.offset["next_state"] = self.offset.get("next_state", 0.0) - offset
+        self.scale.setdefault("next_state", torch.tensor(1.0))
+
+    def forward(self, name, value, state=None):
+        """Transform the attribute `name' of an observation."""
+        if name in self.scale:
+            value = torch.addcmul(self.offset[name], self.scale[name], value)
+        if name == "next_state" and self.state_coefficient is not None:
+            value = torch.addcmul(value, self.state_coefficient, state)
+        return value
+
+    def inverse(self, name, value, state=None):
+        """Inverse-transform the attribute `name' of an observation."""
+        if name == "next_state" and self.state_coefficient is not None:
+            value = value - self.state_coefficient * state
+        if name in self.scale:
+            value = (value - self.offset[name]) / self.scale[name]
+        return value
+
+    def inverse_scale_tril(self, name, scale_tril):
+        """Inverse-transform the scale of the attribute `name' of an observation."""
+        if name not in self.scale_tril_scale:
+            return scale_tril
+        scale = self.scale_tril_scale[name]
+        if scale_tril.dim() < 2 or scale.dim() == 0:
+            return scale_tril
+        if scale.shape[-1] != scale_tril.shape[-2]:
+            return scale_tril
+        return scale_tril / scale.unsqueeze(-1)
@@ -0,0 +1,28 @@
+from typing import Dict, Iterable, Optional
+
+from torch import Tensor
+
+from .abstract_transform import AbstractTransform
+
+class FusedAffineTransform(object):
+    scale: Dict[str, Tensor]
+    offset: Dict[str, Tensor]
+    scale_tril_scale: Dict[str, Tensor]
+    state_coefficient: Optional[Tensor]
+    fused: bool
+    def __init__(self, transformations: Iterable[AbstractTransform] = ...) -> None: ...
+    def rescale(
+        self,
+        name: str,
+        scale: Tensor,
+        offset: Optional[Tensor] = ...,
+        scale_tril_scale: Optional[Tensor] = ...,
+    ) -> None: ...
+    def subtract_state(self) -> None: ...
+    def forward(
+        self, name: str, value: Tensor, state: Optional[Tensor] = ...
+    ) -> Tensor: ...
+    def inverse(
+        self, name: str, value: Tensor, state: Optional[Tensor] = ...
+    ) -> Tensor: ...
+    def inverse_scale_tril(self, name: str, scale_tril: Tensor) -> Tensor: ...
@@ -42,3 +42,13 @@ class MeanFunction(AbstractTransform):
         mean_next_state = self.mean_function(observation.state, observation.action)
         observation.next_state = observation.next_state + mean_next_state
         return observation
+
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'.
+
+        Only the mean function DeltaState is affine.
+        """
+        if not isinstance(self.mean_function, DeltaState):
+            return False
+        fused_transform.subtract_state()
+        return True
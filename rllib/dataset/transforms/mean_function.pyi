@@ -5,6 +5,7 @@ import torch.nn as nn
 from rllib.dataset.datatypes import Observation
 
 from .abstract_transform import AbstractTransform
+from .fused_transform import FusedAffineTransform
 
 class DeltaState(nn.Module): ...
 
@@ -13,3 +14,4 @@ class MeanFunction(AbstractTransform):
     def __init__(self, mean_function: nn.Module) -> None: ...
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
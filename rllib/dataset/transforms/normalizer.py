@@ -38,6 +38,18 @@ class Normalizer(nn.Module):
         else:
             return self.mean + array * torch.sqrt(self.variance)
 
+    def affine(self):
+        """Get the affine map `scale * x + offset' that normalizes an array.
+
+        It also returns the scale that the transformations apply to the scale trils.
+        """
+        scale_tril_scale = 1 / torch.sqrt(self.variance)
+        if self.preserve_origin:
+            scale = 1 / torch.sqrt(self.variance + self.mean ** 2)
+            return scale, None, scale_tril_scale
+        else:
+            return scale_tril_scale, -self.mean * scale_tril_scale, scale_tril_scale
+
     @torch.jit.export
     def update(self, array):
         """See `AbstractTransform.update'."""
@@ -104,6 +116,12 @@ class StateNormalizer(AbstractTransform):
         """See `AbstractTransform.update'."""
         self._normalizer.update(observation.state)
 
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'."""
+        scale, offset, scale_tril_scale = self._normalizer.affine()
+        fused_transform.rescale("state", scale, offset, scale_tril_scale)
+        return True
+
 
 class NextStateNormalizer(AbstractTransform):
     r"""Implementation of a transformer that normalizes the next states.
@@ -149,6 +167,12 @@ class NextStateNormalizer(AbstractTransform):
         """See `AbstractTransform.update'."""
         self._normalizer.update(observation.next_state)
 
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'."""
+        scale, offset, scale_tril_scale = self._normalizer.affine()
+        fused_transform.rescale("next_state", scale, offset, scale_tril_scale)
+        return True
+
 
 class RewardNormalizer(AbstractTransform):
     """Implementation of a transformer that normalizes the rewards."""
@@ -179,6 +203,12 @@ class RewardNormalizer(AbstractTransform):
         """See `AbstractTransform.update'."""
         self._normalizer.update(observation.reward)
 
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'."""
+        scale, offset, scale_tril_scale = self._normalizer.affine()
+        fused_transform.rescale("reward", scale, offset, scale_tril_scale)
+        return True
+
 
 class ActionNormalizer(AbstractTransform):
     """Implementation of a transformer that normalizes the action.
@@ -215,3 +245,9 @@ class ActionNormalizer(AbstractTransform):
     def update(self, observation):
         """See `AbstractTransform.update'."""
         self._normalizer.update(observation.action)
+
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'."""
+        scale, offset, _ = self._normalizer.affine()
+        fused_transform.rescale("action", scale, offset)
+        return True
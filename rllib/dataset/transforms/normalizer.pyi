@@ -1,4 +1,4 @@
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 
 import torch.nn as nn
 from torch import Tensor
@@ -6,6 +6,7 @@ from torch import Tensor
 from rllib.dataset.datatypes import Observation
 
 from .abstract_transform import AbstractTransform
+from .fused_transform import FusedAffineTransform
 
 class Normalizer(nn.Module):
     mean: Tensor
@@ -16,6 +17,7 @@ class Normalizer(nn.Module):
     def forward(self, array: Tensor, **kwargs: Any) -> Tensor: ...
     def inverse(self, array: Tensor) -> Tensor: ...
     def update(self, array: Tensor) -> None: ...
+    def affine(self) -> Tuple[Tensor, Optional[Tensor], Tensor]: ...
 
 class StateNormalizer(AbstractTransform):
     _normalizer: Normalizer
@@ -23,6 +25,7 @@ class StateNormalizer(AbstractTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
     def update(self, observation: Observation) -> None: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
 
 class NextStateNormalizer(AbstractTransform):
     _normalizer: Normalizer
@@ -30,6 +33,7 @@ class NextStateNormalizer(AbstractTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
     def update(self, observation: Observation) -> None: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
 
 class ActionNormalizer(AbstractTransform):
     _normalizer: Normalizer
@@ -37,6 +41,7 @@ class ActionNormalizer(AbstractTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
     def update(self, observation: Observation) -> None: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
 
 class RewardNormalizer(AbstractTransform):
     _normalizer: Normalizer
@@ -44,3 +49,4 @@ class RewardNormalizer(AbstractTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
     def update(self, observation: Observation) -> None: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
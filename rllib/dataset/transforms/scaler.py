@@ -52,6 +52,11 @@ class RewardScaler(AbstractTransform):
         observation.reward = self._scaler.inverse(observation.reward)
         return observation
 
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'."""
+        fused_transform.rescale("reward", 1 / self._scaler._scale)
+        return True
+
 
 class ActionScaler(AbstractTransform):
     """Implementation of an Action Scaler.
@@ -78,3 +83,8 @@ class ActionScaler(AbstractTransform):
         """See `AbstractTransform.inverse'."""
         observation.action = self._scaler.inverse(observation.action)
         return observation
+
+    def fold(self, fused_transform):
+        """See `AbstractTransform.fold'."""
+        fused_transform.rescale("action", 1 / self._scaler._scale)
+        return True
@@ -6,6 +6,7 @@ import torch.nn as nn
 from rllib.dataset.datatypes import Array, Observation
 
 from .abstract_transform import AbstractTransform
+from .fused_transform import FusedAffineTransform
 
 class Scaler(nn.Module):
     _scale: torch.Tensor
@@ -18,9 +19,11 @@ class RewardScaler(AbstractTransform):
     def __init__(self, scale: float) -> None: ...
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
 
 class ActionScaler(AbstractTransform):
     _scaler: Scaler
     def __init__(self, scale: float) -> None: ...
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
+    def fold(self, fused_transform: FusedAffineTransform) -> bool: ...
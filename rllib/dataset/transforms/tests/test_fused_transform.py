@@ -0,0 +1,128 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.transforms import (
+    ActionClipper,
+    ActionNormalizer,
+    ActionScaler,
+    DeltaState,
+    MeanFunction,
+    NextStateNormalizer,
+    RewardNormalizer,
+    RewardScaler,
+    StateNormalizer,
+)
+from rllib.dataset.transforms.fused_transform import FusedAffineTransform
+from rllib.model import EnsembleModel, TransformedModel
+
+
+@pytest.fixture(params=[True, False])
+def preserve_origin(request):
+    return request.param
+
+
+def get_observation(batch_size=32):
+    return Observation(
+        state=3 * torch.randn(batch_size, 4) + 1,
+        action=torch.randn(batch_size, 2),
+        reward=2 * torch.randn(batch_size, 1) - 1,
+        next_state=5 * torch.randn(batch_size, 4),
+        next_state_scale_tril=torch.randn(batch_size, 4, 4).tril(),
+        reward_scale_tril=torch.randn(batch_size, 1, 1),
+    ).to_torch()
+
+
+def get_transformations(preserve_origin):
+    transformations = [
+        StateNormalizer(dim=(4,), preserve_origin=preserve_origin),
+        MeanFunction(DeltaState()),
+        ActionNormalizer(dim=(2,), preserve_origin=preserve_origin),
+        ActionScaler(scale=torch.tensor([2.0, 0.5])),
+        RewardNormalizer(dim=(1,), preserve_origin=preserve_origin),
+        RewardScaler(scale=3.0),
+        NextStateNormalizer(dim=(4,), preserve_origin=preserve_origin),
+    ]
+    observation = get_observation()
+    for transformation in transformations:
+        transformation.update(observation)
+        observation = transformation(observation)
+    return transformations
+
+
+def test_fused_transform(preserve_origin):
+    transformations = get_transformations(preserve_origin)
+    fused_transform = FusedAffineTransform(transformations)
+    assert fused_transform.fused
+
+    observation = get_observation()
+    expected = observation.clone()
+    for transformation in transformations:
+        expected = transformation(expected)
+
+    for name in ["state", "action", "reward", "next_state"]:
+        value = fused_transform.forward(
+            name, getattr(observation, name), observation.state
+        )
+        torch.testing.assert_close(value, getattr(expected, name))
+
+    inverse = expected.clone()
+    for transformation in reversed(transformations):
+        inverse = transformation.inverse(inverse)
+    for name in ["state", "action", "reward", "next_state"]:
+        value = fused_transform.inverse(
+            name, getattr(expected, name), observation.state
+        )
+        torch.testing.assert_close(value, getattr(observation, name))
+    for name in ["next_state", "reward"]:
+        scale_tril = getattr(expected, f"{name}_scale_tril")
+        torch.testing.assert_close(
+            fused_transform.inverse_scale_tril(name, scale_tril),
+            getattr(inverse, f"{name}_scale_tril"),
+        )
+
+
+def test_not_affine():
+    transformations = [MeanFunction(DeltaState()), ActionClipper(1.0)]
+    assert not FusedAffineTransform(transformations).fused
+    assert not FusedAffineTransform([MeanFunction(lambda s, a: 2 * s)]).fused
+
+
+@pytest.mark.parametrize("model_kind", ["dynamics", "rewards"])
+def test_transformed_model(model_kind, preserve_origin):
+    base_model = EnsembleModel(
+        dim_state=(4,), dim_action=(2,), num_heads=3, model_kind=model_kind
+    )
+    model = TransformedModel(base_model, get_transformations(preserve_origin))
+    state, action = torch.randn(8, 4), torch.randn(8, 2)
+
+    fused_transform = model.fused_transform()
+    assert fused_transform is not None and model.fused_transform() is fused_transform
+
+    for transformation in model.transformations:
+        transformation.update(get_observation())
+    assert model.fused_transform() is not fused_transform
+
+    for prediction_strategy in ["moment_matching", "multi_head"]:
+        model.set_prediction_strategy(prediction_strategy)
+        prediction = model(state, action)
+
+        model._fused_transform_key, model._fused_transform = None, None
+        model.fused_transform = lambda: None  # Use the transformation chain.
+        expected = model(state, action)
+        del model.fused_transform
+
+        for value, expected_value in zip(prediction, expected):
+            torch.testing.assert_close(value, expected_value, rtol=1e-4, atol=1e-4)
+
+
+def test_numpy_inputs(preserve_origin):
+    base_model = EnsembleModel(dim_state=(4,), dim_action=(2,), num_heads=3)
+    model = TransformedModel(base_model, get_transformations(preserve_origin))
+    state, action = torch.randn(4), torch.randn(2)
+    assert model.fused_transform() is not None
+
+    prediction = model(state.numpy(), action.numpy())
+    for value, expected_value in zip(prediction, model(state, action)):
+        torch.testing.assert_close(value, expected_value)
@@ -1,4 +1,5 @@
 """Utilities for dataset submodule."""
+import os
 from itertools import product
 
 import numpy as np
@@ -181,31 +182,54 @@ def chunk(array, num_memory_steps):
     return array.reshape(batch_size, num_memory_steps, *array.shape[1:])
 
 
-def d4rl_to_observation(dataset):
+def d4rl_to_observation(dataset, directory=None):
     """Transform a d4rl dataset into an observation dataset.
 
     Parameters
     ----------
     dataset: Dict.
         Dict with dataset.
+    directory: str, optional.
+        If given, the attributes of the observation are saved as `.npy' files in the
+        directory and memory-mapped, hence the dataset is not kept in memory.
+        If the directory already holds the files, they are opened and the dataset is
+        not read.
 
     Returns
     -------
     observation: Observation
         Dataset in observation format..
     """
-    num_points = dataset["observations"].shape[0]
-    dim_state = dataset["observations"].shape[1]
-    dim_actions = dataset["actions"].shape[1]
-    dataset = Observation(
-        state=dataset["observations"].reshape(num_points, 1, dim_state),
-        action=dataset["actions"].reshape(num_points, 1, dim_actions),
-        reward=dataset["rewards"].reshape(num_points, 1, 1),
-        next_state=dataset["next_observations"].reshape(num_points, 1, dim_state),
-        done=dataset["terminals"].reshape(num_points, 1, 1),
-        log_prob_action=dataset["infos/action_log_probs"].reshape(num_points, 1, 1),
-    ).to_torch()
-    return dataset
+    keys = {
+        "state": "observations",
+        "action": "actions",
+        "reward": "rewards",
+        "next_state": "next_observations",
+        "done": "terminals",
+        "log_prob_action": "infos/action_log_probs",
+    }
+    if directory is None:
+        num_points = dataset["observations"].shape[0]
+        return Observation(
+            **{
+                name: dataset[key].reshape(num_points, 1, -1)
+                for name, key in keys.items()
+            }
+        ).to_torch()
+
+    dtype = torch.zeros(0).numpy().dtype
+    os.makedirs(directory, exist_ok=True)
+    columns = {}
+    for name, key in keys.items():
+        path = os.path.join(directory, f"{name}.npy")
+        if not os.path.exists(path):
+            value = dataset[key]
+            np.save(f"{path}.tmp.npy", np.asarray(value, dtype=dtype))
+            os.replace(f"{path}.tmp.npy", path)
+        # Copy-on-write mappings share the pages between processes.
+        array = np.load(path, mmap_mode="c")
+        columns[name] = torch.from_numpy(array).reshape(array.shape[0], 1, -1)
+    return Observation(**columns)
 
 
 def split_observations_by_done(observation):
@@ -335,3 +359,18 @@ def flatten_observation(observation):
             return tensor
 
     return map_observation(func=_flatten, observation=observation)
+
+
+def flatten_batch_dimensions(observation, num_batch_dims):
+    """Flatten the leading `num_batch_dims' dimensions of an observation into one.
+
+    Attributes with less than `num_batch_dims' dimensions are shared by the batch,
+    hence they are not reshaped.
+    """
+
+    def _flatten(tensor):
+        if tensor.ndim < num_batch_dims:
+            return tensor
+        return tensor.reshape(-1, *tensor.shape[num_batch_dims:])
+
+    return map_observation(func=_flatten, observation=observation.to_torch())
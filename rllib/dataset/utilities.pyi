@@ -27,7 +27,9 @@ def gather_trajectories(
 ) -> Observation: ...
 def unstack_observations(observation: Observation) -> Trajectory: ...
 def chunk(array: Array, num_memory_steps: int) -> Array: ...
-def d4rl_to_observation(dataset: Dict[str, Array]) -> Observation: ...
+def d4rl_to_observation(
+    dataset: Optional[Dict[str, Array]], directory: Optional[str] = ...
+) -> Observation: ...
 def split_observations_by_done(observation: Observation) -> Trajectory: ...
 def drop_last(observation: Observation, k: int) -> Observation: ...
 def _observation_to_num_memory_steps(
@@ -41,3 +43,6 @@ def trajectory_to_num_memory_steps(
 ) -> Trajectory: ...
 def merge_observations(trajectory: Trajectory, dim: int = ...) -> Observation: ...
 def flatten_observation(observation: Observation) -> Observation: ...
+def flatten_batch_dimensions(
+    observation: Observation, num_batch_dims: int
+) -> Observation: ...
@@ -32,6 +32,36 @@ class VectorizedEnv(Env, metaclass=ABCMeta):
         """Set vectorized state."""
         return self.state
 
+    def reset_batch(self, batch_size):
+        """Reset `batch_size' independent copies of the environment.
+
+        The vectorized state is set to the stacked initial states and the stacked
+        initial observations are returned.
+        """
+        observations, states = self._reset_copies(batch_size)
+        self.state = states
+        return observations
+
+    def reset_slots(self, slots):
+        """Reset the copies of the environment at `slots' of the vectorized state.
+
+        The remaining copies are left untouched and the initial observations of the
+        reset copies are returned.
+        """
+        state = self.state
+        observations, states = self._reset_copies(len(slots))
+        state[slots] = states
+        self.state = state
+        return observations
+
+    def _reset_copies(self, num_copies):
+        """Reset the environment `num_copies' times and stack the results."""
+        observations, states = [], []
+        for _ in range(num_copies):
+            observations.append(self.reset())
+            states.append(self.state)
+        return np.stack(observations), np.stack(states)
+
     def atan2(self, sin, cos):
         """Return signed angle of the sin cosine."""
         if self.bk is np:
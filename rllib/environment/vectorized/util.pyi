@@ -12,6 +12,9 @@ class VectorizedEnv(Env, metaclass=ABCMeta):
 
     @property
     def bk(self) -> types.ModuleType: ...
+    def reset_batch(self, batch_size: int) -> State: ...
+    def reset_slots(self, slots: Array) -> State: ...
+    def _reset_copies(self, num_copies: int) -> Tuple[State, State]: ...
     def atan2(self, sin: Array, cos: Array) -> Array: ...
     def clip(self, val: Array, min_val: float, max_val: float) -> Array: ...
     def cat(self, arrays: Iterable[Array], axis: int = ...) -> Array: ...
@@ -11,7 +11,15 @@ from .abstract_model import AbstractModel
 
 
 class ExactGPModel(AbstractModel):
-    """An Exact GP State Space Model."""
+    """An Exact GP State Space Model.
+
+    By default, there is one independent GP per output dimension in `gp'.
+    If `batched', `gp' holds a single GP with a batch of output dimensions instead,
+    whose kernel matrices and Cholesky factors are computed with one batched
+    operation for all the outputs. By default, the batched GP has independent
+    hyper-parameters for each output. A `mean' or `kernel' without batch shape is
+    shared by all the outputs and evaluated once.
+    """
 
     def __init__(
         self,
@@ -22,6 +30,7 @@ class ExactGPModel(AbstractModel):
         kernel=None,
         input_transform=None,
         max_num_points=None,
+        batched=False,
         *args,
         **kwargs,
     ):
@@ -34,6 +43,7 @@ class ExactGPModel(AbstractModel):
         dim_state = (state.shape[-1],)
         dim_action = (action.shape[-1],)
         self.max_num_points = max_num_points
+        self.batched = batched
 
         super().__init__(dim_state, dim_action, deterministic=False)
         self.input_transform = input_transform
@@ -41,11 +51,26 @@ class ExactGPModel(AbstractModel):
 
         likelihoods = []
         gps = []
-        for train_y_i in train_y:
-            likelihood = gpytorch.likelihoods.GaussianLikelihood()
-            gp = ExactGP(train_x, train_y_i, likelihood, mean, kernel)
-            gps.append(gp)
+        if batched:
+            batch_shape = torch.Size([len(train_y)])
+            if mean is None:
+                mean = gpytorch.means.ZeroMean(batch_shape=batch_shape)
+            if kernel is None:
+                kernel = gpytorch.kernels.ScaleKernel(
+                    gpytorch.kernels.RBFKernel(batch_shape=batch_shape),
+                    batch_shape=batch_shape,
+                )
+            likelihood = gpytorch.likelihoods.GaussianLikelihood(
+                batch_shape=batch_shape
+            )
+            gps.append(ExactGP(train_x, train_y, likelihood, mean, kernel))
             likelihoods.append(likelihood)
+        else:
+            for train_y_i in train_y:
+                likelihood = gpytorch.likelihoods.GaussianLikelihood()
+                gp = ExactGP(train_x, train_y_i, likelihood, mean, kernel)
+                gps.append(gp)
+                likelihoods.append(likelihood)
 
         self.likelihood = torch.nn.ModuleList(likelihoods)
         self.gp = torch.nn.ModuleList(gps)
@@ -63,14 +88,25 @@ class ExactGPModel(AbstractModel):
             kernel=kwargs.pop("kernel", None),
             input_transform=kwargs.pop("input_transform", None),
             max_num_points=kwargs.pop("max_num_points", None),
+            batched=kwargs.pop("batched", False),
             *args,
             **kwargs,
         )
 
+    @property
+    def train_targets(self):
+        """Get the training targets of the GPs, with shape [d_x x N]."""
+        if self.batched:
+            return self.gp[0].train_targets
+        return torch.stack(tuple(gp.train_targets for gp in self.gp), dim=0)
+
     def forward(self, state, action, next_state=None):
         """Get next state distribution."""
         test_x = self.state_actions_to_input_data(state, action)
 
+        if self.batched:
+            return self._batched_forward(test_x)
+
         if self.training:
             out = [
                 likelihood(gp(gp.train_inputs[0]))
@@ -98,9 +134,28 @@ class ExactGPModel(AbstractModel):
             )
             return mean, torch.diag_embed(stddev)
 
+    def _batched_forward(self, test_x):
+        """Get next state distribution with the batched GP."""
+        gp, likelihood = self.gp[0], self.likelihood[0]
+        if self.training:
+            out = likelihood(gp(gp.train_inputs[0]))
+            return out.mean, out.scale_tril
+
+        # Only the marginal variances are returned, hence the test points are
+        # flattened and the outputs are a batch dimension of the GP.
+        out = likelihood(gp(test_x.reshape(-1, test_x.shape[-1])))
+        variance = torch.max(out.variance, likelihood.noise.detach() ** 2)
+        shape = test_x.shape[:-1] + (-1,)
+        mean = out.mean.transpose(-2, -1).reshape(shape)
+        stddev = torch.sqrt(variance).transpose(-2, -1).reshape(shape)
+        return mean, torch.diag_embed(stddev)
+
     def add_data(self, state, action, target):
         """Add new data to GP-Model, independently to each GP."""
         new_x, new_y = self.state_actions_to_train_data(state, action, target)
+        if self.batched:
+            add_data_to_gp(self.gp[0], new_x, new_y)
+            return
         for i, new_y_i in enumerate(new_y):
             add_data_to_gp(self.gp[i], new_x, new_y_i)
 
@@ -120,6 +175,10 @@ class ExactGPModel(AbstractModel):
         Gomes, R., & Krause, A. (2010).
         Budgeted Nonparametric Learning from Data Streams. ICML.
 
+        Notes
+        -----
+        The batched GP shares the training inputs of all the outputs, hence they are
+        selected by maximizing the sum of the predictive variances of the outputs.
         """
         for gp in self.gp:
             summarize_gp(
@@ -206,6 +265,8 @@ class RandomFeatureGPModel(ExactGPModel):
 
     def __init__(self, num_features, approximation="RFF", *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if self.batched:
+            raise NotImplementedError("Random Feature GPs can not be batched.")
         gps = []
         train_x, train_y = self.state_actions_to_train_data(
             self._state, self._action, self._target
@@ -262,6 +323,8 @@ class SparseGPModel(ExactGPModel):
         self, inducing_points=None, q_bar=1, approximation="DTC", *args, **kwargs
     ):
         super().__init__(*args, **kwargs)
+        if self.batched:
+            raise NotImplementedError("Sparse GPs can not be batched.")
         gps = []
         train_x, train_y = self.state_actions_to_train_data(
             self._state, self._action, self._target
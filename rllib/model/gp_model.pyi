@@ -11,6 +11,7 @@ from .abstract_model import AbstractModel
 
 class ExactGPModel(AbstractModel):
     max_num_points: Optional[int]
+    batched: bool
     input_transform: nn.Module
     likelihood: nn.ModuleList
     gp: nn.ModuleList
@@ -28,10 +29,14 @@ class ExactGPModel(AbstractModel):
         kernel: Optional[Kernel] = ...,
         input_transform: Optional[nn.Module] = ...,
         max_num_points: Optional[int] = ...,
+        batched: bool = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
+    @property
+    def train_targets(self) -> Tensor: ...
     def forward(self, *args: Tensor, **kwargs: Any) -> TupleDistribution: ...
+    def _batched_forward(self, test_x: Tensor) -> TupleDistribution: ...
     def add_data(self, state: Tensor, action: Tensor, next_state: Tensor) -> None: ...
     def summarize_gp(self, weight_function: Optional[nn.Module] = ...) -> None: ...
     def _transform_weight_function(
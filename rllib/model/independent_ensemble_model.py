@@ -3,6 +3,10 @@
 import numpy as np
 import torch
 
+from rllib.util.neural_networks.neural_networks import (
+    HeteroGaussianNN,
+    batched_forward,
+)
 from rllib.util.utilities import safe_cholesky
 
 from .abstract_model import AbstractModel
@@ -49,23 +53,16 @@ class IndependentEnsembleModel(AbstractModel):
     def forward(self, state, action, next_state=None):
         """Compute the next prediction of the ensemble."""
         if self.prediction_strategy in ["moment_matching", "multi_head"]:
-            mean, std = self.models[0](state, action, next_state)
-            out_mean = mean.unsqueeze(-1)
-            out_std = torch.diagonal(std, dim1=-2, dim2=-1).unsqueeze(-1)
-            for i in range(1, self.num_heads):
-                mean, std = self.models[i].forward(state, action, next_state)
-                out_mean = torch.cat((out_mean, mean.unsqueeze(-1)), dim=-1)
-                std = torch.diagonal(std, dim1=-2, dim2=-1)
-                out_std = torch.cat((out_std, std.unsqueeze(-1)), dim=-1)
+            out_mean, out_scale = self.multi_head_forward(state, action, next_state)
             if self.prediction_strategy == "moment_matching":
-                mean = out_mean.mean(-1)
+                out_std = torch.diagonal(out_scale, dim1=-2, dim2=-1)
+                mean = out_mean.mean(-2)
                 variance = (out_std.square() + out_mean.square()).mean(
-                    -1
+                    -2
                 ) - mean.square()
                 scale = safe_cholesky(torch.diag_embed(variance))
             else:
-                mean = out_mean
-                scale = out_std
+                mean, scale = out_mean, out_scale
         elif self.prediction_strategy == "sample_head":  # TS-1
             head_ptr = torch.randint(self.num_heads, (1,))
             mean, scale = self.models[head_ptr].forward(state, action, next_state)
@@ -74,23 +71,66 @@ class IndependentEnsembleModel(AbstractModel):
         elif self.prediction_strategy == "set_head_idx":  # TS-INF
             mean, scale = self.models[self.head_idx].forward(state, action, next_state)
         elif self.prediction_strategy == "sample_multiple_head":
-            head_idx = torch.randint(self.num_heads, size=(self.num_heads,)).unsqueeze(
-                -1
-            )
-            mean, std = self.models[head_idx[0]].forward(state, action, next_state)
-            out_mean = mean.unsqueeze(-1)
-            out_std = torch.diagonal(std, dim1=-2, dim2=-1).unsqueeze(-1)
-            for i in head_idx[1:]:
-                mean, std = self.models[i].forward(state, action, next_state)
-                out_mean = torch.cat((out_mean, mean.unsqueeze(-1)), dim=-1)
-                std = torch.diagonal(std, dim1=-2, dim2=-1)
-                out_std = torch.cat((out_std, std.unsqueeze(-1)), dim=-1)
-            mean = out_mean
-            scale = out_std
+            head_idx = torch.randint(self.num_heads, size=(self.num_heads,))
+            predictions = [
+                self.models[i].forward(state, action, next_state) for i in head_idx
+            ]
+            mean = torch.stack([prediction[0] for prediction in predictions], -2)
+            scale = torch.stack([prediction[1] for prediction in predictions], -3)
         else:
             raise NotImplementedError
         return mean, scale
 
+    def multi_head_forward(self, state, action, next_state=None):
+        """Compute the predictions of all the heads.
+
+        When all the heads are feed-forward NNModels with the same architecture,
+        they are evaluated in a single pass with batched matrix products.
+
+        Returns
+        -------
+        mean: Tensor.
+            Mean of size [batch_size x num_heads x out_dim].
+        scale_tril: Tensor.
+            Scale of size [batch_size x num_heads x out_dim x out_dim].
+        """
+        if not self.batched_heads:
+            predictions = [model(state, action, next_state) for model in self.models]
+            mean = torch.stack([prediction[0] for prediction in predictions], -2)
+            scale = torch.stack([prediction[1] for prediction in predictions], -3)
+            return mean, scale
+
+        model = self.models[0]
+        state_action = model.state_actions_to_input_data(state, action)
+        batch_shape = state_action.shape[:-1]
+        x = state_action.reshape(1, -1, state_action.shape[-1])
+        mean, scale = batched_forward(
+            [model.nn[0] for model in self.models],
+            x.expand(self.num_heads, -1, -1),
+        )
+        mean = mean.reshape(self.num_heads, *batch_shape, -1).movedim(0, -2)
+        scale = scale.reshape(self.num_heads, *batch_shape, *scale.shape[-2:])
+        scale = scale.movedim(0, -3)
+        if model.deterministic:
+            return mean, torch.zeros_like(scale)
+        temperature = torch.stack([model.temperature for model in self.models])
+        return mean, temperature[:, None, None] * scale
+
+    @property
+    def batched_heads(self):
+        """Check if all the heads can be evaluated with batched matrix products."""
+        model = self.models[0]
+        return all(
+            type(other) is NNModel
+            and len(other.nn) == 1
+            and type(other.nn[0]) is HeteroGaussianNN
+            and other.nn[0].kwargs == model.nn[0].kwargs
+            and other.input_transform is None
+            and other.deterministic == model.deterministic
+            and not other.discrete_state
+            for other in self.models
+        )
+
     @classmethod
     def default(cls, environment, num_heads=5, *args, **kwargs):
         """See AbstractModel.default()."""
@@ -1,9 +1,12 @@
 """Implementation of a model composed by an ensemble of independent models."""
 
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
 import torch
+from torch import Tensor
+
+from rllib.dataset.datatypes import TupleDistribution
 
 from .abstract_model import AbstractModel
 
@@ -19,3 +22,9 @@ class IndependentEnsembleModel(AbstractModel):
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
+    def forward(self, *args: Tensor, **kwargs: Any) -> TupleDistribution: ...
+    def multi_head_forward(
+        self, state: Tensor, action: Tensor, next_state: Optional[Tensor] = ...
+    ) -> TupleDistribution: ...
+    @property
+    def batched_heads(self) -> bool: ...
@@ -11,13 +11,21 @@ from rllib.dataset.transforms import (
     RewardNormalizer,
     StateNormalizer,
 )
+from rllib.dataset.transforms.fused_transform import FusedAffineTransform
+from rllib.util.neural_networks.utilities import to_torch
 
 from .abstract_model import AbstractModel
 from .ensemble_model import EnsembleModel
 
 
 class TransformedModel(AbstractModel):
-    """Transformed Model computes the next state distribution."""
+    """Transformed Model computes the next state distribution.
+
+    When all the transformations are affine, they are fused into a single
+    FusedAffineTransform and only the attributes that the model consumes and returns
+    are transformed. The fused transformation is cached and rebuilt when the
+    parameters of the transformations change, e.g., after a `Normalizer.update'.
+    """
 
     def __init__(self, base_model, transformations, *args, **kwargs):
         super().__init__(
@@ -32,6 +40,8 @@ class TransformedModel(AbstractModel):
         )
         self.base_model = base_model
         self.transformations = nn.ModuleList(transformations)
+        self._fused_transform = None
+        self._fused_transform_key = None
 
     @classmethod
     def default(
@@ -95,8 +105,35 @@ class TransformedModel(AbstractModel):
         """Predict next state distribution."""
         return self.predict(state, action[..., : self.dim_action[0]], next_state)
 
+    def fused_transform(self):
+        """Get the fused transformations, or None if they are not all affine."""
+        # The normalizers replace their parameters on update, and in-place changes
+        # (e.g., load_state_dict) increase the tensor versions.
+        key = tuple(
+            (p.data_ptr(), p._version) for p in self.transformations.parameters()
+        )
+        if key != self._fused_transform_key:
+            fused_transform = FusedAffineTransform(self.transformations)
+            self._fused_transform = fused_transform if fused_transform.fused else None
+            self._fused_transform_key = key
+        return self._fused_transform
+
+    def _broadcast_to_heads(self, tensor, prediction):
+        """Broadcast a state or action to the heads of the base model prediction."""
+        if tensor.shape != prediction.shape and hasattr(self.base_model, "num_heads"):
+            return tensor.unsqueeze(-2)
+        return tensor
+
     def scale(self, state, action):
         """Get epistemic scale of model."""
+        fused_transform = self.fused_transform()
+        if fused_transform is not None:
+            scale = self.base_model.scale(
+                fused_transform.forward("state", state),
+                fused_transform.forward("action", action),
+            )
+            return fused_transform.inverse_scale_tril("next_state", scale)
+
         none = torch.tensor(0)
         obs = Observation(state, action, none, none, none, none, none, none, none, none)
         for transformation in self.transformations:
@@ -125,6 +162,10 @@ class TransformedModel(AbstractModel):
 
     def predict(self, state, action, next_state=None):
         """Get next_state distribution."""
+        fused_transform = self.fused_transform()
+        if fused_transform is not None:
+            return self._fused_predict(fused_transform, state, action, next_state)
+
         none = torch.tensor(0)
         if next_state is None:
             next_state = none
@@ -148,8 +189,8 @@ class TransformedModel(AbstractModel):
             raise ValueError(f"{self.model_kind} not in {self.allowed_model_kind}")
 
         # Back-transform
-        if obs.state.shape != next_state[0].shape and isinstance(
-            self.base_model, EnsembleModel
+        if obs.state.shape != next_state[0].shape and hasattr(
+            self.base_model, "num_heads"
         ):
             state = obs.state.unsqueeze(-2).repeat_interleave(
                 self.base_model.num_heads, -2
@@ -185,6 +226,38 @@ class TransformedModel(AbstractModel):
         elif self.model_kind == "termination":
             return obs.done
 
+    def _fused_predict(self, fused_transform, state, action, next_state=None):
+        """Get the prediction transforming only the attributes that are used.
+
+        The dynamical models do not use the next state, hence it is only transformed
+        if given.
+        """
+        state, action = to_torch(state), to_torch(action)
+        transformed_state = fused_transform.forward("state", state)
+        transformed_action = fused_transform.forward("action", action)
+        if next_state is None and self.model_kind != "dynamics":
+            next_state = torch.tensor(0)
+        if next_state is not None:
+            next_state = fused_transform.forward(
+                "next_state", to_torch(next_state), state
+            )
+        prediction = self.base_model(transformed_state, transformed_action, next_state)
+
+        if self.model_kind == "dynamics":
+            mean, scale_tril = prediction
+            mean = fused_transform.inverse(
+                "next_state", mean, self._broadcast_to_heads(state, mean)
+            )
+            return mean, fused_transform.inverse_scale_tril("next_state", scale_tril)
+        elif self.model_kind == "rewards":
+            mean, scale_tril = prediction
+            mean = fused_transform.inverse("reward", mean)
+            return mean, fused_transform.inverse_scale_tril("reward", scale_tril)
+        elif self.model_kind == "termination":
+            return prediction
+        else:
+            raise ValueError(f"{self.model_kind} not in {self.allowed_model_kind}")
+
     @torch.jit.export
     def set_head(self, head_ptr: int):
         """Set ensemble head."""
@@ -1,9 +1,10 @@
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
 import torch.nn as nn
 from torch import Tensor
 
 from rllib.dataset.datatypes import TupleDistribution
+from rllib.dataset.transforms.fused_transform import FusedAffineTransform
 
 from .abstract_model import AbstractModel
 
@@ -11,6 +12,8 @@ class TransformedModel(AbstractModel):
 
     base_model: AbstractModel
     transformations: nn.ModuleList
+    _fused_transform: Optional[FusedAffineTransform]
+    _fused_transform_key: Optional[Tuple]
     def __init__(
         self,
         base_model: AbstractModel,
@@ -24,3 +27,12 @@ class TransformedModel(AbstractModel):
     def predict(
         self, state: Tensor, action: Tensor, next_state: Optional[Tensor] = ...
     ) -> TupleDistribution: ...
+    def fused_transform(self) -> Optional[FusedAffineTransform]: ...
+    def _broadcast_to_heads(self, tensor: Tensor, prediction: Tensor) -> Tensor: ...
+    def _fused_predict(
+        self,
+        fused_transform: FusedAffineTransform,
+        state: Tensor,
+        action: Tensor,
+        next_state: Optional[Tensor] = ...,
+    ) -> TupleDistribution: ...
@@ -28,6 +28,10 @@ class NNPolicy(AbstractPolicy):
         Module with which to transform inputs.
     jit_compile: bool.
         Flag that indicates whether to compile or not the neural network.
+    diagonal_scale: bool, optional (default=False).
+        Flag that indicates whether the network returns the diagonal of the scale as
+        a vector. Then, the policy distributions are Independent Normal distributions
+        instead of MultivariateNormal ones.
     """
 
     def __init__(
@@ -39,11 +43,15 @@ class NNPolicy(AbstractPolicy):
         initial_scale=0.5,
         input_transform=None,
         jit_compile=False,
+        diagonal_scale=False,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.input_transform = input_transform
+        self.diagonal_scale = diagonal_scale and not self.discrete_action
+        if self.diagonal_scale:
+            self.dist_params.update(diagonal=True)
         in_dim = self._preprocess_input_dim()
 
         if self.discrete_action:
@@ -63,6 +71,7 @@ class NNPolicy(AbstractPolicy):
                 biased_head=biased_head,
                 squashed_output=squashed_output,
                 initial_scale=initial_scale,
+                diagonal_scale=diagonal_scale,
             )
         if jit_compile:
             self.nn = torch.jit.script(self.nn)
@@ -85,6 +94,7 @@ class NNPolicy(AbstractPolicy):
             action_scale=other.action_scale,
             goal=other.goal,
             input_transform=other.input_transform,
+            diagonal_scale=other.diagonal_scale,
         )
         new.nn = other.nn.__class__.from_other(other.nn, copy=copy)
         return new
@@ -157,7 +167,8 @@ class NNPolicy(AbstractPolicy):
         if self.deterministic and not self.discrete_action:
             mean = out[0]
             dim = mean.shape[-1]
-            return mean, torch.zeros(dim, dim)
+            # Expand the zero matrix, so that it is not mistaken for a diagonal scale.
+            return mean, torch.zeros(dim, dim).expand(mean.shape + (dim,))
         else:
             return out
 
@@ -192,6 +203,7 @@ class FelixPolicy(NNPolicy):
             self.nn.kwargs["in_dim"],
             self.nn.kwargs["out_dim"],
             initial_scale=kwargs.get("initial_scale", 0.5),
+            diagonal_scale=self.diagonal_scale,
         )
         if jit_compile:
             self.nn = torch.jit.script(self.nn)
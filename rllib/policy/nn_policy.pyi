@@ -13,6 +13,7 @@ T = TypeVar("T", bound="NNPolicy")
 class NNPolicy(AbstractPolicy):
     input_transform: Optional[AbstractTransform]
     nn: torch.nn.Module
+    diagonal_scale: bool
     def __init__(
         self,
         layers: Sequence[int] = ...,
@@ -22,6 +23,7 @@ class NNPolicy(AbstractPolicy):
         initial_scale: float = ...,
         input_transform: Optional[AbstractTransform] = ...,
         jit_compile: bool = ...,
+        diagonal_scale: bool = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
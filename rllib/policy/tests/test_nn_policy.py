@@ -1,7 +1,7 @@
 import pytest
 import torch
 import torch.nn as nn
-from torch.distributions import Categorical, MultivariateNormal
+from torch.distributions import Categorical, Independent, MultivariateNormal
 
 from rllib.policy import FelixPolicy, NNPolicy
 from rllib.util.distributions import Delta
@@ -215,6 +215,30 @@ class TestMLPPolicy(object):
 
         assert not torch.any(other_pi.mean == pi.mean)
 
+    def test_diagonal_scale(self, dim_state, dim_action, batch_size):
+        self.init(False, False, dim_state, dim_action)
+        policy = NNPolicy(
+            dim_state=self.dim_state,
+            dim_action=self.dim_action,
+            layers=[32, 32],
+            diagonal_scale=True,
+        )
+        policy.load_state_dict(self.policy.state_dict())
+        assert policy.dist_params["diagonal"]
+        assert NNPolicy.from_other(policy).diagonal_scale
+
+        state = random_tensor(False, dim_state, batch_size)
+        pi = tensor_to_distribution(policy(state), **policy.dist_params)
+        dense_pi = tensor_to_distribution(self.policy(state))
+        assert isinstance(pi, Independent)
+        action = pi.sample()
+        torch.testing.assert_close(pi.log_prob(action), dense_pi.log_prob(action))
+
+        policy.deterministic = True
+        pi = tensor_to_distribution(policy(state), **policy.dist_params)
+        assert isinstance(pi, Delta)
+        assert pi.sample().shape == action.shape
+
     def test_from_other(self, discrete_state, discrete_action, dim_state, dim_action):
         self.init(discrete_state, discrete_action, dim_state, dim_action)
         _test_from_other(self.policy, NNPolicy)
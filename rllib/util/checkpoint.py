@@ -0,0 +1,191 @@
+"""Incremental and asynchronous checkpoints of agents."""
+import copy
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from rllib.dataset.datatypes import Observation
+
+
+class ReplayBufferChunks(object):
+    """Append-only chunk files that persist an experience replay buffer.
+
+    Each chunk stores the memory slots written since the previous chunk, hence
+    saving the buffer only costs the new transitions. The rest of the buffer state
+    (valid flags, weights, counters) is small and it is pickled entirely every time.
+    A full chunk is written, and the previous chunks are deleted, when the buffer is
+    reset or re-allocated, or when the chunks written after the last full chunk hold
+    more slots than the buffer. Hence, the files hold at most twice the buffer.
+
+    Parameters
+    ----------
+    directory: str.
+        Directory where the chunk files are saved.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.chunks = []
+        self.num_chunks = 0
+        self._memory = None
+        self._data_count = 0
+        self._num_slots = 0
+
+    def snapshot(self, buffer):
+        """Gather the slots of the buffer written since the last snapshot.
+
+        The returned snapshot is a copy of the data, hence it can be written while
+        the buffer keeps changing.
+        """
+        state = copy.deepcopy(
+            {key: value for key, value in buffer.__dict__.items() if key != "memory"}
+        )
+        if buffer.memory is None:
+            idx = None
+            full = True
+        else:
+            start, end = self._data_count, buffer.data_count + buffer.num_memory_steps
+            full = (
+                buffer.memory is not self._memory
+                or buffer.data_count < self._data_count
+                or self._num_slots + end - start > buffer.max_len
+            )
+            if full:
+                start, end = 0, buffer.max_len
+            idx = torch.arange(start, end) % buffer.max_len
+
+        if full:
+            self.chunks, self._num_slots = [], 0
+        if idx is not None and len(idx):
+            self.chunks.append(f"chunk_{self.num_chunks:06d}.pt")
+            self.num_chunks += 1
+            if not full:
+                self._num_slots += len(idx)
+            rows = tuple(column[idx].clone() for column in buffer.memory)
+            chunk = (self.chunks[-1], idx, rows)
+        else:
+            chunk = None
+
+        self._memory = buffer.memory
+        self._data_count = buffer.data_count
+        return {"state": state, "chunk": chunk, "chunks": list(self.chunks)}
+
+    def write(self, snapshot):
+        """Write a snapshot to the chunk files."""
+        os.makedirs(self.directory, exist_ok=True)
+        if snapshot["chunk"] is not None:
+            name, idx, rows = snapshot["chunk"]
+            _atomic_save({"idx": idx, "rows": rows}, f"{self.directory}/{name}")
+        with open(f"{self.directory}/state.pkl.tmp", "wb") as f:
+            pickle.dump({"state": snapshot["state"], "chunks": snapshot["chunks"]}, f)
+        os.replace(f"{self.directory}/state.pkl.tmp", f"{self.directory}/state.pkl")
+        for name in os.listdir(self.directory):
+            if name.startswith("chunk_") and name not in snapshot["chunks"]:
+                os.remove(f"{self.directory}/{name}")
+
+    @staticmethod
+    def load(buffer, directory):
+        """Load a buffer inplace from the chunk files in a directory."""
+        with open(f"{directory}/state.pkl", "rb") as f:
+            saved = pickle.load(f)
+        buffer.__dict__.update(saved["state"])
+        buffer.memory = None
+        for name in saved["chunks"]:
+            chunk = torch.load(f"{directory}/{name}")
+            if buffer.memory is None:
+                buffer.memory = buffer._allocate_memory(
+                    Observation(*map(lambda x: x[0], chunk["rows"]))
+                )
+            for column, rows in zip(buffer.memory, chunk["rows"]):
+                column[chunk["idx"]] = rows
+
+
+class Checkpointer(object):
+    """Save checkpoints of an agent, optionally from a background thread.
+
+    The replay buffers are saved with ReplayBufferChunks in a directory named after
+    the attribute, next to the checkpoint file. The other parameters are saved with
+    `torch.save'.
+
+    Parameters
+    ----------
+    asynchronous: bool, optional.
+        Flag that indicates whether to write the files from a background thread.
+        The data is copied before the method returns.
+    """
+
+    def __init__(self, asynchronous=False):
+        self.asynchronous = asynchronous
+        self._executor = None
+        self._buffer_chunks = dict()
+
+    def save(self, params, buffers, path):
+        """Save a checkpoint.
+
+        Parameters
+        ----------
+        params: dict.
+            Parameters to save in the checkpoint file.
+        buffers: dict.
+            Replay buffers to save incrementally, indexed by attribute name.
+        path: str.
+            Path of the checkpoint file.
+        """
+        directory = os.path.dirname(path)
+        snapshots = {}
+        for key, buffer in buffers.items():
+            buffer_directory = f"{directory}/{key}"
+            if buffer_directory not in self._buffer_chunks:
+                self._buffer_chunks[buffer_directory] = ReplayBufferChunks(
+                    buffer_directory
+                )
+            chunks = self._buffer_chunks[buffer_directory]
+            snapshots[buffer_directory] = (chunks, chunks.snapshot(buffer))
+
+        params = dict(params, replay_buffers=list(buffers))
+        if not self.asynchronous:
+            return self._write(params, snapshots, path)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._executor.submit(self._write, copy.deepcopy(params), snapshots, path)
+
+    @staticmethod
+    def _write(params, snapshots, path):
+        """Write the checkpoint files."""
+        for chunks, snapshot in snapshots.values():
+            chunks.write(snapshot)
+        _atomic_save(params, path)
+
+    def flush(self):
+        """Wait until all the pending checkpoints are written."""
+        if self._executor is not None:
+            self._executor.submit(lambda: None).result()
+
+    def close(self):
+        """Write the pending checkpoints and stop the background thread."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def load_buffer(buffer, key, path):
+        """Load a replay buffer saved next to the checkpoint file at path."""
+        ReplayBufferChunks.load(buffer, f"{os.path.dirname(path)}/{key}")
+
+    def __getstate__(self):
+        """Get the state of the checkpointer without the background thread."""
+        self.flush()
+        return {"asynchronous": self.asynchronous}
+
+    def __setstate__(self, state):
+        """Set the state of the checkpointer."""
+        self.__init__(**state)
+
+
+def _atomic_save(obj, path):
+    """Save an object with `torch.save' and atomically move it to path."""
+    torch.save(obj, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.experience_replay import ExperienceReplay
+
+class ReplayBufferChunks(object):
+    directory: str
+    chunks: List[str]
+    num_chunks: int
+    _memory: Optional[Observation]
+    _data_count: int
+    _num_slots: int
+    def __init__(self, directory: str) -> None: ...
+    def snapshot(self, buffer: ExperienceReplay) -> Dict[str, Any]: ...
+    def write(self, snapshot: Dict[str, Any]) -> None: ...
+    @staticmethod
+    def load(buffer: ExperienceReplay, directory: str) -> None: ...
+
+class Checkpointer(object):
+    asynchronous: bool
+    _executor: Optional[ThreadPoolExecutor]
+    _buffer_chunks: Dict[str, ReplayBufferChunks]
+    def __init__(self, asynchronous: bool = ...) -> None: ...
+    def save(
+        self,
+        params: Dict[str, Any],
+        buffers: Dict[str, ExperienceReplay],
+        path: str,
+    ) -> None: ...
+    @staticmethod
+    def _write(
+        params: Dict[str, Any],
+        snapshots: Dict[str, Tuple[ReplayBufferChunks, Dict[str, Any]]],
+        path: str,
+    ) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    @staticmethod
+    def load_buffer(buffer: ExperienceReplay, key: str, path: str) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
+
+def _atomic_save(obj: Any, path: str) -> None: ...
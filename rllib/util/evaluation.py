@@ -0,0 +1,252 @@
+"""Evaluation of agents in parallel with their training."""
+import copy
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.stats
+import torch
+import torch.multiprocessing as mp
+
+from rllib.util.utilities import set_random_seed, tensor_to_distribution
+
+_ENVIRONMENT = None
+
+
+def _init_worker(environment_fn):
+    """Construct the environment of an evaluation worker."""
+    global _ENVIRONMENT
+    torch.set_num_threads(1)
+    _ENVIRONMENT = environment_fn()
+
+
+def _evaluate_worker(policy, num_episodes, max_steps, seed=None):
+    """Evaluate a policy in the environment of an evaluation worker."""
+    return evaluate_policy(_ENVIRONMENT, policy, num_episodes, max_steps, seed)
+
+
+def _act(policy, state):
+    """Get the action of a policy as an agent in evaluation mode."""
+    state = torch.tensor(state, dtype=torch.get_default_dtype())
+    pi = tensor_to_distribution(policy(state), **policy.dist_params)
+    if pi.has_enumerate_support:
+        action = torch.argmax(pi.probs, dim=-1)
+    else:
+        try:
+            action = pi.mean
+        except NotImplementedError:
+            action = pi.sample((100,)).mean(dim=0)
+
+    if not policy.discrete_action:
+        action = policy.action_scale * action.clamp(-1.0, 1.0)
+    return action.detach().numpy()
+
+
+def evaluate_policy(environment, policy, num_episodes, max_steps, seed=None):
+    """Evaluate a policy in an environment.
+
+    Parameters
+    ----------
+    environment: AbstractEnvironment.
+        Environment in which to evaluate the policy.
+    policy: AbstractPolicy.
+        Policy to evaluate. It acts as an agent in evaluation mode.
+    num_episodes: int.
+        Number of episodes to evaluate.
+    max_steps: int.
+        Maximum number of steps per episode.
+    seed: int, optional.
+        Seed of the global random generators during the evaluation.
+
+    Returns
+    -------
+    returns: ndarray.
+        Array of returns with shape [num_episodes, dim_reward].
+    """
+    if seed is not None:
+        set_random_seed(seed)
+    returns = []
+    with torch.no_grad():
+        for _ in range(num_episodes):
+            state = environment.reset()
+            policy.set_goal(environment.goal)
+            policy.reset()
+            episode_return = 0.0
+            for _ in range(max_steps):
+                action = _act(policy, state)
+                try:
+                    state, reward, done, info = environment.step(action)
+                except TypeError:
+                    state, reward, done, info = environment.step(action.item())
+                episode_return = episode_return + np.atleast_1d(reward)
+                if done:
+                    break
+            returns.append(episode_return)
+    return np.stack(returns)
+
+
+class EvaluationService(object):
+    """Service that evaluates snapshots of the policy of an agent in parallel.
+
+    At every `submit', the policy of the agent is copied and evaluated during
+    `num_episodes' episodes, split among worker processes that own a copy of the
+    environment each. The training loop is not blocked: `collect' logs the results
+    of the finished evaluations, in submission order, as an entry of the logger of the
+    agent with the mean return (`eval_return'), its standard deviation
+    (`eval_return_std') and the half-width of its confidence interval
+    (`eval_return_ci') for each reward. The number of training episodes of the
+    evaluated snapshot is logged as `eval_train_episodes'.
+
+    If the agent saves checkpoints and the mean return of a snapshot is the best one
+    logged, the agent is saved to `best.pkl' with the evaluated policy.
+
+    Parameters
+    ----------
+    environment_fn: Callable[[], AbstractEnvironment].
+        Function that constructs an environment. It is called once in each worker.
+    num_episodes: int, optional.
+        Number of episodes of each evaluation.
+    max_steps: int, optional.
+        Maximum number of steps per episode.
+    num_workers: int, optional.
+        Number of worker processes. By default, the number of cpus.
+        If it is zero, the evaluations are run synchronously at `submit'.
+    seed: int, optional.
+        Random seed of the evaluations. By default, the evaluations are not seeded.
+    confidence: float, optional.
+        Confidence level of the interval of the mean return.
+
+    Examples
+    --------
+    >>> from rllib.agent import RandomAgent
+    >>> from rllib.environment.mdps import EasyGridWorld
+    >>> environment = EasyGridWorld()
+    >>> agent = RandomAgent.default(environment)
+    >>> service = EvaluationService(EasyGridWorld, num_episodes=4, num_workers=0)
+    >>> service.submit(agent)
+    >>> service.collect(agent, wait=True)
+    >>> len(agent.logger.get("eval_return-0"))
+    1
+    >>> service.close()
+    >>> agent.logger.delete_directory()
+    """
+
+    def __init__(
+        self,
+        environment_fn,
+        num_episodes=10,
+        max_steps=1000,
+        num_workers=None,
+        seed=None,
+        confidence=0.95,
+    ):
+        self.environment_fn = environment_fn
+        self.num_episodes = num_episodes
+        self.max_steps = max_steps
+        self.num_workers = mp.cpu_count() if num_workers is None else num_workers
+        self.seed = seed
+        self.confidence = confidence
+        self.num_evaluations = 0
+        self._executor = None
+        self._environment = None
+        self._pending = deque()
+
+    def _split_episodes(self):
+        """Split the episodes of an evaluation among the workers.
+
+        Returns a list with the index of the first episode and the number of episodes
+        of each task.
+        """
+        num_tasks = max(1, min(self.num_workers, self.num_episodes))
+        episodes = np.array_split(np.arange(self.num_episodes), num_tasks)
+        return [(int(x[0]), len(x)) for x in episodes]
+
+    def submit(self, agent):
+        """Evaluate a snapshot of the current policy of an agent."""
+        policy = copy.deepcopy(agent.policy).to("cpu")
+        tasks, seed = [], None
+        for start, num_episodes in self._split_episodes():
+            if self.seed is not None:
+                seed = self.seed + self.num_episodes * self.num_evaluations + start
+            tasks.append((policy, num_episodes, self.max_steps, seed))
+        self.num_evaluations += 1
+
+        if self.num_workers == 0:
+            if self._environment is None:
+                self._environment = self.environment_fn()
+            returns = [evaluate_policy(self._environment, *task) for task in tasks]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.num_workers,
+                    initializer=_init_worker,
+                    initargs=(self.environment_fn,),
+                )
+            returns = [self._executor.submit(_evaluate_worker, *task) for task in tasks]
+        self._pending.append((agent.train_episodes, policy, returns))
+
+    def collect(self, agent, wait=False):
+        """Log the results of the finished evaluations.
+
+        Parameters
+        ----------
+        agent: AbstractAgent.
+            Agent whose logger receives the results.
+        wait: bool, optional.
+            Flag that indicates whether to wait for all the pending evaluations.
+        """
+        while self._pending:
+            train_episodes, policy, returns = self._pending[0]
+            if not wait and not all(
+                isinstance(x, np.ndarray) or x.done() for x in returns
+            ):
+                break
+            self._pending.popleft()
+            returns = np.concatenate(
+                [x if isinstance(x, np.ndarray) else x.result() for x in returns]
+            )
+            self._log(agent, train_episodes, policy, returns)
+
+    def _log(self, agent, train_episodes, policy, returns):
+        """Log the statistics of the returns of an evaluation."""
+        mean = returns.mean(0)
+        std = returns.std(0, ddof=1) if len(returns) > 1 else np.zeros_like(mean)
+        t = scipy.stats.t.ppf((1 + self.confidence) / 2, df=max(len(returns) - 1, 1))
+        statistics = {"eval_train_episodes": train_episodes}
+        for i in range(len(mean)):
+            statistics[f"eval_return-{i}"] = float(mean[i])
+            statistics[f"eval_return_std-{i}"] = float(std[i])
+            statistics[f"eval_return_ci-{i}"] = float(
+                t * std[i] / np.sqrt(len(returns))
+            )
+        agent.counters["eval_episodes"] += len(returns)
+        agent.logger.end_episode(**statistics)
+
+        if agent.checkpoint_frequency > 0 and mean[0] >= max(
+            agent.logger.get("train_return-0") + agent.logger.get("eval_return-0")
+        ):
+            state_dict = copy.deepcopy(agent.policy.state_dict())
+            agent.policy.load_state_dict(policy.state_dict())
+            agent.save_checkpoint("best.pkl")
+            agent.policy.load_state_dict(state_dict)
+
+    def close(self):
+        """Stop the worker processes and discard the pending evaluations."""
+        for _, _, returns in self._pending:
+            for future in returns:
+                if not isinstance(future, np.ndarray):
+                    future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._environment is not None:
+            self._environment.close()
+            self._environment = None
+
+    def __del__(self):
+        """Stop the worker processes when the service is garbage collected."""
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,56 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, List, Optional, Tuple, Union
+
+from numpy import ndarray
+
+from rllib.agent import AbstractAgent
+from rllib.dataset.datatypes import State
+from rllib.environment import AbstractEnvironment
+from rllib.policy import AbstractPolicy
+
+_ENVIRONMENT: Optional[AbstractEnvironment]
+
+def _init_worker(environment_fn: Callable[[], AbstractEnvironment]) -> None: ...
+def _evaluate_worker(
+    policy: AbstractPolicy, num_episodes: int, max_steps: int, seed: Optional[int] = ...
+) -> ndarray: ...
+def _act(policy: AbstractPolicy, state: State) -> ndarray: ...
+def evaluate_policy(
+    environment: AbstractEnvironment,
+    policy: AbstractPolicy,
+    num_episodes: int,
+    max_steps: int,
+    seed: Optional[int] = ...,
+) -> ndarray: ...
+
+class EvaluationService(object):
+    environment_fn: Callable[[], AbstractEnvironment]
+    num_episodes: int
+    max_steps: int
+    num_workers: int
+    seed: Optional[int]
+    confidence: float
+    num_evaluations: int
+    _executor: Optional[ProcessPoolExecutor]
+    _environment: Optional[AbstractEnvironment]
+    _pending: Deque[Tuple[int, AbstractPolicy, List[Union[ndarray, Future]]]]
+    def __init__(
+        self,
+        environment_fn: Callable[[], AbstractEnvironment],
+        num_episodes: int = ...,
+        max_steps: int = ...,
+        num_workers: Optional[int] = ...,
+        seed: Optional[int] = ...,
+        confidence: float = ...,
+    ) -> None: ...
+    def _split_episodes(self) -> List[Tuple[int, int]]: ...
+    def submit(self, agent: AbstractAgent) -> None: ...
+    def collect(self, agent: AbstractAgent, wait: bool = ...) -> None: ...
+    def _log(
+        self,
+        agent: AbstractAgent,
+        train_episodes: int,
+        policy: AbstractPolicy,
+        returns: ndarray,
+    ) -> None: ...
+    def close(self) -> None: ...
@@ -0,0 +1,166 @@
+"""Scoped memoization of the forward passes of modules."""
+import threading
+from itertools import chain
+
+import torch
+
+_ACTIVE = threading.local()
+
+
+def _detach(output):
+    """Detach the tensors of the output of a module."""
+    if isinstance(output, torch.Tensor):
+        return output.detach()
+    elif isinstance(output, tuple):
+        return tuple(_detach(x) for x in output)
+    return output
+
+
+def _argument_key(argument):
+    """Get a key that identifies an argument and changes if it is modified."""
+    if isinstance(argument, torch.Tensor):
+        return id(argument), argument._version
+    try:
+        hash(argument)
+    except TypeError:
+        return id(argument)
+    return argument
+
+
+class _CacheEntry(object):
+    """Output of a forward pass, with references to its inputs."""
+
+    def __init__(self, inputs, output, graph):
+        self.inputs = inputs  # Keep the inputs alive so their ids are not reused.
+        self.output = output
+        self.graph = graph
+        self._detached = None
+
+    @property
+    def detached(self):
+        """Get the output detached from the computation graph."""
+        if self._detached is None:
+            self._detached = _detach(self.output) if self.graph else self.output
+        return self._detached
+
+
+class ForwardCache(object):
+    """Context manager that memoizes the forward passes of modules.
+
+    Inside the context, calling a module twice with the same tensors returns the
+    output of the first call. The entries are keyed by the identity and version of
+    the input tensors and by the version of the parameters and buffers of the
+    module, so that in-place modifications of the inputs or an optimizer step
+    invalidate them. The distributions built from a cached output with
+    `tensor_to_distribution' are cached as well.
+
+    An output computed without gradients is not reused where gradients are
+    required. An output computed with gradients is reused detached where they are
+    not required.
+
+    The forward passes must be deterministic functions of their inputs, of the
+    tensors of the module, and of its `training' and `deterministic' flags.
+
+    Parameters
+    ----------
+    modules: nn.Module.
+        Modules whose forward passes are memoized. None values are ignored.
+
+    Examples
+    --------
+    >>> import torch.nn as nn
+    >>> module = nn.Linear(4, 2)
+    >>> x = torch.randn(8, 4)
+    >>> with ForwardCache(module):
+    ...     module(x) is module(x)
+    True
+    """
+
+    def __init__(self, *modules):
+        self.modules = []
+        for module in modules:
+            if module is not None and all(module is not m for m in self.modules):
+                self.modules.append(module)
+        self._patched = []
+        self._outputs = {}
+        self._distributions = {}
+
+    @staticmethod
+    def active():
+        """Get the innermost active cache of the current thread, if any."""
+        stack = getattr(_ACTIVE, "stack", None)
+        return stack[-1] if stack else None
+
+    def _wrap(self, module):
+        """Memoize the forward pass of a module."""
+        forward = module.forward
+
+        def cached_forward(*args, **kwargs):
+            tensors = list(chain(module.parameters(), module.buffers()))
+            key = (
+                module.training,
+                getattr(module, "deterministic", None),
+                tuple((tensor.data_ptr(), tensor._version) for tensor in tensors),
+                tuple(_argument_key(x) for x in args),
+                tuple(sorted((k, _argument_key(v)) for k, v in kwargs.items())),
+            )
+            graph = torch.is_grad_enabled() and any(
+                tensor.requires_grad
+                for tensor in chain(
+                    tensors, (x for x in args if isinstance(x, torch.Tensor))
+                )
+            )
+            entry = self._outputs.get(key)
+            if entry is not None and (entry.graph or not graph):
+                return entry.output if graph else entry.detached
+            output = forward(*args, **kwargs)
+            self._outputs[key] = _CacheEntry((args, kwargs), output, graph)
+            return output
+
+        return cached_forward
+
+    def distribution(self, args, kwargs, build):
+        """Get the distribution built from the output of a module.
+
+        Parameters
+        ----------
+        args: Union[Tuple[Tensor], Tensor].
+            Output of a module.
+        kwargs: dict.
+            Keyword arguments of the distribution.
+        build: Callable[[], Distribution].
+            Function that builds the distribution if it is not cached.
+        """
+        key = (
+            id(args),
+            tuple(_argument_key(x) for x in args)
+            if isinstance(args, tuple)
+            else _argument_key(args),
+            tuple(sorted((k, _argument_key(v)) for k, v in kwargs.items())),
+        )
+        entry = self._distributions.get(key)
+        if entry is None or entry[0] is not args:
+            entry = (args, build())
+            self._distributions[key] = entry
+        return entry[1]
+
+    def __enter__(self):
+        """Memoize the forward passes of the modules."""
+        for module in self.modules:
+            if isinstance(module, torch.jit.ScriptModule) or "forward" in vars(module):
+                continue  # Scripted or already memoized by an enclosing cache.
+            module.forward = self._wrap(module)
+            self._patched.append(module)
+        if not hasattr(_ACTIVE, "stack"):
+            _ACTIVE.stack = []
+        _ACTIVE.stack.append(self)
+        return self
+
+    def __exit__(self, *args):
+        """Restore the forward passes and clear the cache."""
+        _ACTIVE.stack.remove(self)
+        for module in self._patched:
+            del module.forward
+        self._patched = []
+        self._outputs.clear()
+        self._distributions.clear()
@@ -0,0 +1,29 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import torch.nn as nn
+from torch import Tensor
+from torch.distributions import Distribution
+
+class _CacheEntry(object):
+    inputs: Tuple[Tuple, Dict[str, Any]]
+    output: Any
+    graph: bool
+    def __init__(
+        self, inputs: Tuple[Tuple, Dict[str, Any]], output: Any, graph: bool
+    ) -> None: ...
+    @property
+    def detached(self) -> Any: ...
+
+class ForwardCache(object):
+    modules: List[nn.Module]
+    def __init__(self, *modules: Optional[nn.Module]) -> None: ...
+    @staticmethod
+    def active() -> Optional[ForwardCache]: ...
+    def distribution(
+        self,
+        args: Union[Tuple[Tensor, ...], Tensor],
+        kwargs: Dict[str, Any],
+        build: Callable[[], Distribution],
+    ) -> Distribution: ...
+    def __enter__(self) -> ForwardCache: ...
+    def __exit__(self, *args: Any) -> None: ...
@@ -4,9 +4,10 @@ import numpy as np
 import torch
 from gpytorch.lazy import MatmulLazyTensor, delazify, lazify
 from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
+from gpytorch.utils.memoize import add_to_cache
 from scipy.stats.distributions import chi
 
-from .prediction_strategies import SparsePredictionStrategy
+from .prediction_strategies import CholeskyPredictionStrategy, SparsePredictionStrategy
 
 
 class ExactGP(gpytorch.models.ExactGP):
@@ -78,6 +79,42 @@ class ExactGP(gpytorch.models.ExactGP):
         covar_x = self.covar_module(x)
         return gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
 
+    def add_data(self, new_inputs, new_targets):
+        """Append new data points to the training data.
+
+        If the model was already called in eval mode, the test caches are updated
+        with the new data instead of being recomputed from scratch at the next call.
+        For the exact GP, the Cholesky factor of the kernel matrix is extended with the
+        new rows, which costs O(N^2 M) instead of O((N + M)^3).
+
+        Parameters
+        ----------
+        new_inputs: Tensor
+            Tensor of dimension M x dim_x.
+        new_targets: Tensor
+            Tensor with dimension M.
+        """
+        inputs = torch.cat((self.train_inputs[0], new_inputs), dim=0)
+        targets = torch.cat((self.train_targets, new_targets), dim=-1)
+
+        prediction_strategy = None
+        if self.prediction_strategy is not None and not self.training:
+            with torch.no_grad():
+                prediction_strategy = self._update_prediction_strategy(
+                    new_inputs, new_targets, inputs, targets
+                )
+        self.set_train_data(inputs, targets, strict=False)
+        self.prediction_strategy = prediction_strategy
+
+    def _update_prediction_strategy(self, new_inputs, new_targets, inputs, targets):
+        """Update the prediction strategy with new data points."""
+        strategy = self.prediction_strategy
+        if isinstance(strategy, CholeskyPredictionStrategy):
+            return strategy.update([inputs], self.forward(inputs), targets)
+        return CholeskyPredictionStrategy(
+            [inputs], self.forward(inputs), targets, self.likelihood
+        )
+
 
 class SparseGP(ExactGP):
     r"""Sparse GP Models.
@@ -150,6 +187,42 @@ class SparseGP(ExactGP):
         self.xu = inducing_points
         self.prediction_strategy = None
 
+    def _update_prediction_strategy(self, new_inputs, new_targets, inputs, targets):
+        """Update the prediction strategy with new data points.
+
+        The statistics of the inducing points are sums over the data points, hence
+        only the kernel between the inducing points and the new data is computed.
+        """
+        strategy = self.prediction_strategy
+        m = self.xu.shape[0]
+        output = self.forward(torch.cat((self.xu, new_inputs), dim=0))
+        mu_n, kernel = output.mean[m:], output.lazy_covariance_matrix
+        k_un = delazify(kernel[:m, m:])
+
+        if self.approximation == "FITC":
+            z = k_un.transpose(-2, -1) @ strategy.k_uu_inv_root
+            diag = delazify(kernel[m:, m:]).diag() - (z ** 2).sum(-1)
+            diag = diag + self.likelihood.noise
+        elif self.approximation == "SOR" or self.approximation == "DTC":
+            diag = self.likelihood.noise.expand(new_targets.shape)
+        else:
+            raise NotImplementedError(f"{self.approximation} Not implemented.")
+
+        k_un_diag = k_un / diag
+        prior_dist = strategy.train_prior_dist
+        cov = delazify(prior_dist.lazy_covariance_matrix)
+        cov = cov + k_un_diag @ k_un.transpose(-2, -1)
+
+        new_strategy = SparsePredictionStrategy(
+            train_inputs=self.xu,
+            train_prior_dist=prior_dist.__class__(prior_dist.mean, lazify(cov)),
+            train_labels=strategy.train_labels + k_un_diag @ (new_targets - mu_n),
+            likelihood=self.likelihood,
+            k_uu=strategy.k_uu,
+        )
+        add_to_cache(new_strategy, "k_uu_inv_root", strategy.k_uu_inv_root)
+        return new_strategy
+
     def __call__(self, x):
         """Return GP posterior at location `x'."""
         train_inputs = self.xu
@@ -422,6 +495,25 @@ class RandomFeatureGP(ExactGP):
 
         return gpytorch.distributions.MultivariateNormal(pred_mean, pred_cov)
 
+    def _update_prediction_strategy(self, new_inputs, new_targets, inputs, targets):
+        """Update the prediction strategy with new data points.
+
+        The feature covariance and the labels are sums over the data points, hence
+        only the features of the new data are computed.
+        """
+        strategy = self.prediction_strategy
+        zt = self.forward(new_inputs).transpose(-2, -1)
+        prior_dist = strategy.train_prior_dist
+        cov = delazify(prior_dist.lazy_covariance_matrix) + zt @ zt.transpose(-1, -2)
+        labels = zt @ (new_targets - self.mean_module(new_inputs))
+
+        return DefaultPredictionStrategy(
+            train_inputs=strategy.train_inputs,
+            train_prior_dist=prior_dist.__class__(prior_dist.mean, lazify(cov)),
+            train_labels=strategy.train_labels + labels,
+            likelihood=self.likelihood,
+        )
+
     def forward(self, x):
         """Compute features at location x."""
         z = x @ self.w.transpose(-2, -1) + self.b
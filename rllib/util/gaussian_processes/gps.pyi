@@ -6,6 +6,7 @@ from gpytorch.distributions import MultivariateNormal
 from gpytorch.kernels import Kernel
 from gpytorch.likelihoods import Likelihood
 from gpytorch.means import Mean
+from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
 from torch import Tensor
 
 class ExactGP(gpytorch.models.ExactGP):
@@ -32,6 +33,10 @@ class ExactGP(gpytorch.models.ExactGP):
     @length_scale.setter
     def length_scale(self, new_length_scale: Union[float, Tensor]) -> None: ...
     def forward(self, x: Tensor) -> MultivariateNormal: ...
+    def add_data(self, new_inputs: Tensor, new_targets: Tensor) -> None: ...
+    def _update_prediction_strategy(
+        self, new_inputs: Tensor, new_targets: Tensor, inputs: Tensor, targets: Tensor
+    ) -> Optional[DefaultPredictionStrategy]: ...
 
 class SparseGP(ExactGP):
     def __init__(
@@ -45,6 +50,9 @@ class SparseGP(ExactGP):
         kernel: Optional[Kernel] = None,
     ) -> None: ...
     def set_inducing_points(self, inducing_points: Tensor) -> None: ...
+    def _update_prediction_strategy(
+        self, new_inputs: Tensor, new_targets: Tensor, inputs: Tensor, targets: Tensor
+    ) -> Optional[DefaultPredictionStrategy]: ...
     def forward(self, x: Tensor) -> MultivariateNormal: ...
     def __call__(self, *args: Tensor, **kwargs: Any) -> MultivariateNormal: ...
 
@@ -70,5 +78,8 @@ class RandomFeatureGP(ExactGP):
     def num_features(self, value: int) -> None: ...
     @property
     def scale(self) -> Tensor: ...
+    def _update_prediction_strategy(
+        self, new_inputs: Tensor, new_targets: Tensor, inputs: Tensor, targets: Tensor
+    ) -> Optional[DefaultPredictionStrategy]: ...
     def forward(self, x: Tensor) -> Tensor: ...
     def __call__(self, *args: Tensor, **kwargs: Any) -> MultivariateNormal: ...
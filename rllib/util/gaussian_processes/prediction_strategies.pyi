@@ -1,11 +1,35 @@
-from typing import Optional
+from typing import List, Optional
 
 from gpytorch.distributions import Distribution
+from gpytorch.lazy import LazyTensor
 from gpytorch.likelihoods import Likelihood
 from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
 from gpytorch.utils.memoize import cached
 from torch import Tensor
 
+class CholeskyPredictionStrategy(DefaultPredictionStrategy):
+    cholesky: Tensor
+    def __init__(
+        self,
+        train_inputs: List[Tensor],
+        train_prior_dist: Distribution,
+        train_labels: Tensor,
+        likelihood: Likelihood,
+        cholesky: Optional[Tensor] = ...,
+    ) -> None: ...
+    def update(
+        self,
+        train_inputs: List[Tensor],
+        train_prior_dist: Distribution,
+        train_labels: Tensor,
+    ) -> CholeskyPredictionStrategy: ...
+    @property  # type: ignore
+    @cached(name="mean_cache")
+    def mean_cache(self) -> Tensor: ...
+    def exact_predictive_covar(
+        self, test_test_covar: LazyTensor, test_train_covar: LazyTensor
+    ) -> LazyTensor: ...
+
 class SparsePredictionStrategy(DefaultPredictionStrategy):
     """Prediction strategy for Sparse GPs."""
 
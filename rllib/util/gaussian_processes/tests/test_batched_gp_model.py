@@ -0,0 +1,77 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.dataset.datatypes import Observation
+from rllib.model import ExactGPModel, SparseGPModel
+from rllib.util.training.model_learning import train_exact_gp_type2mll_step
+
+
+def _build_models(dim_state=3, dim_action=2, num_points=20, **kwargs):
+    torch.manual_seed(0)
+    state = torch.randn(num_points, dim_state)
+    action = torch.randn(num_points, dim_action)
+    target = torch.sin(state) + action.sum(-1, keepdim=True)
+    models = [
+        ExactGPModel(state, action, target, batched=batched, **kwargs)
+        for batched in [False, True]
+    ]
+    for model in models:
+        model.eval()
+    return models
+
+
+def _assert_same_prediction(model, batched_model, state, action):
+    mean, scale_tril = model(state, action)
+    batched_mean, batched_scale_tril = batched_model(state, action)
+    torch.testing.assert_close(batched_mean, mean, atol=1e-4, rtol=1e-4)
+    torch.testing.assert_close(batched_scale_tril, scale_tril, atol=1e-4, rtol=1e-4)
+
+
+@pytest.mark.parametrize("batch_shape", [(), (7,), (5, 4)])
+def test_prediction(batch_shape):
+    model, batched_model = _build_models()
+    assert len(batched_model.gp) == 1
+    state, action = torch.randn(batch_shape + (3,)), torch.randn(batch_shape + (2,))
+    _assert_same_prediction(model, batched_model, state, action)
+
+    strategy = batched_model.gp[0].prediction_strategy
+    batched_model(state, action)
+    assert batched_model.gp[0].prediction_strategy is strategy  # Cache is reused.
+
+
+def test_add_data_and_summarize():
+    model, batched_model = _build_models(max_num_points=15)
+    state, action = torch.randn(10, 3), torch.randn(10, 2)
+    test_state, test_action = torch.randn(7, 3), torch.randn(7, 2)
+    for m in [model, batched_model]:
+        m(test_state, test_action)  # Build the test caches.
+        m.add_data(state, action, torch.cos(state))
+    _assert_same_prediction(model, batched_model, test_state, test_action)
+
+    batched_model.summarize_gp()
+    assert batched_model.gp[0].train_inputs[0].shape == (15, 5)
+    assert batched_model.train_targets.shape == (3, 15)
+    mean, scale_tril = batched_model(test_state, test_action)
+    assert mean.shape == (7, 3)
+    assert torch.isfinite(scale_tril).all()
+
+
+def test_train_step():
+    model, batched_model = _build_models()
+    observation = Observation(
+        state=model.gp[0].train_inputs[0][:, None, :3],
+        action=model.gp[0].train_inputs[0][:, None, 3:],
+    )
+    losses = []
+    for m in [model, batched_model]:
+        m.train()
+        optimizer = torch.optim.SGD(m.parameters(), lr=0.0)
+        losses.append(train_exact_gp_type2mll_step(m, observation, optimizer))
+    torch.testing.assert_close(losses[0], losses[1])
+
+
+def test_not_implemented():
+    state, action = torch.randn(10, 3), torch.randn(10, 2)
+    with pytest.raises(NotImplementedError):
+        SparseGPModel(state=state, action=action, target=state, batched=True)
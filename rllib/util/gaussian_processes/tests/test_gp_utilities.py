@@ -0,0 +1,104 @@
+import gpytorch
+import pytest
+import torch
+
+from rllib.util.gaussian_processes import ExactGP, RandomFeatureGP, SparseGP
+from rllib.util.gaussian_processes.utilities import add_data_to_gp, summarize_gp
+
+
+def _build_gp(gp_type, train_x, train_y):
+    likelihood = gpytorch.likelihoods.GaussianLikelihood()
+    likelihood.noise = 0.01
+    if gp_type == "Exact":
+        gp = ExactGP(train_x, train_y, likelihood)
+    elif gp_type == "RFF":
+        gp = RandomFeatureGP(train_x, train_y, likelihood, num_features=64)
+    else:
+        gp = SparseGP(
+            train_x,
+            train_y,
+            likelihood,
+            inducing_points=train_x[:8],
+            approximation=gp_type,
+        )
+    gp.eval()
+    return gp
+
+
+@pytest.fixture(params=["Exact", "RFF", "DTC", "SOR", "FITC"])
+def gp_type(request):
+    return request.param
+
+
+def test_add_data_to_gp(gp_type):
+    torch.manual_seed(0)
+    train_x, new_x, test_x = torch.randn(20, 2), torch.randn(5, 2), torch.randn(7, 2)
+    train_y, new_y = torch.sin(train_x).sum(-1), torch.sin(new_x).sum(-1)
+
+    gp = _build_gp(gp_type, train_x, train_y)
+    gp(test_x)  # Build the test caches.
+    add_data_to_gp(gp, new_x[:2], new_y[:2])
+    assert gp.prediction_strategy is not None
+    add_data_to_gp(gp, new_x[2:], new_y[2:])  # Update the updated caches.
+    assert gp.prediction_strategy is not None
+    assert gp.train_inputs[0].shape == (25, 2)
+    assert gp.train_targets.shape == (25,)
+
+    expected = _build_gp(gp_type, gp.train_inputs[0], gp.train_targets)
+    if gp_type == "RFF":
+        expected.w, expected.b = gp.w, gp.b
+    incremental, refit = gp(test_x), expected(test_x)
+
+    torch.testing.assert_close(incremental.mean, refit.mean, atol=1e-3, rtol=1e-3)
+    torch.testing.assert_close(
+        incremental.variance, refit.variance, atol=1e-3, rtol=1e-3
+    )
+
+
+def test_add_data_to_gp_without_caches():
+    train_x, new_x = torch.randn(20, 2), torch.randn(5, 2)
+    gp = _build_gp("Exact", train_x, train_x.sum(-1))
+    add_data_to_gp(gp, new_x, new_x.sum(-1))
+    assert gp.prediction_strategy is None
+    assert gp.train_inputs[0].shape == (25, 2)
+
+
+def _summarize_gp_by_refitting(gp_model, max_num_points):
+    inputs, targets = gp_model.train_inputs[0], gp_model.train_targets
+    indexes = [0]
+    gp_model.set_train_data(inputs[:1], targets[:1], strict=False)
+    for _ in range(max_num_points - 1):
+        pred_var = gp_model(inputs).variance
+        pred_var[indexes] = -float("inf")
+        indexes.append(int(torch.argmax(pred_var)))
+        gp_model.set_train_data(inputs[indexes], targets[indexes], strict=False)
+    return indexes
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_summarize_gp(weighted):
+    torch.manual_seed(0)
+    train_x = torch.randn(50, 2)
+    train_y = torch.sin(train_x).sum(-1)
+    test_x = torch.randn(7, 2)
+    weight_function = (lambda x: torch.exp(-x.sum(-1))) if weighted else None
+
+    gp = _build_gp("Exact", train_x, train_y)
+    summarize_gp(gp, max_num_points=10, weight_function=weight_function)
+    assert gp.train_inputs[0].shape == (10, 2)
+    assert gp.train_targets.shape == (10,)
+    assert (gp.train_inputs[0][0] == train_x[0]).all()
+
+    if not weighted:
+        expected_gp = _build_gp("Exact", train_x, train_y)
+        indexes = _summarize_gp_by_refitting(expected_gp, max_num_points=10)
+        torch.testing.assert_close(gp.train_inputs[0], train_x[indexes])
+
+    # The Cholesky factor of the selection is used as test cache.
+    expected = _build_gp("Exact", gp.train_inputs[0], gp.train_targets)
+    torch.testing.assert_close(
+        gp(test_x).mean, expected(test_x).mean, atol=1e-4, rtol=1e-4
+    )
+    torch.testing.assert_close(
+        gp(test_x).variance, expected(test_x).variance, atol=1e-4, rtol=1e-4
+    )
@@ -2,24 +2,43 @@
 
 import gpytorch
 import torch
+from gpytorch.lazy import delazify
 from torch.distributions import Bernoulli
 
+from .gps import ExactGP, RandomFeatureGP, SparseGP
+from .prediction_strategies import CholeskyPredictionStrategy
+
 
 def add_data_to_gp(gp_model, new_inputs, new_targets):
     """Add new data points to an existing GP model.
 
-    Once available, gp_model.get_fantasy_model should be preferred over this.
+    The test caches of the GP models in this package are updated with the new data
+    instead of discarded, see ExactGP.add_data.
     """
+    if isinstance(gp_model, ExactGP):
+        gp_model.add_data(new_inputs, new_targets)
+        return
+
     inputs = torch.cat((gp_model.train_inputs[0], new_inputs), dim=0)
     targets = torch.cat((gp_model.train_targets, new_targets), dim=-1)
     gp_model.set_train_data(inputs, targets, strict=False)
 
-    # TODO: return gp_model.get_fantasy_model(inputs, targets)
-
 
 def summarize_gp(gp_model, max_num_points=None, weight_function=None):
     """Summarize the GP model with a fixed number of data points inplace.
 
+    The set function to maximize is f_s = log det (I + \lambda^2 K_s).
+    Greedy selection resorts to sequentially selecting the index that solves
+    i^\star = \arg max_i log (1 + \lambda^2 K_(i|s))
+    This is equivalent to doing \arg max_i (1 + \lambda^2 K_(i|s)) and to
+    i^\star = \arg max_i K_(i|s).
+    Hence, the point with greater predictive variance is selected.
+
+    The predictive variances are downdated incrementally with the rows of the
+    Cholesky factor of the selected points, as in a pivoted Cholesky decomposition.
+    This costs O(N M^2) instead of refitting the GP after each selected point. The
+    Cholesky factor is then used as the test cache of the summarized GP.
+
     Parameters
     ----------
     gp_model : gpytorch.models.ExactGPModel
@@ -35,36 +54,53 @@ def summarize_gp(gp_model, max_num_points=None, weight_function=None):
     if max_num_points is None or len(inputs) <= max_num_points:
         return
 
-    # Remove all data points but one
-    gp_model.set_train_data(
-        inputs[0].unsqueeze(0), targets[0].unsqueeze(-1), strict=False
-    )
     gp_model.eval()
-    for _ in range(max_num_points - 1):
-        with gpytorch.settings.fast_pred_var():
-            # The set function to maximize is f_s = log det (I + \lambda^2 K_s).
-            # Greedy selection resorts to sequentially selecting the index that solves
-            # i^\star = \arg max_i log (1 + \lambda^2 K_(i|s))
-            # This is equivalent to doing \arg max_i (1 + \lambda^2 K_(i|s)) and to
-            # i^\star = \arg max_i K_(i|s).
-            # Hence, the point with greater predictive variance is selected.
-            # torch.log(1 + pred.variance)
-            pred_var = gp_model(inputs).variance
-            if weight_function is not None:
-                pred_var = torch.log(1 + pred_var) * weight_function(inputs)
-            index = torch.argmax(pred_var)
-
-        new_input = inputs[index].unsqueeze(0)
-        new_target = targets[index].unsqueeze(-1)
-
-        # Once enabled use this
-        # gp_model = gp_model.get_fantasy_model(new_input, new_target)
-        add_data_to_gp(gp_model, new_input, new_target)
-
-        # Remove data from input space
-        idx = int(index.item())
-        inputs = torch.cat((inputs[:idx], inputs[idx + 1 :]), dim=0)
-        targets = torch.cat((targets[:idx], targets[idx + 1 :]), dim=-1)
+    with torch.no_grad():
+        kernel = gp_model.covar_module
+        noise = gp_model.likelihood.noise.squeeze(-1)
+        weights = None if weight_function is None else weight_function(inputs)
+
+        # For batched GPs, the leading dimensions index the outputs, which share the
+        # inputs. Hence, the variances of the outputs are added to score the inputs.
+        pred_var = kernel(inputs, diag=True)
+        batch_shape = pred_var.shape[:-1]
+        factor = torch.zeros(batch_shape + (max_num_points, len(inputs)))
+        cholesky = torch.zeros(batch_shape + (max_num_points, max_num_points))
+        selected = torch.zeros(len(inputs), dtype=torch.bool)
+        indexes = []
+        for i in range(max_num_points):
+            if i == 0:  # Keep the first data point.
+                index = 0
+            else:
+                score = pred_var
+                if weights is not None:
+                    score = torch.log(1 + pred_var) * weights
+                score = score.reshape(-1, len(inputs)).sum(0)
+                score = score.masked_fill(selected, -float("inf"))
+                index = int(torch.argmax(score).item())
+
+            k_i = delazify(kernel(inputs[index : index + 1], inputs)).squeeze(-2)
+            l_i = factor[..., :i, index]
+            d_i = torch.sqrt(k_i[..., index] + noise - (l_i * l_i).sum(-1))
+            factor[..., i, :] = (
+                k_i - (l_i.unsqueeze(-2) @ factor[..., :i, :]).squeeze(-2)
+            ) / d_i.unsqueeze(-1)
+            cholesky[..., i, :i], cholesky[..., i, i] = l_i, d_i
+
+            pred_var = pred_var - factor[..., i, :] ** 2
+            selected[index] = True
+            indexes.append(index)
+
+        targets = targets[..., indexes]
+        gp_model.set_train_data(inputs[indexes], targets, strict=False)
+        if not isinstance(gp_model, (SparseGP, RandomFeatureGP)):
+            gp_model.prediction_strategy = CholeskyPredictionStrategy(
+                list(gp_model.train_inputs),
+                gp_model.forward(inputs[indexes]),
+                targets,
+                gp_model.likelihood,
+                cholesky=cholesky,
+            )
 
 
 def bkb(gp_model, inducing_points, q_bar=1):
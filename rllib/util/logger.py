@@ -1,8 +1,10 @@
 """Implementation of a Logger class."""
 import json
+import math
 import os
 import shutil
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import numpy as np
@@ -20,6 +22,70 @@ def safe_make_dir(dir_name):
     return dir_name
 
 
+class History(object):
+    """Preallocated history of the values of a statistic.
+
+    The values are stored in a numpy array whose capacity doubles when it is full.
+    If `max_len' is given, the history is downsampled by two instead, and from then
+    on only every `stride'-th value is stored. Hence, the memory is bounded and the
+    stored values remain evenly spaced over the whole run.
+
+    Parameters
+    ----------
+    values: Iterable[float], optional.
+        Initial values of the history.
+    max_len: int, optional.
+        Maximum number of values to store.
+    """
+
+    def __init__(self, values=(), max_len=None):
+        self.max_len = max_len
+        self.stride = 1
+        self._count = 0
+        self._len = 0
+        self._values = np.zeros(min(64, max_len or 64))
+        for value in values:
+            self.append(value)
+
+    def __len__(self):
+        """Return the number of stored values."""
+        return self._len
+
+    def __getitem__(self, index):
+        """Return the stored values at index."""
+        return self._values[: self._len][index]
+
+    def __iter__(self):
+        """Iterate over the stored values."""
+        return iter(self.tolist())
+
+    def append(self, value):
+        """Append a value to the history."""
+        self._count += 1
+        if (self._count - 1) % self.stride:
+            return
+        if self._len == len(self._values):
+            if self.max_len is None or self._len < self.max_len:
+                capacity = 2 * self._len
+                if self.max_len is not None:
+                    capacity = min(capacity, self.max_len)
+                values = np.zeros(capacity)
+                values[: self._len] = self._values
+                self._values = values
+            else:
+                self._len = (self._len + 1) // 2
+                self._values[: self._len] = self._values[::2]
+                self.stride *= 2
+                if (self._count - 1) % self.stride:
+                    return
+        self._values[self._len] = value
+        self._len += 1
+
+    def tolist(self):
+        """Return the stored values as a list."""
+        return self._values[: self._len].tolist()
+
+
 class Logger(object):
     """Class that implements a logger of statistics.
 
@@ -32,12 +98,34 @@ class Logger(object):
         The folder is runs/`name'/`comment_date'.
     tensorboard: bool, optional.
         Flag that indicates whether or not to save the results in the tensorboard.
+    max_history: int, optional.
+        Maximum number of values of each key stored in `all'. When it is reached, the
+        history of the key is downsampled. By default, all the values are stored.
+    asynchronous: bool, optional.
+        Flag that indicates whether to write the tensorboard scalars and the exported
+        files from a background thread. The scalars are sent to the thread in batches
+        of `flush_size' and at the end of each episode.
+    flush_size: int, optional.
+        Number of tensorboard scalars to accumulate before writing them.
     """
 
-    def __init__(self, name, comment="", tensorboard=False):
+    def __init__(
+        self,
+        name,
+        comment="",
+        tensorboard=False,
+        max_history=None,
+        asynchronous=False,
+        flush_size=1024,
+    ):
         self.statistics = list()
         self.current = dict()
-        self.all = defaultdict(list)
+        self.max_history = max_history
+        self.all = defaultdict(lambda: History(max_len=self.max_history))
+        self.asynchronous = asynchronous
+        self.flush_size = flush_size
+        self._scalars = []
+        self._executor = None
 
         now = datetime.now()
         current_time = now.strftime("%b%d_%H-%M-%S")
@@ -96,15 +184,21 @@ class Logger(object):
         """
         for key, value in kwargs.items():
             self.keys.add(key)
-            if isinstance(value, torch.Tensor):
-                value = value.detach().numpy()
-            value = np.nan_to_num(value)
-            if isinstance(value, np.ndarray):
-                value = float(np.mean(value))
-            if isinstance(value, np.float32):
-                value = float(value)
-            if isinstance(value, np.int64):
-                value = int(value)
+            if isinstance(value, torch.Tensor) and value.numel() == 1:
+                value = value.item()
+            if isinstance(value, (float, int)) and not isinstance(value, bool):
+                if not math.isfinite(value):
+                    value = float(np.nan_to_num(value))
+            else:
+                if isinstance(value, torch.Tensor):
+                    value = value.detach().numpy()
+                value = np.nan_to_num(value)
+                if isinstance(value, np.ndarray):
+                    value = float(np.mean(value))
+                if isinstance(value, np.float32):
+                    value = float(value)
+                if isinstance(value, np.int64):
+                    value = int(value)
 
             if key not in self.current:
                 self.current[key] = (1, value)
@@ -117,12 +211,77 @@ class Logger(object):
             self.all[key].append(value)
 
             if self.writer is not None:
-                self.writer.add_scalar(
+                self.add_scalar(
                     f"episode_{self.episode}/{key}",
                     self.current[key][1],
                     global_step=self.current[key][0],
                 )
 
+    def add_scalar(self, tag, value, global_step):
+        """Add a scalar to the tensorboard.
+
+        In asynchronous mode, the scalar is written by the background thread once
+        `flush_size' scalars are accumulated or when the logger is flushed.
+        """
+        if not self.asynchronous:
+            self.writer.add_scalar(tag, value, global_step=global_step)
+            return
+        self._scalars.append((tag, value, global_step))
+        if len(self._scalars) >= self.flush_size:
+            self._submit_scalars()
+
+    def _submit_scalars(self):
+        """Send the accumulated scalars to the background thread."""
+        if self._scalars:
+            scalars, self._scalars = self._scalars, []
+            self._submit(self._write_scalars, self.writer, scalars)
+
+    @staticmethod
+    def _write_scalars(writer, scalars):
+        """Write a batch of scalars to the tensorboard."""
+        for tag, value, global_step in scalars:
+            writer.add_scalar(tag, value, global_step=global_step)
+
+    def _submit(self, function, *args):
+        """Run a function in the background thread, or now if synchronous."""
+        if not self.asynchronous:
+            return function(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._executor.submit(function, *args)
+
+    def flush(self):
+        """Wait until the background thread writes all the pending data."""
+        if self.writer is not None:
+            self._submit_scalars()
+        if self._executor is not None:
+            self._executor.submit(lambda: None).result()
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        """Flush the pending data and stop the background thread."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __getstate__(self):
+        """Get the state of the logger without the background thread."""
+        self.flush()
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["all"] = {key: value.tolist() for key, value in self.all.items()}
+        return state
+
+    def __setstate__(self, state):
+        """Set the state of the logger."""
+        all_ = state.pop("all")
+        self.__dict__.update(state)
+        self.all = defaultdict(lambda: History(max_len=self.max_history))
+        for key, values in all_.items():
+            self.all[key] = History(values, max_len=self.max_history)
+
     def end_episode(self, **kwargs):
         """Finalize collected data and add final fixed values.
 
@@ -142,13 +301,13 @@ class Logger(object):
             if isinstance(value, float) or isinstance(value, int):
                 self.all[key].append(value)
                 if self.writer is not None:
-                    self.writer.add_scalar(
-                        f"average/{key}", value, global_step=self.episode
-                    )
+                    self.add_scalar(f"average/{key}", value, global_step=self.episode)
 
         self.statistics.append(data)
         self.current = dict()
         self.episode += 1
+        if self.writer is not None:
+            self._submit_scalars()
 
     def save_hparams(self, hparams):
         """Save hparams to a json file."""
@@ -157,10 +316,20 @@ class Logger(object):
 
     def export_to_json(self):
         """Save the statistics to a json file."""
-        with open(f"{self.log_dir}/statistics.json", "w") as f:
-            json.dump(self.statistics, f)
-        with open(f"{self.log_dir}/all.json", "w") as f:
-            json.dump(self.all, f)
+        self._submit(
+            self._write_json,
+            self.log_dir,
+            list(self.statistics),
+            {key: value.tolist() for key, value in self.all.items()},
+        )
+
+    @staticmethod
+    def _write_json(log_dir, statistics, all_):
+        """Write the statistics to json files."""
+        with open(f"{log_dir}/statistics.json", "w") as f:
+            json.dump(statistics, f)
+        with open(f"{log_dir}/all.json", "w") as f:
+            json.dump(all_, f)
 
     def load_from_json(self, log_dir=None):
         """Load the statistics from a json file."""
@@ -169,8 +338,60 @@ class Logger(object):
         with open(f"{log_dir}/statistics.json", "r") as f:
             self.statistics = json.load(f)
         with open(f"{log_dir}/all.json", "r") as f:
-            self.all = json.load(f)
-        for key in self.all.keys():
+            all_ = json.load(f)
+        self._set_all(all_)
+
+    def export_to_npz(self):
+        """Save the statistics to a compressed numpy file.
+
+        The statistics of each key are saved as an array with one entry per episode,
+        which is nan in the episodes where the key is missing.
+        """
+        statistics = {
+            f"statistics/{key}": np.array(
+                [statistic.get(key, np.nan) for statistic in self.statistics],
+                dtype=np.float64,
+            )
+            for key in self.keys
+            if any(key in statistic for statistic in self.statistics)
+        }
+        all_ = {f"all/{key}": np.array(value[:]) for key, value in self.all.items()}
+        self._submit(self._write_npz, self.log_dir, {**statistics, **all_})
+
+    @staticmethod
+    def _write_npz(log_dir, arrays):
+        """Write arrays to a compressed numpy file."""
+        np.savez_compressed(f"{log_dir}/statistics.npz", **arrays)
+
+    def load_from_npz(self, log_dir=None):
+        """Load the statistics from a compressed numpy file."""
+        log_dir = log_dir if log_dir is not None else self.log_dir
+
+        statistics, all_ = {}, {}
+        with np.load(f"{log_dir}/statistics.npz") as data:
+            for name in data.files:
+                kind, key = name.split("/", 1)
+                if kind == "statistics":
+                    statistics[key] = data[name]
+                else:
+                    all_[key] = data[name].tolist()
+
+        num_episodes = max([len(value) for value in statistics.values()], default=0)
+        self.statistics = [
+            {
+                key: value[i].item()
+                for key, value in statistics.items()
+                if not np.isnan(value[i])
+            }
+            for i in range(num_episodes)
+        ]
+        self._set_all(all_)
+
+    def _set_all(self, all_):
+        """Set the history of all the keys."""
+        self.all = defaultdict(lambda: History(max_len=self.max_history))
+        for key, values in all_.items():
+            self.all[key] = History(values, max_len=self.max_history)
             self.keys.add(key)
 
     def log_hparams(self, hparams, metrics=None):
@@ -195,6 +416,7 @@ class Logger(object):
 
     def change_log_dir(self, new_log_dir):
         """Change log directory."""
+        self.flush()
         log_dir = new_log_dir
         try:
             self.delete_directory()
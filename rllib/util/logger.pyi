@@ -1,22 +1,49 @@
 """Implementation of a Logger class."""
 
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 import tensorboardX
 
 def safe_make_dir(dir_name: str) -> str: ...
 
+class History(object):
+    max_len: Optional[int]
+    stride: int
+    _count: int
+    _len: int
+    _values: np.ndarray
+    def __init__(
+        self, values: Iterable[float] = ..., max_len: Optional[int] = ...
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, index: Any) -> Any: ...
+    def __iter__(self) -> Iterator[float]: ...
+    def append(self, value: float) -> None: ...
+    def tolist(self) -> List[float]: ...
+
 class Logger(object):
     statistics: List[Dict[str, float]]  # statistic[i_episode] = Summary(i_episode)
     current: Dict[str, Tuple[int, float]]  # Dict[key, (count, value)]
-    all: Dict[str, List[float]]
+    all: Dict[str, History]
+    max_history: Optional[int]
+    asynchronous: bool
+    flush_size: int
+    _scalars: List[Tuple[str, float, int]]
+    _executor: Optional[ThreadPoolExecutor]
     writer: Optional[tensorboardX.SummaryWriter]
     episode: int
     keys: set
     log_dir: str
     def __init__(
-        self, name: str, comment: str = ..., tensorboard: bool = ...
+        self,
+        name: str,
+        comment: str = ...,
+        tensorboard: bool = ...,
+        max_history: Optional[int] = ...,
+        asynchronous: bool = ...,
+        flush_size: int = ...,
     ) -> None: ...
     def __len__(self) -> int: ...
     def __iter__(self) -> Iterator[Dict[str, float]]: ...
@@ -24,10 +51,30 @@ class Logger(object):
     def __str__(self) -> str: ...
     def get(self, key: str) -> List[float]: ...
     def update(self, **kwargs: Any) -> None: ...
+    def add_scalar(self, tag: str, value: float, global_step: int) -> None: ...
+    def _submit_scalars(self) -> None: ...
+    @staticmethod
+    def _write_scalars(
+        writer: tensorboardX.SummaryWriter, scalars: List[Tuple[str, float, int]]
+    ) -> None: ...
+    def _submit(self, function: Callable, *args: Any) -> Any: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
     def end_episode(self, **kwargs: Any) -> None: ...
     def save_hparams(self, hparams: Dict) -> None: ...
     def export_to_json(self) -> None: ...
+    @staticmethod
+    def _write_json(
+        log_dir: str, statistics: List[Dict[str, float]], all_: Dict[str, List[float]]
+    ) -> None: ...
     def load_from_json(self, log_dir: Optional[str] = ...) -> None: ...
+    def export_to_npz(self) -> None: ...
+    @staticmethod
+    def _write_npz(log_dir: str, arrays: Dict[str, np.ndarray]) -> None: ...
+    def load_from_npz(self, log_dir: Optional[str] = ...) -> None: ...
+    def _set_all(self, all_: Dict[str, List[float]]) -> None: ...
     def log_hparams(self, hparams: Dict, metrics: Optional[Dict] = ...) -> None: ...
     def delete_directory(self) -> None: ...
     def change_log_dir(self, new_log_dir: str) -> None: ...
@@ -1,6 +1,13 @@
 """Multi-Processing Utilities."""
+import traceback
+from multiprocessing.connection import wait
+
+import numpy as np
+import torch
 import torch.multiprocessing as mp
 
+from rllib.util.utilities import set_random_seed
+
 
 def run_parallel_returns(
     function, args_list, num_cpu=None, max_process_time=300, max_timeouts=4
@@ -90,6 +97,274 @@ def modify_parallel(function, args_list, num_cpu=None):
         for rank in range(num_calls):
             p = mp.Process(target=function, args=(*args_list[rank],))
             processes.append(p)
+            p.start()
 
         for p in processes:
             p.join()
+
+
+def _environment_worker(rank, environment_fn, connection, buffers, seed=None):
+    """Step an environment on command and write the results to shared memory.
+
+    Parameters
+    ----------
+    rank: int.
+        Index of the worker, i.e., the row of the shared buffers that it owns.
+    environment_fn: Callable[[], AbstractEnvironment].
+        Function that constructs the environment of the worker.
+    connection: Connection.
+        End of the pipe through which commands arrive and statuses are returned.
+    buffers: dict.
+        Shared-memory tensors with keys "state", "action", "reward" and "done".
+    seed: int, optional.
+        Random seed of the worker. Each worker is seeded with `seed + rank'.
+    """
+    if seed is not None:
+        set_random_seed(seed + rank)
+    environment = environment_fn()
+    while True:
+        command = connection.recv()
+        try:
+            info = {}
+            if command == "reset":
+                buffers["state"][rank] = torch.as_tensor(
+                    np.asarray(environment.reset())
+                )
+                buffers["done"][rank] = False
+            elif command == "step":
+                action = buffers["action"][rank].numpy().copy()
+                if environment.discrete_action:
+                    action = action.item()
+                next_state, reward, done, info = environment.step(action)
+                buffers["state"][rank] = torch.as_tensor(np.asarray(next_state))
+                buffers["reward"][rank] = torch.as_tensor(np.asarray(reward))
+                buffers["done"][rank] = bool(done)
+            elif command == "close":
+                environment.close()
+                connection.send(("closed", info))
+                break
+            else:
+                raise ValueError(f"Command {command} not understood.")
+        except Exception:
+            connection.send(("error", traceback.format_exc()))
+        else:
+            connection.send(("ok", info))
+    connection.close()
+
+
+class EnvironmentWorkerPool(object):
+    """Persistent pool of worker processes that own and step an environment each.
+
+    The observations, rewards and done flags are written by the workers into
+    preallocated shared-memory tensors, and the actions are read from another
+    shared tensor. Only the command and the `info' dictionary go through a pipe.
+
+    The pool can be used synchronously, with `reset' and `step', or asynchronously,
+    with `step_async' and `as_completed' (or `step_wait').
+
+    Parameters
+    ----------
+    environment_fn: Callable[[], AbstractEnvironment].
+        Picklable function that constructs an environment.
+        It is called once in the main process to read the dimensions of the
+        environment and once in each worker.
+    num_workers: int, optional.
+        Number of worker processes. By default, the number of cpus.
+    seed: int, optional.
+        Random seed of the workers. Worker i is seeded with `seed + i'.
+
+    Examples
+    --------
+    >>> from rllib.environment.mdps import EasyGridWorld
+    >>> pool = EnvironmentWorkerPool(EasyGridWorld, num_workers=2)
+    >>> state = pool.reset()
+    >>> next_state, reward, done, info = pool.step(torch.tensor([0, 1]))
+    >>> pool.close()
+    """
+
+    def __init__(self, environment_fn, num_workers=None, seed=None):
+        self.num_workers = mp.cpu_count() if num_workers is None else num_workers
+        environment = environment_fn()
+        self.dim_state = environment.dim_observation
+        self.dim_action = environment.dim_action
+        self.dim_reward = environment.dim_reward
+        self.discrete_state = environment.discrete_observation
+        self.discrete_action = environment.discrete_action
+        environment.close()
+
+        def _allocate(shape, dtype):
+            return torch.zeros((self.num_workers,) + tuple(shape), dtype=dtype)
+
+        self.buffers = {
+            "state": _allocate(
+                self.dim_state,
+                torch.long if self.discrete_state else torch.get_default_dtype(),
+            ),
+            "action": _allocate(
+                self.dim_action,
+                torch.long if self.discrete_action else torch.get_default_dtype(),
+            ),
+            "reward": _allocate(self.dim_reward, torch.get_default_dtype()),
+            "done": _allocate((), torch.bool),
+        }
+        for buffer in self.buffers.values():
+            buffer.share_memory_()
+
+        self._connections, self._processes = [], []
+        for rank in range(self.num_workers):
+            parent_connection, worker_connection = mp.Pipe()
+            process = mp.Process(
+                target=_environment_worker,
+                args=(rank, environment_fn, worker_connection, self.buffers, seed),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+        self._pending = set()
+        self.closed = False
+
+    def __len__(self):
+        """Return the number of workers."""
+        return self.num_workers
+
+    def _send(self, command, workers):
+        """Send a command to the workers."""
+        for rank in workers:
+            if rank in self._pending:
+                raise RuntimeError(f"Worker {rank} has a pending command.")
+            self._connections[rank].send(command)
+            self._pending.add(rank)
+
+    def _receive(self, rank):
+        """Receive the status of a command from a worker."""
+        status, info = self._connections[rank].recv()
+        self._pending.discard(rank)
+        if status == "error":
+            raise RuntimeError(f"Worker {rank} failed with:\n{info}")
+        return info
+
+    def _workers(self, workers):
+        """Get the indexes of the workers, by default all of them."""
+        if workers is None:
+            return list(range(self.num_workers))
+        return [int(rank) for rank in np.atleast_1d(workers)]
+
+    def reset(self, workers=None):
+        """Reset the environments of the workers and return their initial states.
+
+        Parameters
+        ----------
+        workers: Array, optional.
+            Indexes of the workers to reset. By default, all of them.
+
+        Returns
+        -------
+        state: Tensor.
+            Tensor of initial states with shape [len(workers), *dim_state].
+        """
+        workers = self._workers(workers)
+        self._send("reset", workers)
+        for rank in workers:
+            self._receive(rank)
+        return self.buffers["state"][workers].clone()
+
+    def step_async(self, action, workers=None):
+        """Write the actions to shared memory and command the workers to step.
+
+        Parameters
+        ----------
+        action: Array.
+            Actions with shape [len(workers), *dim_action].
+        workers: Array, optional.
+            Indexes of the workers to step. By default, all of them.
+        """
+        workers = self._workers(workers)
+        self.buffers["action"][workers] = torch.as_tensor(
+            np.asarray(action), dtype=self.buffers["action"].dtype
+        )
+        self._send("step", workers)
+
+    def as_completed(self, timeout=None):
+        """Yield the transitions of the pending workers as soon as they finish.
+
+        Parameters
+        ----------
+        timeout: float, optional.
+            Maximum number of seconds to wait for the next worker.
+
+        Yields
+        ------
+        rank: int.
+            Index of the worker.
+        next_state: Tensor.
+        reward: Tensor.
+        done: bool.
+        info: dict.
+        """
+        while self._pending:
+            connections = {self._connections[rank]: rank for rank in self._pending}
+            ready = wait(list(connections.keys()), timeout=timeout)
+            if not ready:
+                raise TimeoutError(f"Workers {sorted(self._pending)} timed out.")
+            for connection in ready:
+                rank = connections[connection]
+                info = self._receive(rank)
+                yield (
+                    rank,
+                    self.buffers["state"][rank].clone(),
+                    self.buffers["reward"][rank].clone(),
+                    self.buffers["done"][rank].item(),
+                    info,
+                )
+
+    def step_wait(self):
+        """Wait until all the pending workers finish and return their transitions.
+
+        Returns
+        -------
+        next_state: Tensor.
+        reward: Tensor.
+        done: Tensor.
+        info: List[dict].
+            The transitions are sorted by worker index.
+        """
+        workers = sorted(self._pending)
+        infos = {rank: self._receive(rank) for rank in workers}
+        return (
+            self.buffers["state"][workers].clone(),
+            self.buffers["reward"][workers].clone(),
+            self.buffers["done"][workers].clone(),
+            [infos[rank] for rank in workers],
+        )
+
+    def step(self, action, workers=None):
+        """Step the environments of the workers synchronously.
+
+        See `EnvironmentWorkerPool.step_async' and `EnvironmentWorkerPool.step_wait'.
+        """
+        self.step_async(action, workers)
+        return self.step_wait()
+
+    def close(self):
+        """Close the environments and join the worker processes."""
+        if self.closed:
+            return
+        for rank in sorted(self._pending):
+            self._receive(rank)
+        self._send("close", range(self.num_workers))
+        for rank in range(self.num_workers):
+            self._connections[rank].recv()
+            self._connections[rank].close()
+        for process in self._processes:
+            process.join()
+        self._pending.clear()
+        self.closed = True
+
+    def __del__(self):
+        """Close the pool when it is garbage collected."""
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,7 +1,12 @@
 """Multi-Processing Utilities."""
-from typing import Any, Callable, List, Optional, Tuple
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import torch.multiprocessing as mp
+from torch import Tensor
+
+from rllib.dataset.datatypes import Action, Array
+from rllib.environment import AbstractEnvironment
 
 def run_parallel_returns(
     function: Callable[..., Any],
@@ -13,3 +18,43 @@ def run_parallel_returns(
 def modify_parallel(
     function: Callable[..., None], args_list: List[Tuple], num_cpu: Optional[int] = ...
 ) -> None: ...
+def _environment_worker(
+    rank: int,
+    environment_fn: Callable[[], AbstractEnvironment],
+    connection: Connection,
+    buffers: Dict[str, Tensor],
+    seed: Optional[int] = ...,
+) -> None: ...
+
+class EnvironmentWorkerPool(object):
+    num_workers: int
+    dim_state: Tuple
+    dim_action: Tuple
+    dim_reward: Tuple
+    discrete_state: bool
+    discrete_action: bool
+    buffers: Dict[str, Tensor]
+    closed: bool
+    _connections: List[Connection]
+    _processes: List[mp.Process]
+    _pending: Set[int]
+    def __init__(
+        self,
+        environment_fn: Callable[[], AbstractEnvironment],
+        num_workers: Optional[int] = ...,
+        seed: Optional[int] = ...,
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def _send(self, command: str, workers: Iterable[int]) -> None: ...
+    def _receive(self, rank: int) -> dict: ...
+    def _workers(self, workers: Optional[Array]) -> List[int]: ...
+    def reset(self, workers: Optional[Array] = ...) -> Tensor: ...
+    def step_async(self, action: Action, workers: Optional[Array] = ...) -> None: ...
+    def as_completed(
+        self, timeout: Optional[float] = ...
+    ) -> Iterator[Tuple[int, Tensor, Tensor, bool, dict]]: ...
+    def step_wait(self) -> Tuple[Tensor, Tensor, Tensor, List[dict]]: ...
+    def step(
+        self, action: Action, workers: Optional[Array] = ...
+    ) -> Tuple[Tensor, Tensor, Tensor, List[dict]]: ...
+    def close(self) -> None: ...
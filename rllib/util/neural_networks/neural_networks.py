@@ -8,7 +8,12 @@ import torch.nn as nn
 
 from rllib.util.utilities import safe_cholesky
 
-from .utilities import inverse_softplus, parse_layers, update_parameters
+from .utilities import (
+    batched_linear,
+    inverse_softplus,
+    parse_layers,
+    update_parameters,
+)
 
 
 class FeedForwardNN(nn.Module):
@@ -24,6 +29,9 @@ class FeedForwardNN(nn.Module):
         list of width of neural network layers, each separated with a non-linearity.
     biased_head: bool, optional
         flag that indicates if head of NN has a bias term or not.
+    diagonal_scale: bool, optional
+        flag that indicates if Gaussian heads return the diagonal of the scale as a
+        vector of size [batch_size x out_dim] instead of a diagonal matrix.
 
     """
 
@@ -39,6 +47,7 @@ class FeedForwardNN(nn.Module):
         log_scale=False,
         min_scale=1e-6,
         max_scale=1,
+        diagonal_scale=False,
     ):
         super().__init__()
         self.kwargs = {
@@ -52,6 +61,7 @@ class FeedForwardNN(nn.Module):
             "log_scale": log_scale,
             "min_scale": min_scale,
             "max_scale": max_scale,
+            "diagonal_scale": diagonal_scale,
         }
 
         self.hidden_layers, in_dim = parse_layers(layers, in_dim, non_linearity)
@@ -62,6 +72,7 @@ class FeedForwardNN(nn.Module):
         )
         self.squashed_output = squashed_output
         self.log_scale = log_scale
+        self.diagonal_scale = diagonal_scale
         if self.log_scale:
             self._init_scale_transformed = torch.log(torch.tensor([initial_scale]))
             self._min_scale = torch.log(torch.tensor(min_scale)).item()
@@ -81,6 +92,12 @@ class FeedForwardNN(nn.Module):
             update_parameters(target_module=out, new_module=other)
         return out
 
+    def _embed_scale(self, scale):
+        """Return the diagonal of the scale as a vector or as a diagonal matrix."""
+        if self.diagonal_scale:
+            return scale
+        return torch.diag_embed(scale)
+
     def forward(self, x):
         """Execute forward computation of the Neural Network.
 
@@ -153,7 +170,8 @@ class HeteroGaussianNN(FeedForwardNN):
             Mean of size [batch_size x out_dim].
         scale_tril: torch.Tensor.
             Cholesky factorization of covariance matrix of size.
-            [batch_size x out_dim x out_dim].
+            [batch_size x out_dim x out_dim], or its diagonal of size
+            [batch_size x out_dim] if `diagonal_scale' is True.
         """
         x = self.hidden_layers(x)
         mean = self.head(x)
@@ -167,7 +185,53 @@ class HeteroGaussianNN(FeedForwardNN):
             scale = nn.functional.softplus(
                 self._scale(x) + self._init_scale_transformed
             ).clamp(self._min_scale, self._max_scale)
-        return mean, torch.diag_embed(scale)
+        return mean, self._embed_scale(scale)
+
+
+def batched_forward(networks, x):
+    """Evaluate feed-forward networks with the same architecture in a single pass.
+
+    The networks keep independent weights, but every linear layer of all the
+    networks is evaluated with one batched matrix product.
+
+    Parameters
+    ----------
+    networks: List[FeedForwardNN].
+        Networks of the same class and with the same `kwargs'. Only DeterministicNN
+        and HeteroGaussianNN with vector inputs are supported.
+    x: torch.Tensor.
+        Tensor of size [num_networks x batch_size x in_dim], where x[i] is the input
+        of the i-th network.
+
+    Returns
+    -------
+    out: torch.Tensor or Tuple[torch.Tensor, torch.Tensor].
+        The output of each network stacked along the first dimension.
+    """
+    network = networks[0]
+    if type(network) not in [FeedForwardNN, DeterministicNN, HeteroGaussianNN]:
+        raise NotImplementedError(f"{type(network)} can't be batched.")
+    for layers in zip(*[net.hidden_layers for net in networks]):
+        if isinstance(layers[0], nn.Linear):
+            x = batched_linear(layers, x)
+        else:  # Non-linearities have no parameters.
+            x = layers[0](x)
+
+    mean = batched_linear([net.head for net in networks], x)
+    if network.squashed_output:
+        mean = torch.tanh(mean)
+    if not isinstance(network, HeteroGaussianNN):
+        return mean.reshape(*mean.shape[:-1], *network.output_shape)
+
+    scale = batched_linear([net._scale for net in networks], x)
+    if network.log_scale:
+        log_scale = scale.clamp(network._min_scale, network._max_scale)
+        scale = torch.exp(log_scale + network._init_scale_transformed)
+    else:
+        scale = nn.functional.softplus(scale + network._init_scale_transformed).clamp(
+            network._min_scale, network._max_scale
+        )
+    return mean, network._embed_scale(scale)
 
 
 class HomoGaussianNN(FeedForwardNN):
@@ -194,7 +258,8 @@ class HomoGaussianNN(FeedForwardNN):
         -------
         out: torch.distributions.MultivariateNormal
             Multivariate distribution with mean of size [batch_size x out_dim] and
-            covariance of size [batch_size x out_dim x out_dim].
+            covariance of size [batch_size x out_dim x out_dim]. If `diagonal_scale'
+            is True, the scale is a vector of size [batch_size x out_dim].
         """
         x = self.hidden_layers(x)
         mean = self.head(x)
@@ -209,7 +274,9 @@ class HomoGaussianNN(FeedForwardNN):
                 self._scale + self._init_scale_transformed
             ).clamp(self._min_scale, self._max_scale)
 
-        return mean, torch.diag_embed(scale)
+        if self.diagonal_scale:  # Diagonal scales have the shape of the mean.
+            scale = scale.expand(mean.shape)
+        return mean, self._embed_scale(scale)
 
 
 class CategoricalNN(FeedForwardNN):
@@ -298,7 +365,8 @@ class Ensemble(HeteroGaussianNN):
             Mean of size [batch_size x out_dim].
         scale_tril: torch.Tensor.
             Cholesky factorization of covariance matrix of size.
-            [batch_size x out_dim x out_dim].
+            [batch_size x out_dim x out_dim], or its diagonal of size
+            [batch_size x out_dim] if `diagonal_scale' is True.
         """
         x = self.hidden_layers(x)
         out = self.head(x)
@@ -316,24 +384,29 @@ class Ensemble(HeteroGaussianNN):
         if self.prediction_strategy == "moment_matching":
             mean = out.mean(-1)
             variance = (scale.square() + out.square()).mean(-1) - mean.square()
-            scale = safe_cholesky(torch.diag_embed(variance))
+            if self.diagonal_scale:
+                scale = variance.clamp_min(0.0).sqrt()
+            else:
+                scale = safe_cholesky(torch.diag_embed(variance))
         elif self.prediction_strategy == "sample_head":  # TS-1
             head_ptr = torch.randint(self.num_heads, (1,))
             mean = out[..., head_ptr]
-            scale = torch.diag_embed(scale[..., head_ptr])
+            scale = self._embed_scale(scale[..., head_ptr])
         elif self.prediction_strategy in ["set_head", "posterior"]:  # Thompson sampling
             mean = out[..., self.head_ptr]
-            scale = torch.diag_embed(scale[..., self.head_ptr])
+            scale = self._embed_scale(scale[..., self.head_ptr])
         elif self.prediction_strategy == "sample_multiple_head":  # TS-1
             head_idx = torch.randint(self.num_heads, out.shape[:-1]).unsqueeze(-1)
             mean = out.gather(-1, head_idx).squeeze(-1)
-            scale = torch.diag_embed(scale.gather(-1, head_idx).squeeze(-1))
+            scale = self._embed_scale(scale.gather(-1, head_idx).squeeze(-1))
         elif self.prediction_strategy == "set_head_idx":  # TS-INF
-            mean = out.gather(-1, self.head_idx)
-            scale = torch.diag_embed(scale.gather(-1, self.head_idx))
+            head_idx = self.head_indexes.reshape(self.head_indexes.shape + (1, 1))
+            head_idx = head_idx.expand(out.shape[:-1] + (1,))
+            mean = out.gather(-1, head_idx).squeeze(-1)
+            scale = self._embed_scale(scale.gather(-1, head_idx).squeeze(-1))
         elif self.prediction_strategy == "multi_head":
             mean = out.transpose(-1, -2)
-            scale = torch.diag_embed(scale.transpose(-1, -2))
+            scale = self._embed_scale(scale.transpose(-1, -2))
         else:
             raise NotImplementedError
 
@@ -364,7 +437,13 @@ class Ensemble(HeteroGaussianNN):
 
     @torch.jit.export
     def set_head_idx(self, head_indexes):
-        """Set ensemble head for particles.."""
+        """Set ensemble head for particles.
+
+        Parameters
+        ----------
+        head_indexes: Tensor.
+            Tensor of head indexes with the batch shape of the inputs.
+        """
         self.head_indexes = head_indexes
 
     @torch.jit.export
@@ -386,7 +465,7 @@ class Ensemble(HeteroGaussianNN):
 class FelixNet(FeedForwardNN):
     """A Module that implements FelixNet."""
 
-    def __init__(self, in_dim, out_dim, initial_scale=0.5):
+    def __init__(self, in_dim, out_dim, initial_scale=0.5, diagonal_scale=False):
         super().__init__(
             in_dim,
             out_dim,
@@ -395,8 +474,13 @@ class FelixNet(FeedForwardNN):
             squashed_output=True,
             biased_head=False,
             initial_scale=initial_scale,
+            diagonal_scale=diagonal_scale,
         )
-        self.kwargs = {"in_dim": in_dim, "out_dim": out_dim}
+        self.kwargs = {
+            "in_dim": in_dim,
+            "out_dim": out_dim,
+            "diagonal_scale": diagonal_scale,
+        }
 
         torch.nn.init.zeros_(self.hidden_layers[0].bias)
         torch.nn.init.zeros_(self.hidden_layers[2].bias)
@@ -416,7 +500,8 @@ class FelixNet(FeedForwardNN):
             Mean of size [batch_size x out_dim].
         scale_tril: torch.Tensor.
             Cholesky factorization of covariance matrix of size.
-            [batch_size x out_dim x out_dim].
+            [batch_size x out_dim x out_dim], or its diagonal of size
+            [batch_size x out_dim] if `diagonal_scale' is True.
         """
         x = self.hidden_layers(x)
 
@@ -424,4 +509,4 @@ class FelixNet(FeedForwardNN):
         scale = nn.functional.softplus(
             self._scale(x) + self._init_scale_transformed
         ).clamp(self._min_scale, self._max_scale)
-        return mean, torch.diag_embed(scale)
+        return mean, self._embed_scale(scale)
@@ -1,6 +1,6 @@
 """Implementation of different Neural Networks with pytorch."""
 
-from typing import Any, Dict, Optional, Sequence, Tuple, Type, TypeVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 import torch.nn as nn
 from torch import Tensor
@@ -17,6 +17,7 @@ class FeedForwardNN(nn.Module):
     _min_scale: float
     _max_scale: float
     log_scale: bool
+    diagonal_scale: bool
     output_shape: Tuple[int]
     def __init__(
         self,
@@ -30,9 +31,11 @@ class FeedForwardNN(nn.Module):
         log_scale: bool = ...,
         min_scale: float = ...,
         max_scale: float = ...,
+        diagonal_scale: bool = ...,
     ) -> None: ...
     @classmethod
     def from_other(cls: Type[T], other: T, copy: bool = ...) -> T: ...
+    def _embed_scale(self, scale: Tensor) -> Tensor: ...
     def forward(self, *args: Tensor, **kwargs: Any) -> Any: ...
     def last_layer_embeddings(self, x: Tensor) -> Tensor: ...
 
@@ -45,6 +48,10 @@ class HeteroGaussianNN(FeedForwardNN):
     _scale: nn.Linear
     def forward(self, *args: Tensor, **kwargs: Any) -> Tuple[Tensor, Tensor]: ...
 
+def batched_forward(
+    networks: List[FeedForwardNN], x: Tensor
+) -> Union[Tensor, Tuple[Tensor, Tensor]]: ...
+
 class HomoGaussianNN(FeedForwardNN):
     _scale: nn.Parameter
     def forward(self, *args: Tensor, **kwargs: Any) -> Tuple[Tensor, Tensor]: ...
@@ -52,6 +59,7 @@ class HomoGaussianNN(FeedForwardNN):
 class Ensemble(HeteroGaussianNN):
     num_heads: int
     head_ptr: int
+    head_indexes: Tensor
     deterministic: bool
     prediction_strategy: str
     def __init__(
@@ -78,6 +86,10 @@ class Ensemble(HeteroGaussianNN):
 class FelixNet(FeedForwardNN):
     _scale: nn.Linear
     def __init__(
-        self, in_dim: Tuple, out_dim: Tuple, initial_scale: float = ...
+        self,
+        in_dim: Tuple,
+        out_dim: Tuple,
+        initial_scale: float = ...,
+        diagonal_scale: bool = ...,
     ) -> None: ...
     def forward(self, *args: Tensor, **kwargs: Any) -> Tuple[Tensor, Tensor]: ...
@@ -12,6 +12,7 @@ from rllib.util.neural_networks.neural_networks import (
     FelixNet,
     HeteroGaussianNN,
     HomoGaussianNN,
+    batched_forward,
 )
 from rllib.util.neural_networks.utilities import count_vars
 from rllib.util.utilities import tensor_to_distribution
@@ -338,6 +339,25 @@ class TestEnsembleNN(object):
         assert o.has_rsample
         assert not o.has_enumerate_support
 
+    def test_set_head_idx(self, out_dim, num_heads, deterministic):
+        net = Ensemble((4,), out_dim, num_heads=num_heads, deterministic=deterministic)
+        t = torch.randn(8, 3, 4)
+        head_idx = torch.randint(num_heads, (8, 3))
+
+        net.set_prediction_strategy("set_head_idx")
+        net.set_head_idx(head_idx)
+        mean, scale_tril = net(t)
+        assert mean.shape == (8, 3) + out_dim
+        assert scale_tril.shape == (8, 3) + out_dim + out_dim
+
+        net.set_prediction_strategy("set_head")
+        for head in range(num_heads):
+            net.set_head(head)
+            head_mean, head_scale_tril = net(t)
+            mask = head_idx == head
+            torch.testing.assert_close(mean[mask], head_mean[mask])
+            torch.testing.assert_close(scale_tril[mask], head_scale_tril[mask])
+
     def test_layers(self, out_dim, num_heads, layers, deterministic):
         in_dim = (4,)
         net = Ensemble(in_dim, out_dim, layers=layers, num_heads=num_heads)
@@ -411,6 +431,63 @@ class TestEnsembleNN(object):
         assert not o.has_enumerate_support
 
 
+@pytest.mark.parametrize("net", [DeterministicNN, HeteroGaussianNN])
+def test_batched_forward(net, in_dim, out_dim, layers, non_linearity):
+    networks = [net(in_dim, out_dim, layers, non_linearity) for _ in range(3)]
+    x = torch.randn((3, 8) + in_dim)
+    output = batched_forward(networks, x)
+    for i, network in enumerate(networks):
+        if net is DeterministicNN:
+            torch.testing.assert_close(output[i], network(x[i]))
+        else:
+            torch.testing.assert_close(output[0][i], network(x[i])[0])
+            torch.testing.assert_close(output[1][i], network(x[i])[1])
+
+    with pytest.raises(NotImplementedError):
+        batched_forward([HomoGaussianNN(in_dim, out_dim)], x[:1])
+
+
+@pytest.mark.parametrize(
+    "net, kwargs",
+    [
+        (HeteroGaussianNN, {}),
+        (HomoGaussianNN, {}),
+        (FelixNet, {}),
+        (Ensemble, {"num_heads": 3, "deterministic": False}),
+        (
+            Ensemble,
+            {
+                "num_heads": 3,
+                "deterministic": False,
+                "prediction_strategy": "multi_head",
+            },
+        ),
+    ],
+)
+def test_diagonal_scale(net, kwargs, in_dim, out_dim, batch_size):
+    dense = net(in_dim, out_dim, **kwargs)
+    diagonal = net(in_dim, out_dim, diagonal_scale=True, **kwargs)
+    diagonal.load_state_dict(dense.state_dict())
+    assert net.from_other(diagonal).diagonal_scale
+
+    t = torch.randn(in_dim if batch_size is None else (batch_size,) + in_dim)
+    mean, scale_tril = dense(t)
+    diagonal_mean, scale = diagonal(t)
+    torch.testing.assert_close(diagonal_mean, mean)
+    assert scale.shape == mean.shape
+    torch.testing.assert_close(
+        scale, torch.diagonal(scale_tril, dim1=-2, dim2=-1).expand(mean.shape)
+    )
+
+    distribution = tensor_to_distribution((diagonal_mean, scale), diagonal=True)
+    assert isinstance(distribution, torch.distributions.Independent)
+    sample = distribution.sample()
+    torch.testing.assert_close(
+        distribution.log_prob(sample),
+        tensor_to_distribution((mean, scale_tril)).log_prob(sample),
+    )
+
+
 class TestFelixNet(object):
     @pytest.fixture(scope="class")
     def net(self):
@@ -14,6 +14,9 @@ from rllib.util.neural_networks.neural_networks import (
 )
 from rllib.util.neural_networks.utilities import (
     TileCode,
+    copy_parameters,
+    deep_copy_module,
+    flatten_parameters,
     get_batch_size,
     init_head_bias,
     init_head_weight,
@@ -126,6 +129,113 @@ class TestUpdateParams(object):
                 assert not (torch.allclose(param2.data, param1c.data))
 
 
+class TestFlattenParameters(object):
+    @pytest.fixture(params=[1.0, 0.5, 0.0], scope="class")
+    def tau(self, request):
+        return request.param
+
+    @pytest.fixture(
+        params=[DeterministicNN, Ensemble, HomoGaussianNN, HeteroGaussianNN],
+        scope="class",
+    )
+    def network(self, request):
+        return request.param
+
+    @staticmethod
+    def get_net(class_):
+        if class_ is Ensemble:
+            return class_((16,), (4,), num_heads=5, layers=[32, 4])
+        return class_((16,), (4,), [32, 4])
+
+    def test_views(self, network):
+        net = self.get_net(network)
+        x = torch.randn(8, 16)
+        state_dict = {k: v.clone() for k, v in net.state_dict().items()}
+        out = net(x)
+
+        flat = flatten_parameters(net)
+        assert flat.numel() == sum(p.numel() for p in net.parameters())
+        for param in net.parameters():
+            assert param.untyped_storage().data_ptr() == flat.data_ptr()
+        for name, value in net.state_dict().items():
+            torch.testing.assert_close(value, state_dict[name])
+        torch.testing.assert_close(net(x), out)
+
+        flat.zero_()
+        for param in net.parameters():
+            assert (param == 0).all()
+
+    def test_idempotent(self):
+        net = self.get_net(DeterministicNN)
+        flat = flatten_parameters(net)
+        assert flatten_parameters(net) is flat
+
+        net.head.weight.data = net.head.weight.data.clone()
+        new_flat = flatten_parameters(net)
+        assert new_flat is not flat
+        assert net._parameter_arena.is_valid()
+
+    def test_update(self, tau, network):
+        net1, net2 = self.get_net(network), self.get_net(network)
+        net1c, net2c = deep_copy_module(net1), deep_copy_module(net2)
+        flatten_parameters(net1)
+        flatten_parameters(net2)
+
+        update_parameters(net1, net2, tau)
+        update_parameters(net1c, net2c, tau)
+
+        for name, value in net1.state_dict().items():
+            torch.testing.assert_close(value, net1c.state_dict()[name])
+        for name, value in net2.state_dict().items():
+            torch.testing.assert_close(value, net2c.state_dict()[name])
+
+    def test_copy(self, network):
+        net1, net2 = self.get_net(network), self.get_net(network)
+        flatten_parameters(net1)
+        flatten_parameters(net2)
+        copy_parameters(net1, net2)
+        for name, value in net1.state_dict().items():
+            torch.testing.assert_close(value, net2.state_dict()[name])
+
+    def test_deep_copy(self, network):
+        net = self.get_net(network)
+        flat = flatten_parameters(net)
+        copy = deep_copy_module(net)
+        assert copy._parameter_arena.is_valid()
+        assert copy._parameter_arena.flat.data_ptr() != flat.data_ptr()
+        torch.testing.assert_close(copy._parameter_arena.flat, flat)
+
+    def test_detached_tensor(self):
+        net1, net2 = self.get_net(DeterministicNN), self.get_net(DeterministicNN)
+        flatten_parameters(net1)
+        flatten_parameters(net2)
+        net1.head.weight.data = net1.head.weight.data.clone()
+        assert not net1._parameter_arena.is_valid()
+
+        update_parameters(net1, net2, tau=0.0)
+        for name, value in net1.state_dict().items():
+            torch.testing.assert_close(value, net2.state_dict()[name])
+
+    def test_share_memory(self):
+        net = self.get_net(DeterministicNN)
+        flat = flatten_parameters(net)
+        flat.share_memory_()
+        assert flat.is_shared()
+        assert net._parameter_arena.is_valid()
+        for param in net.parameters():
+            assert param.is_shared()
+
+    def test_optimizer_step(self):
+        net = self.get_net(DeterministicNN)
+        flat = flatten_parameters(net)
+        flat_before = flat.clone()
+        optimizer = torch.optim.SGD(net.parameters(), lr=0.1)
+        net(torch.randn(8, 16)).square().sum().backward()
+        optimizer.step()
+        assert net._parameter_arena.is_valid()
+        assert not torch.allclose(flat, flat_before)
+
+
 class TestTileCode(object):
     @pytest.fixture(params=[True, False], scope="class")
     def one_hot(self, request):
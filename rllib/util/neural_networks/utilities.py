@@ -15,7 +15,10 @@ def deep_copy_module(module):
         out = torch.jit.load(module.original_name)
         os.system(f"rm {module.original_name}")
         return out
-    return copy.deepcopy(module)
+    out = copy.deepcopy(module)
+    if getattr(module, "_parameter_arena", None) is not None:
+        flatten_parameters(out)
+    return out
 
 
 class Swish(nn.Module):
@@ -131,12 +134,190 @@ def parse_layers(layers, in_dim, non_linearity):
     return nn.Sequential(*layers_), in_dim
 
 
+def batched_linear(linear_layers, x):
+    """Evaluate linear layers with independent weights in a single batched product.
+
+    Parameters
+    ----------
+    linear_layers: List[nn.Linear].
+        Linear layers with the same input and output features.
+    x: Tensor.
+        Tensor of size [num_layers x batch_size x in_features].
+
+    Returns
+    -------
+    out: Tensor.
+        Tensor of size [num_layers x batch_size x out_features], where out[i] is the
+        output of the i-th layer evaluated at x[i].
+    """
+    weight = torch.stack([layer.weight for layer in linear_layers]).transpose(-2, -1)
+    if linear_layers[0].bias is None:
+        return torch.bmm(x, weight)
+    bias = torch.stack([layer.bias for layer in linear_layers]).unsqueeze(-2)
+    return torch.baddbmm(bias, x, weight)
+
+
+class ParameterArena(object):
+    """Contiguous flat tensor that holds the parameters and buffers of a module.
+
+    The tensors of the module are views of the arena, so that operations on all of
+    them are a single operation on the arena.
+
+    Parameters
+    ----------
+    flat: Tensor.
+        Flat tensor with the data of all the tensors in the arena.
+    names: list of str.
+        Names in the state dict of the tensors in the arena.
+    tensors: list of Tensor.
+        Tensors in the arena, in the order of the names.
+    rest: list of str.
+        Names in the state dict of the tensors that are not in the arena.
+    """
+
+    def __init__(self, flat, names, tensors, rest):
+        self.flat = flat
+        self.names = names
+        self.tensors = tensors
+        self.rest = rest
+        self._layout = [(tensor.shape, tensor.storage_offset()) for tensor in tensors]
+
+    def is_valid(self):
+        """Check that the tensors of the module are still views of the arena.
+
+        Replacing the data of a tensor, e.g., by moving the module to another device,
+        detaches the tensor from the arena.
+        """
+        storage_ptr = self.flat.untyped_storage().data_ptr()
+        for tensor, (shape, offset) in zip(self.tensors, self._layout):
+            if (
+                tensor.untyped_storage().data_ptr() != storage_ptr
+                or tensor.storage_offset() != offset
+                or tensor.shape != shape
+            ):
+                return False
+        return True
+
+    def matches(self, other):
+        """Check that another arena has the same layout as this one."""
+        return (
+            self.names == other.names
+            and self.flat.shape == other.flat.shape
+            and self.flat.dtype == other.flat.dtype
+            and self.flat.device == other.flat.device
+            and self.is_valid()
+            and other.is_valid()
+        )
+
+
+def flatten_parameters(module):
+    """Store the parameters and buffers of a module in a contiguous flat tensor.
+
+    The floating point parameters and buffers with at least one dimension, and with
+    the same type and device as the first of them, are copied to a flat tensor and
+    replaced by views of it. The other tensors are left untouched. If the module
+    already has valid flat parameters, they are returned as they are.
+
+    With flat parameters, `update_parameters' and `copy_parameters' blend or copy
+    all the tensors at once, and the flat tensor can be moved to shared memory to
+    share the module with other processes without copies.
+
+    Parameters
+    ----------
+    module: nn.Module.
+
+    Returns
+    -------
+    flat: Tensor.
+        Flat tensor with the data of the parameters and buffers of the module.
+
+    Examples
+    --------
+    >>> module = nn.Linear(4, 2)
+    >>> flat = flatten_parameters(module)
+    >>> flat.shape
+    torch.Size([10])
+    >>> module.weight.data_ptr() == flat.data_ptr()
+    True
+    """
+    arena = getattr(module, "_parameter_arena", None)
+    if arena is not None and arena.is_valid():
+        return arena.flat
+
+    names, tensors, rest, seen = [], [], [], set()
+    for name, tensor in module.state_dict(keep_vars=True).items():
+        if id(tensor) in seen:  # Tensors shared between submodules.
+            continue
+        if (
+            tensor.ndim == 0
+            or not tensor.is_floating_point()
+            or (tensors and tensor.dtype != tensors[0].dtype)
+            or (tensors and tensor.device != tensors[0].device)
+        ):
+            rest.append(name)
+            continue
+        seen.add(id(tensor))
+        names.append(name)
+        tensors.append(tensor)
+
+    if not tensors:
+        flat = torch.empty(0)
+    else:
+        flat = torch.empty(
+            sum(tensor.numel() for tensor in tensors),
+            dtype=tensors[0].dtype,
+            device=tensors[0].device,
+        )
+    offset = 0
+    with torch.no_grad():
+        for tensor in tensors:
+            numel = tensor.numel()
+            flat[offset : offset + numel].copy_(tensor.data.reshape(-1))
+            tensor.data = flat[offset : offset + numel].view(tensor.shape)
+            offset += numel
+
+    module._parameter_arena = ParameterArena(flat, names, tensors, rest)
+    return flat
+
+
+def _get_state_tensor(module, name):
+    """Get a tensor of the state dict of a module by its name."""
+    *path, attribute = name.split(".")
+    for child in path:
+        module = getattr(module, child)
+    return getattr(module, attribute)
+
+
+def _get_arenas(target_module, new_module):
+    """Get the arenas of two modules if they have the same valid layout."""
+    target_arena = getattr(target_module, "_parameter_arena", None)
+    new_arena = getattr(new_module, "_parameter_arena", None)
+    if target_arena is None or new_arena is None:
+        return None, None
+    if target_arena.rest != new_arena.rest or not target_arena.matches(new_arena):
+        return None, None
+    return target_arena, new_arena
+
+
+def _update_tensor(target_tensor, new_tensor, tau):
+    """Update a tensor of the state dict by another one (softly)."""
+    if target_tensor is new_tensor:
+        return
+    if target_tensor.data.ndim == 0:
+        target_tensor.data = new_tensor.data
+    else:
+        target_tensor.data[:] = tau * target_tensor.data + (1 - tau) * new_tensor.data
+
+
 def update_parameters(target_module, new_module, tau=0.0):
     """Update the parameters of target_params by those of new_params (softly).
 
     The parameters of target_nn are replaced by:
         target_params <- (1-tau) * (target_params) + tau * (new_params)
 
+    If both modules have flat parameters with the same layout (see
+    `flatten_parameters'), all the parameters are updated in a single operation.
+
     Parameters
     ----------
     target_module: nn.Module
@@ -148,25 +329,52 @@ def update_parameters(target_module, new_module, tau=0.0):
     None.
     """
     with torch.no_grad():
+        target_arena, new_arena = _get_arenas(target_module, new_module)
+        if target_arena is not None:
+            if target_arena.flat is not new_arena.flat:
+                target_arena.flat.lerp_(new_arena.flat, 1 - tau)
+            for name in target_arena.rest:
+                _update_tensor(
+                    _get_state_tensor(target_module, name).detach(),
+                    _get_state_tensor(new_module, name).detach(),
+                    tau,
+                )
+            return
+
         target_state_dict = target_module.state_dict()
         new_state_dict = new_module.state_dict()
 
         for name in target_state_dict.keys():
-            if target_state_dict[name] is new_state_dict[name]:
-                continue
-            else:
-                if target_state_dict[name].data.ndim == 0:
-                    target_state_dict[name].data = new_state_dict[name].data
-                else:
-                    target_state_dict[name].data[:] = (
-                        tau * target_state_dict[name].data
-                        + (1 - tau) * new_state_dict[name].data
-                    )
+            _update_tensor(target_state_dict[name], new_state_dict[name], tau)
 
         # It is not necessary to load the dict again as it modifies the pointer.
         # target_module.load_state_dict(target_state_dict)
 
 
+def copy_parameters(target_module, new_module):
+    """Copy the parameters and buffers of new_module to target_module.
+
+    It is equivalent to `target_module.load_state_dict(new_module.state_dict())',
+    but if both modules have flat parameters with the same layout (see
+    `flatten_parameters'), all the tensors in the arena are copied at once.
+
+    Parameters
+    ----------
+    target_module: nn.Module
+    new_module: nn.Module
+    """
+    target_arena, new_arena = _get_arenas(target_module, new_module)
+    if target_arena is None:
+        target_module.load_state_dict(new_module.state_dict())
+        return
+    with torch.no_grad():
+        target_arena.flat.copy_(new_arena.flat)
+        for name in target_arena.rest:
+            _get_state_tensor(target_module, name).copy_(
+                _get_state_tensor(new_module, name)
+            )
+
+
 def count_vars(module):
     """Count the number of variables in a module."""
     return sum([np.prod(p.shape) for p in module.parameters()])
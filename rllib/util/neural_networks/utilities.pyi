@@ -1,4 +1,4 @@
-from typing import Any, Iterable, Optional, Sequence, Tuple, TypeVar, Union
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
 
 import numpy as np
 import torch.nn as nn
@@ -18,9 +18,24 @@ def parse_nonlinearity(non_linearity: str) -> nn.Module: ...
 def parse_layers(
     layers: Sequence[int], in_dim: Tuple, non_linearity: str
 ) -> Tuple[nn.Sequential, int]: ...
+def batched_linear(linear_layers: List[nn.Linear], x: Tensor) -> Tensor: ...
+
+class ParameterArena(object):
+    flat: Tensor
+    names: List[str]
+    tensors: List[Tensor]
+    rest: List[str]
+    def __init__(
+        self, flat: Tensor, names: List[str], tensors: List[Tensor], rest: List[str]
+    ) -> None: ...
+    def is_valid(self) -> bool: ...
+    def matches(self, other: ParameterArena) -> bool: ...
+
+def flatten_parameters(module: nn.Module) -> Tensor: ...
 def update_parameters(
     target_module: nn.Module, new_module: nn.Module, tau: float = ...
 ) -> None: ...
+def copy_parameters(target_module: nn.Module, new_module: nn.Module) -> None: ...
 def count_vars(module: nn.Module) -> int: ...
 def zero_bias(module: nn.Module) -> None: ...
 def init_head_bias(
@@ -1,10 +1,13 @@
 """Helper functions to conduct a rollout with policies or agents."""
 
+import numpy as np
 import torch
 from gym.wrappers.monitoring.video_recorder import VideoRecorder
 from tqdm import tqdm
 
 from rllib.dataset.datatypes import Observation
+from rllib.dataset.utilities import flatten_batch_dimensions
+from rllib.environment.vectorized.util import VectorizedEnv
 from rllib.util.neural_networks.utilities import broadcast_to_tensor, to_torch
 from rllib.util.training.utilities import Evaluate
 from rllib.util.utilities import (
@@ -164,6 +167,7 @@ def rollout_agent(
     eval_frequency=0,
     save_milestones=None,
     callbacks=None,
+    evaluation_service=None,
 ):
     """Conduct a rollout of an agent in an environment.
 
@@ -189,6 +193,10 @@ def rollout_agent(
         List with episodes in which to save the agent.
     callbacks: List[Callable[[AbstractAgent, AbstractEnvironment,int], None]], optional.
         List of functions for evaluating/plotting the agent.
+    evaluation_service: EvaluationService, optional.
+        Service that evaluates the agent every `eval_frequency' episodes in parallel
+        with the training. By default, the agent is evaluated inline during one
+        episode in the training environment.
     """
     save_milestones = list() if save_milestones is None else save_milestones
     callbacks = list() if callbacks is None else callbacks
@@ -208,7 +216,11 @@ def rollout_agent(
         if episode in save_milestones:
             agent.save(f"{agent.name}_{episode}.pkl")
 
-        if eval_frequency and episode % eval_frequency == 0:
+        if evaluation_service is not None:
+            if eval_frequency and episode % eval_frequency == 0:
+                evaluation_service.submit(agent)
+            evaluation_service.collect(agent)
+        elif eval_frequency and episode % eval_frequency == 0:
             with Evaluate(agent):
                 rollout_episode(
                     environment=environment,
@@ -218,6 +230,104 @@ def rollout_agent(
                     callback_frequency=callback_frequency,
                     callbacks=callbacks,
                 )
+    if evaluation_service is not None:
+        evaluation_service.collect(agent, wait=True)
+    agent.end_interaction()
+
+
+def rollout_vectorized_agent(
+    environment, agent, num_envs, num_episodes=1, max_steps=1000, print_frequency=0
+):
+    """Conduct a rollout of an agent in `num_envs' copies of a vectorized environment.
+
+    At every time step, the agent acts once on the batch of states and the vectorized
+    environment steps all the copies at once. Every copy (slot) is reset
+    independently when its episode ends. The transitions of a finished episode are
+    then passed to the agent, so that the logger, the on-policy trajectories and the
+    replay buffers are updated as in `rollout_agent'.
+
+    Parameters
+    ----------
+    environment: VectorizedEnv or GymEnvironment
+        Vectorized environment with which the agent interacts.
+    agent: AbstractAgent
+        Agent that interacts with the environment.
+    num_envs: int.
+        Number of parallel copies of the environment.
+    num_episodes: int, optional (default=1)
+        Number of episodes.
+    max_steps: int.
+        Maximum number of steps per episode.
+    print_frequency: int, optional.
+        Print agent stats every `print_frequency' episodes if > 0.
+
+    Notes
+    -----
+    The agent acts with its current policy and it only learns when a finished
+    episode is observed. The episodes of the slots that are still running when
+    `num_episodes' episodes are completed are discarded.
+    """
+    env = getattr(environment, "env", environment)
+    if not isinstance(env, VectorizedEnv):
+        raise TypeError(f"{environment} is not a vectorized environment.")
+    action_scale = agent.policy.action_scale
+
+    state = env.reset_batch(num_envs)
+    trajectories = [[] for _ in range(num_envs)]
+    time_steps = np.zeros(num_envs, dtype=np.int64)
+    episode = 0
+    progress_bar = tqdm(total=num_episodes)
+    while episode < num_episodes:
+        action = agent.act(state)
+        if agent.policy.discrete_action:
+            next_state, reward, done, info = env.step(action[..., np.newaxis])
+        else:
+            next_state, reward, done, info = env.step(action)
+        next_state = np.array(next_state)
+
+        try:
+            with torch.no_grad():
+                entropy, log_prob_action = get_entropy_and_log_p(
+                    agent.pi, to_torch(action), action_scale
+                )
+        except RuntimeError:
+            entropy, log_prob_action = 0.0, 1.0
+
+        observation = dict(
+            state=to_torch(state),
+            action=to_torch(action),
+            reward=to_torch(reward),
+            next_state=to_torch(next_state),
+            done=to_torch(done),
+            entropy=to_torch(entropy).expand(num_envs),
+            log_prob_action=to_torch(log_prob_action).expand(num_envs),
+        )
+        for slot, trajectory in enumerate(trajectories):
+            trajectory.append(
+                Observation(**{key: value[slot] for key, value in observation.items()})
+            )
+
+        time_steps += 1
+        finished = np.flatnonzero(np.asarray(done) | (time_steps >= max_steps))
+        for slot in finished:
+            if episode < num_episodes:
+                agent.start_episode()
+                for transition in trajectories[slot]:
+                    agent.observe(transition)
+                agent.end_episode()
+
+                if print_frequency and episode % print_frequency == 0:
+                    print(agent)
+                episode += 1
+                progress_bar.update()
+            trajectories[slot] = []
+        time_steps[finished] = 0
+
+        state = next_state
+        if len(finished):
+            state[finished] = env.reset_slots(finished)
+
+    progress_bar.close()
     agent.end_interaction()
 
 
@@ -307,7 +417,8 @@ def rollout_model(
     max_steps: int.
         Maximum number of steps per episode.
     memory: ExperienceReplay, optional.
-        Memory where to store the simulated transitions.
+        Memory where to store the simulated transitions. The transitions of all the
+        particles are appended at once with `append_batch'.
 
     Returns
     -------
@@ -323,6 +434,7 @@ def rollout_model(
     trajectory = list()
     state = initial_state
     done = torch.full(state.shape[:-1], False, dtype=torch.bool)
+    num_batch_dims = done.ndim
 
     assert max_steps > 0
     for i in range(max_steps):
@@ -356,7 +468,7 @@ def rollout_model(
         )
         trajectory.append(observation)
         if memory is not None:
-            memory.append(observation)
+            memory.append_batch(flatten_batch_dimensions(observation, num_batch_dims))
 
         state = next_state
         if torch.all(done):
@@ -390,7 +502,8 @@ def rollout_actions(
     termination_model: Callable.
         Termination condition to finish the rollout.
     memory: ExperienceReplay, optional.
-        Memory where to store the simulated transitions.
+        Memory where to store the simulated transitions. The transitions of all the
+        particles are appended at once with `append_batch'.
 
     Returns
     -------
@@ -404,6 +517,7 @@ def rollout_actions(
     trajectory = list()
     state = initial_state
     done = torch.full(state.shape[:-1], False, dtype=torch.bool)
+    num_batch_dims = done.ndim
 
     for action in action_sequence:  # Normalized actions
 
@@ -418,10 +532,95 @@ def rollout_actions(
         )
         trajectory.append(observation)
         if memory is not None:
-            memory.append(observation)
+            memory.append_batch(flatten_batch_dimensions(observation, num_batch_dims))
 
         state = next_state
         if torch.all(done):
             break
 
     return trajectory
+
+
+def sample_prediction(prediction):
+    """Sample a model prediction without building a distribution object.
+
+    Gaussian predictions (mean, scale_tril) are sampled with the re-parametrization
+    trick, which returns the mean when the scale is zero without checking it.
+    Other predictions are sampled from a Categorical distribution.
+    """
+    if not isinstance(prediction, tuple):
+        return tensor_to_distribution(prediction).sample()
+    mean, scale_tril = prediction
+    noise = torch.randn_like(mean).unsqueeze(-1)
+    return mean + (scale_tril @ noise).squeeze(-1)
+
+
+def rollout_action_sequence(
+    dynamical_model,
+    reward_model,
+    action_sequence,
+    initial_state,
+    termination_model=None,
+):
+    """Rollout an action sequence in a model and only keep the tensors for planning.
+
+    Unlike `rollout_actions', it does not build an Observation per time step. The
+    next states, rewards and done flags are written into preallocated tensors.
+
+    Parameters
+    ----------
+    dynamical_model: AbstractModel
+        Dynamical Model with which the policy interacts.
+    reward_model: AbstractReward, optional.
+        Reward Model with which the policy interacts.
+    action_sequence: Action
+        Action Sequence that interacts with the environment.
+        The dimensions are [horizon x num samples x dim action].
+    initial_state: State
+        Starting states for the interaction.
+        The dimensions are [1 x num samples x dim state].
+    termination_model: Callable.
+        Termination condition to finish the rollout.
+
+    Returns
+    -------
+    next_state: Tensor.
+        Tensor of next states of size [steps x num samples x dim state].
+    reward: Tensor.
+        Tensor of rewards of size [steps x num samples x dim reward].
+    done: Tensor.
+        Tensor of done flags of size [steps x num samples].
+
+    Notes
+    -----
+    When all the rollouts terminate, it stops and steps < horizon.
+    """
+    horizon = action_sequence.shape[0]
+    state = initial_state
+    done = torch.zeros(
+        torch.broadcast_shapes(state.shape[:-1], action_sequence.shape[1:-1]),
+        dtype=torch.bool,
+    )
+    next_states, rewards, dones = None, None, None
+
+    for t, action in enumerate(action_sequence):
+        next_state = sample_prediction(dynamical_model(state, action))
+        reward = sample_prediction(reward_model(state, action, next_state))
+        reward = reward * (~broadcast_to_tensor(done, target_tensor=reward)).float()
+
+        if next_states is None:
+            next_states = next_state.new_empty((horizon,) + next_state.shape)
+            rewards = reward.new_zeros((horizon,) + reward.shape)
+            dones = torch.zeros((horizon,) + done.shape, dtype=torch.bool)
+        next_states[t] = next_state
+        rewards[t] = reward
+
+        if termination_model is not None:
+            done_ = sample_model(termination_model, state, action, next_state).bool()
+            done = done + done_  # "+" is a boolean "or".
+            dones[t] = done
+            if torch.all(done):
+                return next_states[: t + 1], rewards[: t + 1], dones[: t + 1]
+        state = next_state
+
+    return next_states, rewards, dones
@@ -8,9 +8,12 @@ from rllib.agent import AbstractAgent
 from rllib.dataset.datatypes import Action, Observation, State, Trajectory
 from rllib.dataset.experience_replay import ExperienceReplay
 from rllib.environment import AbstractEnvironment
+from rllib.environment.vectorized.util import VectorizedEnv
 from rllib.model import AbstractModel
 from rllib.policy import AbstractPolicy
 
+from .evaluation import EvaluationService
+
 def step_env(
     environment: AbstractEnvironment,
     state: Union[int, ndarray],
@@ -59,6 +62,15 @@ def rollout_agent(
     callbacks: Optional[
         List[Callable[[AbstractAgent, AbstractEnvironment, int], None]]
     ] = ...,
+    evaluation_service: Optional[EvaluationService] = ...,
+) -> None: ...
+def rollout_vectorized_agent(
+    environment: Union[VectorizedEnv, AbstractEnvironment],
+    agent: AbstractAgent,
+    num_envs: int,
+    num_episodes: int = ...,
+    max_steps: int = ...,
+    print_frequency: int = ...,
 ) -> None: ...
 def rollout_policy(
     environment: AbstractEnvironment,
@@ -86,3 +98,11 @@ def rollout_actions(
     termination_model: Optional[AbstractModel] = ...,
     memory: Optional[ExperienceReplay] = ...,
 ) -> Trajectory: ...
+def sample_prediction(prediction: Union[Tensor, Tuple[Tensor, Tensor]]) -> Tensor: ...
+def rollout_action_sequence(
+    dynamical_model: AbstractModel,
+    reward_model: AbstractModel,
+    action_sequence: Action,
+    initial_state: State,
+    termination_model: Optional[AbstractModel] = ...,
+) -> Tuple[Tensor, Tensor, Tensor]: ...
@@ -0,0 +1,110 @@
+import os
+import tempfile
+
+import pytest
+import torch
+
+from rllib.agent import DQNAgent
+from rllib.dataset import ExperienceReplay
+from rllib.dataset.datatypes import Observation
+from rllib.environment.mdps import EasyGridWorld
+from rllib.util.checkpoint import Checkpointer, ReplayBufferChunks
+from rllib.util.rollout import rollout_agent
+
+
+@pytest.fixture(params=[0, 2])
+def num_memory_steps(request):
+    return request.param
+
+
+def _append(memory, num_transitions):
+    for i in range(num_transitions):
+        memory.append(Observation.random_example(dim_state=(3,), dim_action=(2,)))
+        if i % 7 == 6:
+            memory.end_episode()
+
+
+def _assert_equal_buffers(memory, other):
+    assert memory.data_count == other.data_count
+    torch.testing.assert_close(memory.valid, other.valid)
+    for column, other_column in zip(memory.memory, other.memory):
+        torch.testing.assert_close(
+            column[memory.valid_indexes],
+            other_column[other.valid_indexes],
+            equal_nan=True,
+        )
+
+
+def test_replay_buffer_chunks(num_memory_steps):
+    memory = ExperienceReplay(max_len=50, num_memory_steps=num_memory_steps)
+    with tempfile.TemporaryDirectory() as directory:
+        chunks = ReplayBufferChunks(directory)
+        for num_transitions in [10, 5, 0, 20, 30]:
+            _append(memory, num_transitions)
+            chunks.write(chunks.snapshot(memory))
+
+            other = ExperienceReplay(max_len=50, num_memory_steps=num_memory_steps)
+            ReplayBufferChunks.load(other, directory)
+            _assert_equal_buffers(memory, other)
+            assert len(os.listdir(directory)) == len(chunks.chunks) + 1
+
+        # When the chunks hold more slots than the buffer, a full chunk is written.
+        assert chunks._num_slots <= memory.max_len
+
+        memory.reset()
+        _append(memory, 3)
+        chunks.write(chunks.snapshot(memory))
+        assert len(chunks.chunks) == 1
+
+        other = ExperienceReplay(max_len=50, num_memory_steps=num_memory_steps)
+        ReplayBufferChunks.load(other, directory)
+        _assert_equal_buffers(memory, other)
+
+
+def test_snapshot_copies_data():
+    memory = ExperienceReplay(max_len=50)
+    _append(memory, 10)
+    with tempfile.TemporaryDirectory() as directory:
+        chunks = ReplayBufferChunks(directory)
+        snapshot = chunks.snapshot(memory)
+        expected = memory.memory.state[:10].clone()
+        memory.reset()
+        _append(memory, 10)
+
+        chunks.write(snapshot)
+        other = ExperienceReplay(max_len=50)
+        ReplayBufferChunks.load(other, directory)
+        torch.testing.assert_close(other.memory.state[:10], expected)
+
+
+def _load(path):
+    try:
+        return torch.load(path, weights_only=False)
+    except TypeError:  # torch < 1.13.
+        return torch.load(path)
+
+
+@pytest.mark.parametrize("asynchronous", [True, False])
+def test_agent_checkpoint(asynchronous):
+    environment = EasyGridWorld()
+    agent = DQNAgent.default(
+        environment, asynchronous_checkpoint=asynchronous, checkpoint_frequency=2
+    )
+    rollout_agent(environment, agent, num_episodes=3, max_steps=10)
+    agent.save_checkpoint()
+    agent.end_interaction()
+
+    path = f"{agent.logger.log_dir}/last.pkl"
+    assert os.path.exists(f"{agent.logger.log_dir}/best.pkl")
+    params = _load(path)
+    assert "memory" not in params
+    assert params["replay_buffers"] == ["memory"]
+    assert params["counters"] == agent.counters
+
+    new_agent = DQNAgent.default(environment)
+    new_agent.checkpointer.load_buffer(new_agent.memory, "memory", path)
+    _assert_equal_buffers(agent.memory, new_agent.memory)
+
+    assert isinstance(agent.checkpointer, Checkpointer)
+    agent.logger.delete_directory()
+    new_agent.logger.delete_directory()
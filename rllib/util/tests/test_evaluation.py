@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from rllib.agent import RandomAgent
+from rllib.environment.mdps import EasyGridWorld
+from rllib.util.evaluation import EvaluationService, evaluate_policy
+from rllib.util.rollout import rollout_agent
+
+
+def initial_state():
+    return 0
+
+
+def easy_grid_world():
+    environment = EasyGridWorld(noise=0.2)
+    environment.initial_state = initial_state
+    return environment
+
+
+@pytest.fixture(params=[0, 2])
+def num_workers(request):
+    return request.param
+
+
+def test_evaluate_policy():
+    environment = easy_grid_world()
+    agent = RandomAgent.default(environment)
+    returns = evaluate_policy(environment, agent.policy, 3, max_steps=10, seed=0)
+    assert returns.shape == (3, 1)
+    other = evaluate_policy(environment, agent.policy, 3, max_steps=10, seed=0)
+    np.testing.assert_allclose(returns, other)
+    agent.logger.delete_directory()
+
+
+def test_service(num_workers):
+    agent = RandomAgent.default(EasyGridWorld())
+    service = EvaluationService(
+        easy_grid_world, num_episodes=5, max_steps=10, num_workers=num_workers, seed=0
+    )
+    for _ in range(3):
+        service.submit(agent)
+    service.collect(agent, wait=True)
+    service.close()
+
+    returns = agent.logger.get("eval_return-0")
+    assert len(returns) == 3
+    assert len(agent.logger.get("eval_return_ci-0")) == 3
+    assert agent.eval_episodes == 15
+
+    expected = evaluate_policy(easy_grid_world(), agent.policy, 5, max_steps=10, seed=0)
+    if num_workers == 0:  # A single task evaluates all the episodes.
+        assert returns[0] == pytest.approx(expected.mean())
+    agent.logger.delete_directory()
+
+
+def test_rollout_agent(num_workers):
+    environment = EasyGridWorld()
+    agent = RandomAgent.default(environment)
+    service = EvaluationService(
+        easy_grid_world, num_episodes=4, max_steps=10, num_workers=num_workers
+    )
+    rollout_agent(
+        environment,
+        agent,
+        num_episodes=4,
+        max_steps=10,
+        eval_frequency=2,
+        evaluation_service=service,
+    )
+    service.close()
+    assert agent.train_episodes == 4
+    assert agent.eval_episodes == 8
+    assert agent.logger.get("eval_train_episodes") == [1, 3]
+    agent.logger.delete_directory()
@@ -0,0 +1,95 @@
+import torch
+import torch.nn as nn
+import torch.testing
+
+from rllib.policy import NNPolicy
+from rllib.util.forward_cache import ForwardCache
+from rllib.util.utilities import tensor_to_distribution
+
+
+class CountingLinear(nn.Linear):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_forwards = 0
+
+    def forward(self, x):
+        self.num_forwards += 1
+        return super().forward(x)
+
+
+def test_memoize():
+    module = CountingLinear(4, 2)
+    x = torch.randn(8, 4)
+    with ForwardCache(module) as cache:
+        out = module(x)
+        assert module(x) is out
+        assert module(x.clone()) is not out
+        assert module.num_forwards == 2
+        assert ForwardCache.active() is cache
+
+    assert ForwardCache.active() is None
+    assert "forward" not in vars(module)
+    module(x)
+    assert module.num_forwards == 3
+
+
+def test_invalidate():
+    module = CountingLinear(4, 2)
+    optimizer = torch.optim.SGD(module.parameters(), lr=0.1)
+    x = torch.randn(8, 4)
+    with ForwardCache(module):
+        module(x).sum().backward()
+        optimizer.step()
+        out = module(x)
+        torch.testing.assert_close(
+            out, nn.functional.linear(x, module.weight, module.bias)
+        )
+        assert module.num_forwards == 2
+
+        x.add_(1.0)
+        module(x)
+        assert module.num_forwards == 3
+
+
+def test_gradients():
+    module = CountingLinear(4, 2)
+    x = torch.randn(8, 4)
+    with ForwardCache(module):
+        with torch.no_grad():
+            out = module(x)
+        assert not out.requires_grad
+
+        out = module(x)  # Recomputed with gradients.
+        assert out.requires_grad
+        assert module.num_forwards == 2
+
+        with torch.no_grad():
+            detached = module(x)
+        assert not detached.requires_grad
+        torch.testing.assert_close(detached, out)
+        assert module.num_forwards == 2
+
+
+def test_nested():
+    module = CountingLinear(4, 2)
+    x = torch.randn(8, 4)
+    with ForwardCache(module) as outer:
+        out = module(x)
+        with ForwardCache(module) as inner:
+            assert module(x) is out
+            assert ForwardCache.active() is inner
+        assert ForwardCache.active() is outer
+        assert module(x) is out
+    assert module.num_forwards == 1
+
+
+def test_distribution():
+    policy = NNPolicy(dim_state=(4,), dim_action=(2,))
+    state = torch.randn(8, 4)
+    with ForwardCache(policy):
+        pi = tensor_to_distribution(policy(state), **policy.dist_params)
+        assert tensor_to_distribution(policy(state), **policy.dist_params) is pi
+
+        out = policy(state)
+        noisy = tensor_to_distribution(out, add_noise=True)
+        assert tensor_to_distribution(out, add_noise=True) is not noisy
@@ -0,0 +1,92 @@
+import copy
+
+import numpy as np
+import pytest
+import torch
+
+from rllib.util.logger import History, Logger
+
+
+@pytest.fixture(params=[True, False])
+def asynchronous(request):
+    return request.param
+
+
+@pytest.fixture
+def logger(asynchronous):
+    logger = Logger("test", asynchronous=asynchronous, flush_size=4)
+    yield logger
+    logger.close()
+    logger.delete_directory()
+
+
+def _fill(logger, num_episodes=3, num_steps=5):
+    for i in range(num_episodes):
+        for j in range(num_steps):
+            logger.update(
+                loss=float(j),
+                value=torch.tensor(j),
+                td_error=torch.ones(3) * j,
+                nan=np.nan,
+            )
+        if i % 2:
+            logger.end_episode(rewards=10.0 * i)
+        else:
+            logger.end_episode()
+
+
+def test_history():
+    history = History(range(10))
+    assert len(history) == 10
+    assert history.tolist() == list(range(10))
+    assert history[-1] == 9
+
+    history = History(range(100), max_len=16)
+    assert len(history) <= 16
+    assert history.stride == 8
+    assert history.tolist() == list(range(0, 100, 8))
+
+
+def test_update(logger):
+    _fill(logger)
+    assert len(logger) == 3
+    assert logger.get("loss") == [2.0, 2.0, 2.0]
+    assert logger.get("value") == [2.0, 2.0, 2.0]
+    assert logger.get("td_error") == [2.0, 2.0, 2.0]
+    assert logger.get("nan") == [0.0, 0.0, 0.0]
+    assert logger.get("rewards") == [10.0]
+    assert len(logger.all["loss"]) == 3 * 5 + 3
+
+
+@pytest.mark.parametrize("extension", ["json", "npz"])
+def test_export_load(logger, extension):
+    _fill(logger)
+    getattr(logger, f"export_to_{extension}")()
+    logger.flush()
+
+    new_logger = Logger("test_load")
+    getattr(new_logger, f"load_from_{extension}")(logger.log_dir)
+    new_logger.delete_directory()
+
+    assert new_logger.statistics == logger.statistics
+    assert new_logger.keys == logger.keys
+    for key, value in logger.all.items():
+        assert new_logger.all[key].tolist() == value.tolist()
+
+
+def test_tensorboard(asynchronous):
+    logger = Logger("test", tensorboard=True, asynchronous=asynchronous, flush_size=4)
+    _fill(logger)
+    logger.close()
+    assert len(logger._scalars) == 0
+    logger.delete_directory()
+
+
+def test_deepcopy(logger):
+    _fill(logger)
+    logger.export_to_json()
+    new_logger = copy.deepcopy(logger)
+    assert new_logger.statistics == logger.statistics
+    assert new_logger.all["loss"].tolist() == logger.all["loss"].tolist()
+    new_logger.update(loss=1.0)
+    assert len(new_logger.all["loss"]) == len(logger.all["loss"]) + 1
@@ -0,0 +1,59 @@
+import pytest
+import torch
+
+from rllib.dataset import BootstrapExperienceReplay
+from rllib.dataset.datatypes import Observation
+from rllib.model import EnsembleModel, NNModel
+from rllib.util.logger import Logger
+from rllib.util.training.model_learning import train_model
+
+
+@pytest.fixture(params=[NNModel, EnsembleModel])
+def model(request):
+    if request.param is EnsembleModel:
+        return EnsembleModel(dim_state=(4,), dim_action=(2,), num_heads=3)
+    return NNModel(dim_state=(4,), dim_action=(2,))
+
+
+def get_data_set(model, num_transitions):
+    data_set = BootstrapExperienceReplay(
+        max_len=100, num_bootstraps=getattr(model, "num_heads", 1)
+    )
+    for _ in range(num_transitions):
+        data_set.append(Observation.random_example(dim_state=(4,), dim_action=(2,)))
+    return data_set
+
+
+def train(model, num_epochs=2, lr=1e-3, **kwargs):
+    logger = Logger("model_learning_test")
+    train_model(
+        model,
+        train_set=get_data_set(model, 20),
+        validation_set=get_data_set(model, 10),
+        optimizer=torch.optim.SGD(model.parameters(), lr=lr),
+        batch_size=8,
+        num_epochs=num_epochs,
+        logger=logger,
+        **kwargs,
+    )
+    logger.delete_directory()
+    return {key: count for key, (count, _) in logger.current.items()}
+
+
+def test_epochs(model):
+    counts = train(model)
+    key = model.model_kind[:3]
+    assert counts[f"{key}-loss"] == 6  # 3 batches for 2 epochs.
+    assert counts[f"{key}-val-mse"] == 2
+
+
+def test_validation_frequency(model):
+    counts = train(model, num_epochs=4, validation_frequency=2)
+    assert counts[f"{model.model_kind[:3]}-val-mse"] == 2
+
+
+def test_early_stopping(model):
+    counts = train(model, num_epochs=10, lr=0.0, non_decrease_iter=1)
+    key = model.model_kind[:3]
+    assert counts[f"{key}-val-mse"] == 2
+    assert counts[f"{key}-loss"] == 6
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import torch
+
+from rllib.environment import SystemEnvironment
+from rllib.environment.mdps import EasyGridWorld
+from rllib.environment.systems import InvertedPendulum
+from rllib.util.multiprocessing import EnvironmentWorkerPool
+
+
+def pendulum_environment():
+    return SystemEnvironment(
+        InvertedPendulum(mass=0.3, length=0.5, friction=0.005, step_size=0.01),
+        initial_state=np.array([np.pi, 0.0]),
+    )
+
+
+@pytest.fixture(params=[1, 3])
+def num_workers(request):
+    return request.param
+
+
+def test_step(num_workers):
+    pool = EnvironmentWorkerPool(pendulum_environment, num_workers=num_workers)
+    environments = [pendulum_environment() for _ in range(num_workers)]
+    state = pool.reset()
+    assert state.shape == (num_workers, 2)
+
+    for _ in range(3):
+        action = torch.rand(num_workers, 1)
+        next_state, reward, done, info = pool.step(action)
+        for i, environment in enumerate(environments):
+            environment.reset()
+            environment.state = state[i].double().numpy()
+            expected = environment.step(action[i].double().numpy())[0]
+            torch.testing.assert_close(next_state[i].double(), torch.tensor(expected))
+        state = next_state
+    assert reward.shape == (num_workers, 1)
+    assert done.shape == (num_workers,)
+    assert len(info) == num_workers
+
+    initial_state = torch.tensor([[np.pi, 0.0]], dtype=torch.get_default_dtype())
+    torch.testing.assert_close(pool.reset(workers=[0]), initial_state)
+    pool.close()
+    assert all(not process.is_alive() for process in pool._processes)
+
+
+def test_as_completed(num_workers):
+    pool = EnvironmentWorkerPool(EasyGridWorld, num_workers=num_workers, seed=0)
+    pool.reset()
+    pool.step_async(torch.zeros(num_workers, dtype=torch.long))
+    ranks = [transition[0] for transition in pool.as_completed(timeout=10)]
+    assert sorted(ranks) == list(range(num_workers))
+
+    pool.step_async(torch.ones(1, dtype=torch.long), workers=[0])
+    with pytest.raises(RuntimeError):
+        pool.step_async(torch.ones(1, dtype=torch.long), workers=[0])
+    next_state, reward, done, info = pool.step_wait()
+    assert next_state.shape == (1,)
+    assert next_state.dtype == torch.long
+    pool.close()
+
+
+def test_worker_error():
+    pool = EnvironmentWorkerPool(EasyGridWorld, num_workers=1)
+    with pytest.raises(RuntimeError):
+        pool.step(torch.tensor([100]))  # Invalid action.
+    pool.close()
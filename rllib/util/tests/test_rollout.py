@@ -1,10 +1,24 @@
 import pytest
+import torch
 
 from rllib.agent import RandomAgent
+from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.environment import GymEnvironment
 from rllib.environment.mdps import EasyGridWorld
+from rllib.environment.vectorized import (
+    DiscreteVectorizedCartPoleEnv,
+    VectorizedAcrobotEnv,
+    VectorizedCartPoleEnv,
+)
+from rllib.model import TransformedModel
 from rllib.policy import RandomPolicy
-from rllib.util.rollout import rollout_agent, rollout_policy
+from rllib.util.rollout import (
+    rollout_action_sequence,
+    rollout_actions,
+    rollout_agent,
+    rollout_policy,
+    rollout_vectorized_agent,
+)
 
 
 @pytest.fixture(
@@ -37,3 +51,56 @@ def test_rollout_easy_grid_world():
 
     policy = agent.policy
     rollout_policy(environment, policy)
+
+
+@pytest.mark.parametrize(
+    "environment_class",
+    [VectorizedCartPoleEnv, VectorizedAcrobotEnv, DiscreteVectorizedCartPoleEnv],
+)
+def test_rollout_vectorized_agent(environment_class):
+    environment = environment_class()
+    if hasattr(environment.action_space, "n"):
+        dim_action, num_actions = (), environment.action_space.n
+    else:
+        dim_action, num_actions = environment.action_space.shape, -1
+    agent = RandomAgent(
+        environment.observation_space.shape, dim_action, num_actions=num_actions
+    )
+    rollout_vectorized_agent(
+        environment, agent, num_envs=4, num_episodes=6, max_steps=20
+    )
+
+    assert agent.total_episodes == 6
+    assert agent.total_steps == sum(agent.episode_steps)
+    assert all(0 < steps <= 20 for steps in agent.episode_steps)
+    assert agent.last_trajectory[0].state.shape == environment.observation_space.shape
+
+
+def test_rollout_vectorized_agent_not_vectorized():
+    environment = EasyGridWorld()
+    agent = RandomAgent.default(environment)
+    with pytest.raises(TypeError):
+        rollout_vectorized_agent(environment, agent, num_envs=2)
+
+
+def test_rollout_action_sequence():
+    environment = GymEnvironment("Pendulum-v1")
+    dynamical_model = TransformedModel.default(environment)
+    reward_model = TransformedModel.default(environment, model_kind="rewards")
+    action_sequence = torch.randn(10, 32, 1)
+    state = torch.randn(32, 3)
+
+    torch.manual_seed(0)
+    trajectory = stack_list_of_tuples(
+        rollout_actions(dynamical_model, reward_model, action_sequence, state), dim=0
+    )
+    torch.manual_seed(0)
+    next_state, reward, done = rollout_action_sequence(
+        dynamical_model, reward_model, action_sequence, state
+    )
+
+    assert next_state.shape == (10, 32, 3)
+    assert reward.shape == (10, 32, 1)
+    assert done.shape == (10, 32)
+    torch.testing.assert_close(next_state, trajectory.next_state)
+    torch.testing.assert_close(reward, trajectory.reward)
@@ -2,7 +2,13 @@ import numpy as np
 import pytest
 import torch
 import torch.testing
-from torch.distributions import Categorical, MultivariateNormal, kl_divergence
+from torch.distributions import (
+    Categorical,
+    Independent,
+    MultivariateNormal,
+    Normal,
+    kl_divergence,
+)
 
 from rllib.util.distributions import Delta
 from rllib.util.utilities import (
@@ -56,6 +62,48 @@ class TestIntegrate(object):
         )
 
 
+class TestBatchedIntegrate(object):
+    def test_discrete_distribution(self):
+        d = Categorical(torch.tensor([[0.1, 0.2, 0.3, 0.4], [0.4, 0.3, 0.2, 0.1]]))
+        calls = []
+
+        def _function(a):
+            calls.append(a.shape)
+            return torch.stack((2 * a, a.square()), dim=-1).float()
+
+        torch.testing.assert_close(
+            integrate(_function, d, batched=True), integrate(_function, d)
+        )
+        assert calls[0] == torch.Size([4, 2])
+
+    def test_delta(self):
+        d = Delta(v=torch.tensor([[0.2], [0.3]]))
+        calls = []
+
+        def _function(a):
+            calls.append(a.shape)
+            return 2 * a
+
+        torch.testing.assert_close(
+            integrate(_function, d, num_samples=10, batched=True),
+            torch.tensor([[0.4], [0.6]]),
+        )
+        assert calls == [torch.Size([10, 2, 1])]
+
+    def test_multivariate_normal(self):
+        d = MultivariateNormal(torch.tensor([0.2]), scale_tril=1e-6 * torch.eye(1))
+
+        def _function(a):
+            return 2 * a
+
+        torch.testing.assert_close(
+            integrate(_function, d, num_samples=100, batched=True),
+            torch.tensor([0.4]),
+            rtol=1e-3,
+            atol=1e-3,
+        )
+
+
 class TestMellowMax(object):
     @pytest.fixture(params=[0.1, 1, 10], scope="class")
     def omega(self, request):
@@ -141,6 +189,36 @@ class TestTensor2Dist(object):
         assert d.sample().dtype is torch.get_default_dtype()
         assert d.sample().shape == mu.shape
 
+    def test_diagonal(self, batch_size, dim):
+        if batch_size:
+            mu, scale = torch.randn(batch_size, dim), 0.1 + torch.rand(batch_size, dim)
+        else:
+            mu, scale = torch.randn(dim), 0.1 + torch.rand(dim)
+
+        d = tensor_to_distribution((mu, scale), diagonal=True)
+        assert isinstance(d, Independent)
+        torch.testing.assert_close(d.mean, mu)
+        torch.testing.assert_close(d.variance, scale ** 2)
+
+        dense = tensor_to_distribution((mu, torch.diag_embed(scale)))
+        sample = d.sample()
+        assert sample.shape == mu.shape
+        torch.testing.assert_close(d.log_prob(sample), dense.log_prob(sample))
+        torch.testing.assert_close(d.entropy(), dense.entropy())
+
+        tanh = tensor_to_distribution((mu, scale), diagonal=True, tanh=True)
+        tanh_dense = tensor_to_distribution((mu, torch.diag_embed(scale)), tanh=True)
+        sample = tanh.sample().clamp(-0.999, 0.999)
+        torch.testing.assert_close(tanh.log_prob(sample), tanh_dense.log_prob(sample))
+
+    def test_diagonal_zero_matrix(self, batch_size, dim):
+        if batch_size:
+            mu = torch.randn(batch_size, dim)
+            scale = torch.zeros(dim, dim).expand(batch_size, dim, dim)
+        else:
+            mu, scale = torch.randn(dim), torch.zeros(dim, dim)
+        assert isinstance(tensor_to_distribution((mu, scale), diagonal=True), Delta)
+
 
 class TestSeparatedKL(object):
     @pytest.fixture(params=[1, 10], scope="class")
@@ -181,6 +259,19 @@ class TestSeparatedKL(object):
             kl_divergence(q, p).sum(), sum(separated_kl(q, p)).sum()
         )
 
+    def test_diagonal(self, dim, batch_size):
+        p = self.get_multivariate_normal(dim, batch_size)
+        q = self.get_multivariate_normal(dim, batch_size)
+        p_diagonal = Independent(Normal(p.loc, p.stddev), 1)
+        q_diagonal = Independent(Normal(q.loc, q.stddev), 1)
+        p = MultivariateNormal(p.loc, scale_tril=torch.diag_embed(p.stddev))
+        q = MultivariateNormal(q.loc, scale_tril=torch.diag_embed(q.stddev))
+
+        for kl, kl_diagonal in zip(
+            separated_kl(p, q), separated_kl(p_diagonal, q_diagonal)
+        ):
+            torch.testing.assert_close(kl, kl_diagonal)
+
     def test_correctness(self, dim, batch_size):
         p = self.get_multivariate_normal(dim, batch_size)
         q = self.get_multivariate_normal(dim, batch_size)
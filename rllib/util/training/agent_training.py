@@ -3,8 +3,12 @@ try:
     import matplotlib.pyplot as plt
 except ImportError:
     pass  # If there is an import error it should not be used.
+import copy
+from functools import partial
+
 import numpy as np
 
+from rllib.util.evaluation import EvaluationService
 from rllib.util.rollout import rollout_agent
 
 from .utilities import Evaluate
@@ -36,7 +40,9 @@ def train_agent(agent, environment, plot_flag=True, *args, **kwargs):
     print(agent)
 
 
-def evaluate_agent(agent, environment, num_episodes, max_steps, render=True):
+def evaluate_agent(
+    agent, environment, num_episodes, max_steps, render=True, num_workers=0
+):
     """Evaluate an agent in an environment.
 
     Parameters
@@ -46,7 +52,25 @@ def evaluate_agent(agent, environment, num_episodes, max_steps, render=True):
     num_episodes: int
     max_steps: int
     render: bool
+    num_workers: int, optional.
+        If > 0 and render is False, the episodes are run in parallel by
+        `num_workers' processes with copies of the environment.
     """
+    if num_workers > 0 and not render:
+        service = EvaluationService(
+            partial(copy.deepcopy, environment),
+            num_episodes=num_episodes,
+            max_steps=max_steps,
+            num_workers=num_workers,
+        )
+        service.submit(agent)
+        service.collect(agent, wait=True)
+        service.close()
+        returns = agent.logger.get("eval_return-0")[-1]
+        ci = agent.logger.get("eval_return_ci-0")[-1]
+        print(f"Test Cumulative Rewards: {returns} +- {ci}")
+        return
+
     with Evaluate(agent):
         rollout_agent(
             environment,
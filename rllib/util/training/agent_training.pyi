@@ -18,4 +18,5 @@ def evaluate_agent(
     num_episodes: int,
     max_steps: int,
     render: bool = ...,
+    num_workers: int = ...,
 ) -> None: ...
@@ -14,8 +14,11 @@ from rllib.util.logger import Logger
 from rllib.util.utilities import tensor_to_distribution
 
 from .utilities import (
+    _loss,
     calibration_score,
     get_model_validation_score,
+    get_prediction,
+    get_target,
     model_loss,
     sharpness,
 )
@@ -33,8 +36,39 @@ def train_nn_step(model, observation, optimizer, weight=1.0, dynamical_model=Non
     return loss
 
 
-def train_ensemble_step(model, observation, optimizer, mask, dynamical_model=None):
-    """Train a model ensemble."""
+def train_ensemble_step(
+    model, observation, optimizer, mask, dynamical_model=None, batched=True
+):
+    """Train a model ensemble.
+
+    If batched, all the heads are evaluated in a single pass with the `multi_head'
+    prediction strategy and one optimizer step is taken on the sum of the head losses,
+    each weighted by its bootstrap mask. Otherwise, an optimizer step is taken for
+    each head in random order.
+    """
+    if not batched:
+        return _train_ensemble_sequential_step(
+            model, observation, optimizer, mask, dynamical_model=dynamical_model
+        )
+
+    optimizer.zero_grad()
+    with PredictionStrategy(model, prediction_strategy="multi_head"):
+        mean, scale_tril = get_prediction(model, observation, dynamical_model)
+    # Move the head coordinate to the front, the target broadcasts along it.
+    prediction = (mean.movedim(-2, 0), scale_tril.movedim(-3, 0))
+    loss = _loss(prediction, get_target(model, observation))  # [heads x batch]
+    weight = mask.transpose(0, 1) if mask.ndim > 1 else mask
+    loss = (weight * loss).mean(-1).sum()
+    loss.backward()
+    optimizer.step()
+
+    return loss / model.num_heads
+
+
+def _train_ensemble_sequential_step(
+    model, observation, optimizer, mask, dynamical_model=None
+):
+    """Train a model ensemble with an optimizer step per head."""
     ensemble_loss = 0
 
     model_list = list(range(model.num_heads))
@@ -61,8 +95,7 @@ def train_exact_gp_type2mll_step(model, observation, optimizer):
         model(observation.state[:, 0], observation.action[:, 0])
     )
     with gpytorch.settings.fast_pred_var():
-        val = torch.stack(tuple([gp.train_targets for gp in model.gp]), 0)
-        loss = exact_mll(output, val, model.gp)
+        loss = exact_mll(output, model.train_targets, model.gp)
     loss.backward()
     optimizer.step()
     model.eval()
@@ -108,6 +141,17 @@ def _validate_model_step(model, observation, logger, dynamical_model=None):
     return mse
 
 
+def _validate_model(model, validation_set, logger, dynamical_model=None):
+    """Validate a model with a single batched pass over the validation set."""
+    mse = None
+    with torch.no_grad():
+        for observation, _, _ in validation_set.iterate_batches(shuffle=False):
+            mse = _validate_model_step(
+                model, observation, logger, dynamical_model=dynamical_model
+            )
+    return mse
+
+
 def train_model(
     model,
     train_set,
@@ -121,9 +165,15 @@ def train_model(
     logger=None,
     validation_set=None,
     dynamical_model=None,
+    validation_frequency=1,
 ):
     """Train a Predictive Model.
 
+    The training set is streamed in epochs: each epoch walks a shuffled permutation
+    of the training set in batches, without replacement. Every `validation_frequency'
+    epochs, the model is validated with a single batched pass over the validation set
+    and the early stopping criterion is evaluated on the validation error.
+
     Parameters
     ----------
     model: AbstractModel.
@@ -149,43 +199,54 @@ def train_model(
     logger: Logger, optional.
         Progress logger.
     validation_set: ExperienceReplay, optional.
-        Dataset to validate with.
+        Dataset to validate with. By default, or if it is empty, the training set.
     dynamical_model: AbstractModel, optional.
         Model to propagate predictions with.
+    validation_frequency: int (default=1).
+        Number of epochs between validations.
     """
     if logger is None:
         logger = Logger(f"{model.name}_training", tensorboard=True)
-    if validation_set is None:
+    if validation_set is None or len(validation_set) == 0:
         validation_set = train_set
+    if len(train_set) == 0:
+        return
 
-    data_size = len(train_set) // batch_size
-
+    num_batches = -(-len(train_set) // batch_size)  # Number of batches per epoch.
     if num_epochs is not None:
-        max_iter = data_size * num_epochs
-        min_iter = data_size * min_iter
+        max_iter = num_batches * num_epochs
+        min_iter = num_batches * min_iter
 
     model.train()
     early_stopping = EarlyStopping(epsilon, non_decrease_iter=non_decrease_iter)
 
-    for num_iter in tqdm(range(max_iter)):
-        observation, idx, mask = train_set.sample_batch(batch_size)
-        _train_model_step(
-            model, observation, optimizer, mask, logger, dynamical_model=dynamical_model
-        )
-
-        observation, idx, mask = validation_set.sample_batch(batch_size)
-        with torch.no_grad():
-            mse = _validate_model_step(
-                model, observation, logger, dynamical_model=dynamical_model
+    num_iter, num_epoch = 0, 0
+    with tqdm(total=max_iter) as progress_bar:
+        while num_iter < max_iter:
+            for observation, idx, mask in train_set.iterate_batches(batch_size):
+                _train_model_step(
+                    model,
+                    observation,
+                    optimizer,
+                    mask,
+                    logger,
+                    dynamical_model=dynamical_model,
+                )
+                num_iter += 1
+                progress_bar.update()
+                if num_iter == max_iter:
+                    break
+            num_epoch += 1
+            if num_epoch % validation_frequency != 0:
+                continue
+
+            mse = _validate_model(
+                model, validation_set, logger, dynamical_model=dynamical_model
             )
-        early_stopping.update(mse)
-
-        if (
-            (num_iter + 1) % data_size == 0
-            and early_stopping.stop
-            and num_iter > min_iter
-        ):
-            return
+            early_stopping.reset(hard=False)  # Compare the validation error per epoch.
+            early_stopping.update(mse)
+            if early_stopping.stop and num_iter > min_iter:
+                return
 
 
 def calibrate_model(
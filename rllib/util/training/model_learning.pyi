@@ -27,10 +27,24 @@ def train_ensemble_step(
     optimizer: Optimizer,
     mask: Tensor,
     dynamical_model: Optional[AbstractModel] = ...,
+    batched: bool = ...,
+) -> Tensor: ...
+def _train_ensemble_sequential_step(
+    model: Union[EnsembleModel, IndependentEnsembleModel],
+    observation: Observation,
+    optimizer: Optimizer,
+    mask: Tensor,
+    dynamical_model: Optional[AbstractModel] = ...,
 ) -> Tensor: ...
 def train_exact_gp_type2mll_step(
     model: ExactGPModel, observation: Observation, optimizer: Optimizer
 ) -> Tensor: ...
+def _validate_model(
+    model: AbstractModel,
+    validation_set: ExperienceReplay,
+    logger: Logger,
+    dynamical_model: Optional[AbstractModel] = ...,
+) -> Optional[float]: ...
 def train_model(
     model: AbstractModel,
     train_set: ExperienceReplay,
@@ -44,6 +58,7 @@ def train_model(
     logger: Optional[Logger] = ...,
     validation_set: Optional[ExperienceReplay] = ...,
     dynamical_model: Optional[AbstractModel] = ...,
+    validation_frequency: int = ...,
 ) -> None: ...
 def calibrate_model(
     model: AbstractModel,
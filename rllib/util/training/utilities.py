@@ -143,11 +143,11 @@ def _loss(prediction, target):
     else:  # Probabilistic Model
         scale_tril_inv = torch.inverse(scale_tril)
         delta = scale_tril_inv @ ((mean - y).unsqueeze(-1))
-        loss = (delta.transpose(-2, -1) @ delta).squeeze()
+        loss = (delta.transpose(-2, -1) @ delta).squeeze(-1).squeeze(-1)
 
         # log det \Sigma = 2 trace log (scale_tril)
         idx = torch.arange(mean.shape[-1])
-        loss += 2 * torch.log(scale_tril[..., idx, idx]).mean(dim=-1).squeeze()
+        loss += 2 * torch.log(scale_tril[..., idx, idx]).mean(dim=-1)
 
     loss = loss.sum(dim=-1)  # add up time coordinates.
     return loss
@@ -6,10 +6,17 @@ import warnings
 import numpy as np
 import torch
 import torch.distributions
-from torch.distributions import Categorical, MultivariateNormal, TransformedDistribution
+from torch.distributions import (
+    Categorical,
+    Independent,
+    MultivariateNormal,
+    Normal,
+    TransformedDistribution,
+)
 from torch.distributions.transforms import TanhTransform
 
 from rllib.util.distributions import Delta
+from rllib.util.forward_cache import ForwardCache
 from rllib.util.neural_networks.utilities import broadcast_to_tensor, gather_along_index
 
 
@@ -47,7 +54,7 @@ def load_random_state(directory):
         torch.set_rng_state(random_states["torch"])
 
 
-def integrate(function, distribution, num_samples=15):
+def integrate(function, distribution, num_samples=15, batched=False):
     r"""Integrate a function over a distribution.
 
     Compute:
@@ -64,11 +71,25 @@ def integrate(function, distribution, num_samples=15):
         Distribution to integrate the function w.r.t.
     num_samples: int.
         Number of samples in MC integration.
+    batched: bool, optional (default=False).
+        Flag that indicates whether to evaluate the function once on all the samples
+        (or on all the enumerated values of a discrete distribution), stacked in a
+        leading sample dimension. Then, the function must accept and return tensors
+        with this leading dimension.
 
     Returns
     -------
     integral value.
+
+    Examples
+    --------
+    >>> from torch.distributions import Categorical
+    >>> distribution = Categorical(torch.tensor([[0.5, 0.5], [0.0, 1.0]]))
+    >>> integrate(lambda a: 2.0 * a, distribution, batched=True)
+    tensor([1., 2.])
     """
+    if batched:
+        return _batched_integrate(function, distribution, num_samples)
     if distribution.has_enumerate_support:
         ans = 1.0 * torch.zeros_like(function(distribution.sample()))
         probs = distribution.probs
@@ -91,6 +112,23 @@ def integrate(function, distribution, num_samples=15):
     return ans
 
 
+def _batched_integrate(function, distribution, num_samples):
+    """Integrate a function over a distribution with a single function call."""
+    if distribution.has_enumerate_support:
+        sample = distribution.enumerate_support()  # [num_values, *batch_shape]
+        f_val = function(sample)
+        prob = distribution.probs.movedim(-1, 0)
+        prob = prob.reshape(prob.shape + (1,) * (f_val.ndim - prob.ndim))
+        return (prob.detach() * f_val).sum(0)
+    else:
+        sample_shape = torch.Size([num_samples])
+        if distribution.has_rsample:
+            sample = distribution.rsample(sample_shape)
+        else:
+            sample = distribution.sample(sample_shape)
+        return function(sample).mean(0)
+
+
 def mellow_max(values, omega=1.0):
     r"""Find mellow-max of an array of values.
 
@@ -123,13 +161,41 @@ def tensor_to_distribution(args, **kwargs):
     When args is a tuple, it returns a MultivariateNormal distribution with args[0] as
     mean and args[1] as scale_tril matrix. When args[1] is zero, it returns a Delta.
 
+    When `diagonal' is True and args[1] has the shape of args[0], args[1] is the
+    diagonal of the scale and it returns an Independent Normal distribution. This
+    avoids the dense scale matrix and checking whether args[1] is zero, which
+    synchronizes with the device. Zero scales must then be given as matrices.
+
     Parameters
     ----------
     args: Union[Tuple[Tensor], Tensor].
         Tensors with the parameters of a distribution.
+
+    Examples
+    --------
+    >>> mean, scale = torch.zeros(32, 2), torch.ones(32, 2)
+    >>> tensor_to_distribution((mean, scale), diagonal=True).log_prob(mean).shape
+    torch.Size([32])
+
+    Notes
+    -----
+    Inside a `ForwardCache', the distributions are built once per set of tensors,
+    unless noise is added to them.
     """
+    cache = ForwardCache.active()
+    if cache is not None and not kwargs.get("add_noise", False):
+        return cache.distribution(
+            args, kwargs, lambda: _tensor_to_distribution(args, **kwargs)
+        )
+    return _tensor_to_distribution(args, **kwargs)
+
+
+def _tensor_to_distribution(args, **kwargs):
+    """Convert tensors to a distribution."""
     if not isinstance(args, tuple):
         return Categorical(logits=args)
+    elif kwargs.get("diagonal", False) and args[1].shape == args[0].shape:
+        d = Independent(Normal(args[0], args[1]), 1)
     elif torch.all(args[1] == 0):
         if kwargs.get("add_noise", False):
             noise_clip = kwargs.get("noise_clip", np.inf)
@@ -145,13 +211,11 @@ def tensor_to_distribution(args, **kwargs):
             mean = args[0]
         return Delta(v=mean, event_dim=min(1, mean.dim()))
     else:
-        if kwargs.get("tanh", False):
-            d = TransformedDistribution(
-                MultivariateNormal(args[0], scale_tril=args[1]), [TanhTransform()]
-            )
-        else:
-            d = MultivariateNormal(args[0], scale_tril=args[1])
-        return d
+        d = MultivariateNormal(args[0], scale_tril=args[1])
+
+    if kwargs.get("tanh", False):
+        d = TransformedDistribution(d, [TanhTransform()])
+    return d
 
 
 def sample_model(model, state, action, next_state=None):
@@ -196,6 +260,14 @@ def separated_kl(p, q, log_p=torch.tensor(0.0), log_q=torch.tensor(0.0)):
         kl_var = torch.distributions.kl_divergence(
             p=MultivariateNormal(q.loc, scale_tril=p.scale_tril), q=q
         )
+    elif isinstance(p, Independent) and isinstance(p.base_dist, Normal):
+        q_scale, p_scale = q.base_dist.scale, p.base_dist.scale
+        kl_mean = torch.distributions.kl_divergence(
+            p=Independent(Normal(p.base_dist.loc, q_scale), 1), q=q
+        )
+        kl_var = torch.distributions.kl_divergence(
+            p=Independent(Normal(q.base_dist.loc, p_scale), 1), q=q
+        )
     elif isinstance(p, Delta):
         kl_mean = 0.5 * (p.mean - q.mean).square().mean(-1)
         kl_var = torch.zeros_like(kl_mean)
@@ -15,7 +15,10 @@ def save_random_state(directory: str) -> None: ...
 def load_random_state(directory: str) -> None: ...
 def mellow_max(values: Array, omega: Union[Tensor, float] = ...) -> Array: ...
 def integrate(
-    function: Callable, dist: Distribution, num_samples: int = ...,
+    function: Callable,
+    dist: Distribution,
+    num_samples: int = ...,
+    batched: bool = ...,
 ) -> Tensor: ...
 def tensor_to_distribution(args: TupleDistribution, **kwargs: Any) -> Distribution: ...
 def separated_kl(
@@ -18,9 +18,14 @@ class IntegrateQValueFunction(AbstractValueFunction):
         q _function.
     num_policy_samples: int, optional (default=4).
         Number of policy samples to execute when evaluating the integral.
+    batched: bool, optional (default=True).
+        Flag that indicates whether to evaluate the q function once on all the policy
+        samples, stacked in a leading dimension, instead of once per sample.
     """
 
-    def __init__(self, q_function, policy, num_policy_samples=4, *args, **kwargs):
+    def __init__(
+        self, q_function, policy, num_policy_samples=4, batched=True, *args, **kwargs
+    ):
         kwargs.pop("dim_state", None)
         kwargs.pop("num_states", None)
         kwargs.pop("tau", None)
@@ -34,6 +39,7 @@ class IntegrateQValueFunction(AbstractValueFunction):
         self.q_function = q_function
         self.policy = policy
         self.num_policy_samples = num_policy_samples
+        self.batched = batched
 
     def set_policy(self, new_policy):
         """Set policy."""
@@ -49,7 +55,24 @@ class IntegrateQValueFunction(AbstractValueFunction):
     def forward(self, state):
         """Get value of the value-function at a given state."""
         pi = tensor_to_distribution(self.policy(state), **self.policy.dist_params)
+        if self.batched:
+
+            def q_function(action):
+                """Evaluate the q function on a leading dimension of actions."""
+                return self.q_function(
+                    state.expand(action.shape[:1] + state.shape), action
+                )
+
+        else:
+
+            def q_function(action):
+                """Evaluate the q function on an action."""
+                return self.q_function(state, action)
+
         final_v = integrate(
-            lambda a: self.q_function(state, a), pi, num_samples=self.num_policy_samples
+            q_function,
+            pi,
+            num_samples=self.num_policy_samples,
+            batched=self.batched,
         )
         return final_v
@@ -21,11 +21,15 @@ class IntegrateQValueFunction(AbstractValueFunction):
     q_function: AbstractQFunction
     policy: AbstractPolicy
     num_policy_samples: int
+    batched: bool
     def __init__(
         self,
         q_function: AbstractQFunction,
         policy: AbstractPolicy,
         num_policy_samples: int = ...,
+        batched: bool = ...,
+        *args: Any,
+        **kwargs: Any,
     ) -> None: ...
     def forward(self, *args: Tensor, **kwargs: Any) -> Tensor: ...
     def set_policy(self, new_policy: AbstractPolicy) -> None: ...
@@ -151,3 +151,24 @@ class TestIntegrateValueFunction(object):
                     [batch_size, dim_reward] if batch_size else [dim_reward]
                 )
             assert value.dtype is torch.get_default_dtype()
+
+    def test_batched(
+        self, discrete_state, discrete_action, dim_state, num_heads, batch_size
+    ):
+        if discrete_state and not discrete_action:
+            return
+        self.init(
+            discrete_state,
+            discrete_action,
+            dim_state,
+            dim_action=2,
+            num_heads=num_heads,
+            num_policy_samples=4,
+            dim_reward=2,
+        )
+        self.policy.deterministic = True  # Use the same samples in both modes.
+        state = random_tensor(discrete_state, dim_state, batch_size)
+
+        value = self.value_function(state)
+        self.value_function.batched = False
+        torch.testing.assert_close(value, self.value_function(state))